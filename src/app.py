@@ -6,17 +6,22 @@ import streamlit as st
 import sys
 import os
 import pandas as pd
-import plotly.express as px
 from datetime import datetime
-import requests  # <-- TAMBAHKAN INI
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src import notifications
 from src.data_processor import DataProcessor
+from src.imputation import ImputationPlan
+from src.dataset_store import VersionedDataset
+from src.dataset_profile import dataset_fingerprint
+from src.disk_cache import DEFAULT_CACHE_DIR
 from src.eda_analyzer import EDAAnalyzer
-from src.risk_analyzer import RiskAnalyzer
+from src.exporter import export_path, prune_exports
+from src.ollama_client import get_ollama_client
 from src.rag_chatbot import RAGChatbot
 from src.report_generator import ReportGenerator
+from src.result_cache import cached_column_stats, cached_distribution_chart, cached_missing_value_chart, cached_outlier_summary, cached_profile, cached_risk_results
 
 # Page config
 st.set_page_config(
@@ -25,6 +30,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# Pesan error/warning dari modul inti tampil sebagai st.error / st.warning
+notifications.set_sink(notifications.streamlit_sink)
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -75,6 +83,83 @@ if 'rag_chatbot' not in st.session_state:
     st.session_state.rag_chatbot = None
 if 'ollama_available' not in st.session_state:
     st.session_state.ollama_available = False
+if 'dataset_version' not in st.session_state:
+    st.session_state.dataset_version = None
+if 'loaded_file_key' not in st.session_state:
+    st.session_state.loaded_file_key = None
+if 'dataset_store' not in st.session_state:
+    st.session_state.dataset_store = None
+
+# Stop AI berlaku untuk versi dataset saat tombol ditekan; Regenerate melanjutkan satu analisis saja
+if 'ai_stopped' not in st.session_state:
+    st.session_state.ai_stopped = None
+if 'ai_resumed' not in st.session_state:
+    st.session_state.ai_resumed = set()
+
+
+def sync_dataset_store():
+    """Point the session DataFrame and version token at the store's current version"""
+    store = st.session_state.dataset_store
+    st.session_state.df = store.current
+    st.session_state.dataset_version = store.version
+
+
+def render_ai_stream(token_stream, css_class='info-box'):
+    """Render AI tokens into one box as they arrive; returns the full text"""
+    placeholder = st.empty()
+    text = ''
+    try:
+        for token in token_stream:
+            text += token
+            placeholder.markdown(f'<div class="{css_class}">{text} ▌</div>', unsafe_allow_html=True)
+    finally:
+        # Menutup generator memutus koneksi ke Ollama jika run dihentikan
+        token_stream.close()
+    placeholder.markdown(f'<div class="{css_class}">{text}</div>', unsafe_allow_html=True)
+    return text
+
+
+def reserve_ai_slot(analyzer, name, regenerate_key, slots):
+    """Place the Regenerate button and a box for an AI analysis; uncached ones are filled by fill_ai_slots"""
+    regenerate = st.button("🔄 Regenerate", key=regenerate_key, help="Abaikan cache dan minta jawaban baru dari AI")
+    if regenerate:
+        st.session_state.ai_resumed.add(name)
+    stopped = (st.session_state.ai_stopped is not None
+               and st.session_state.ai_stopped == st.session_state.dataset_version
+               and name not in st.session_state.ai_resumed)
+    
+    cached = None if regenerate else analyzer.get_cached_analysis(name)
+    if cached is not None:
+        st.markdown(f'<div class="info-box">{cached}</div>', unsafe_allow_html=True)
+    elif stopped:
+        st.info("⏹️ Generasi AI dihentikan. Klik 🔄 Regenerate untuk melanjutkan.")
+    else:
+        placeholder = st.empty()
+        placeholder.markdown('<div class="info-box">⏳ Menunggu giliran AI...</div>', unsafe_allow_html=True)
+        slots[name] = (placeholder, regenerate)
+
+
+def fill_ai_slots(analyzer, slots, max_concurrency):
+    """Request all reserved AI analyses concurrently and stream each into its own box"""
+    if not slots:
+        return
+    
+    texts = {name: '' for name in slots}
+    events = analyzer.iter_analyses_concurrently(
+        list(slots), max_concurrency,
+        force_refresh=[name for name, (_, regenerate) in slots.items() if regenerate]
+    )
+    try:
+        for name, token in events:
+            placeholder = slots[name][0]
+            if token is None:
+                placeholder.markdown(f'<div class="info-box">{texts[name]}</div>', unsafe_allow_html=True)
+            else:
+                texts[name] += token
+                placeholder.markdown(f'<div class="info-box">{texts[name]} ▌</div>', unsafe_allow_html=True)
+    finally:
+        events.close()
+
 
 # Header
 st.markdown('<p class="main-header">📊 Gellium Delinquency Analysis</p>', unsafe_allow_html=True)
@@ -85,57 +170,162 @@ with st.sidebar:
     st.image("https://img.icons8.com/color/96/000000/analytics.png", width=80)
     st.markdown("## 🛠️ Control Panel")
     
-    # Cek ketersediaan Ollama
-    try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=2)
-        if response.status_code == 200:
-            st.session_state.ollama_available = True
-            st.success("✅ Ollama terdeteksi")
-        else:
-            st.session_state.ollama_available = False
-            st.warning("⚠️ Ollama tidak merespon")
-    except:
+    # Cek ketersediaan Ollama (hasil probe di-cache oleh client bersama)
+    ollama_client = get_ollama_client()
+    if ollama_client.is_available():
+        st.session_state.ollama_available = True
+        st.success("✅ Ollama terdeteksi")
+    else:
         st.session_state.ollama_available = False
         st.warning("⚠️ Ollama tidak terdeteksi. Jalankan 'ollama serve' di terminal")
     
     # Model selection (hanya jika Ollama tersedia)
     st.markdown("### 🤖 AI Model Settings")
     if st.session_state.ollama_available:
-        model_options = ['mistral:latest', 'llama2:latest']
+        model_options = ollama_client.list_models() or ['mistral:latest', 'llama2:latest']
         selected_model = st.selectbox(
             "Pilih Model LLM",
             model_options,
             index=0,
             help="Pilih model yang tersedia di Ollama"
         )
+        ai_concurrency = st.slider(
+            "Analisis AI paralel",
+            min_value=1, max_value=4, value=2,
+            help="Jumlah permintaan bersamaan ke Ollama lokal"
+        )
+        if st.button("⏹️ Stop AI", help="Hentikan jawaban AI yang sedang berjalan"):
+            st.session_state.ai_stopped = st.session_state.dataset_version
+            st.session_state.ai_resumed = set()
     else:
         selected_model = None
+        ai_concurrency = 1
         st.info("Aktifkan Ollama untuk menggunakan AI Assistant")
     
     st.markdown("---")
     
     # Data upload
     st.markdown("### 📂 Data Upload")
-    uploaded_file = st.file_uploader(
+    uploaded_files = st.file_uploader(
         "Upload Dataset Delinquency",
         type=['xlsx', 'csv'],
-        help="Upload file Excel atau CSV dari Gellium"
+        accept_multiple_files=True,
+        help="Upload file Excel atau CSV dari Gellium; beberapa file (mis. per bulan/region) digabung jadi satu dataset"
+    )
+    uploaded_file = uploaded_files[0] if uploaded_files else None
+    
+    compact_mode = st.checkbox(
+        "⚡ Compact mode",
+        value=False,
+        help="Simpan data dengan tipe ringkas (category, int8, float32) untuk menghemat memori"
+    )
+    
+    shared_mode = st.checkbox(
+        "🔗 Shared dataset store",
+        value=False,
+        help="Buka dataset memory-mapped dari store lokal; session lain dengan file yang sama memakai memori yang sama"
+    )
+    
+    approx_quantiles = st.checkbox(
+        "≈ Approximate quantiles",
+        value=False,
+        help="Median, IQR outlier dan statistik kolom dari quantile sketch (±1% rank) tanpa mengurutkan seluruh kolom"
     )
+    quantile_error = 0.01 if approx_quantiles else None
     
-    if uploaded_file is not None:
+    # Hanya muat ulang jika file atau mode berubah, agar imputasi tidak tertimpa saat rerun
+    file_key = (tuple(f.file_id for f in uploaded_files), compact_mode, shared_mode) if uploaded_files else None
+    if uploaded_file is not None and file_key != st.session_state.loaded_file_key:
         processor = DataProcessor()
         with st.spinner("Loading data..."):
-            df = processor.load_data(uploaded_file=uploaded_file)
+            progress_bar = st.progress(0.0, text="Membaca file...")
+            if len(uploaded_files) > 1:
+                # Partisi dibaca paralel di process pool lalu digabung
+                df = processor.load_partitions(
+                    uploaded_files,
+                    progress_callback=lambda frac: progress_bar.progress(frac, text=f"Membaca partisi... {frac:.0%}"),
+                    compact=compact_mode
+                )
+            else:
+                df = processor.load_data(
+                    uploaded_file=uploaded_file,
+                    progress_callback=lambda frac: progress_bar.progress(frac, text=f"Membaca file... {frac:.0%}"),
+                    compact=compact_mode,
+                    shared=shared_mode
+                )
+            progress_bar.empty()
             if df is not None:
                 st.session_state.df = df
                 st.session_state.data_loaded = True
-                st.success(f"✅ Data loaded: {len(df)} records")
+                st.session_state.dataset_version = processor.dataset_version
+                st.session_state.loaded_file_key = file_key
+                st.session_state.dataset_store = VersionedDataset(df, processor.dataset_version, 'load')
+                if processor.memory_report:
+                    st.caption(f"Memory: {processor.memory_report['before']} → {processor.memory_report['after']}")
+    
+    if uploaded_file is not None and st.session_state.data_loaded:
+        st.success(f"✅ Data loaded: {len(st.session_state.df)} records"
+                   + (f" dari {len(uploaded_files)} file" if len(uploaded_files) > 1 else ""))
+    
+    # Riwayat versi dataset: undo/redo tanpa upload ulang
+    store = st.session_state.dataset_store
+    if st.session_state.data_loaded and store is not None:
+        col_undo, col_redo = st.columns(2)
+        # Callback berjalan sebelum script, jadi tidak perlu rerun tambahan
+        with col_undo:
+            st.button("↩️ Undo", disabled=not store.can_undo, use_container_width=True,
+                      on_click=lambda: (store.undo(), sync_dataset_store()))
+        with col_redo:
+            st.button("↪️ Redo", disabled=not store.can_redo, use_container_width=True,
+                      on_click=lambda: (store.redo(), sync_dataset_store()))
+        st.caption(f"Versi {store.position + 1}/{len(store.versions)}: {store.operation} · "
+                   f"{store.memory_bytes() / 1024**2:.2f} MB untuk semua versi")
     
     st.markdown("---")
     
-    # Document upload for RAG (nonaktifkan sementara karena bermasalah)
+    # Document upload for RAG: index disimpan lokal dan dipakai bersama semua session
     st.markdown("### 📚 Document Upload (RAG)")
-    st.info("RAG Chatbot sedang dalam perbaikan. Fitur ini akan segera hadir.")
+    if st.session_state.rag_chatbot is None:
+        st.session_state.rag_chatbot = RAGChatbot(model_name=selected_model or 'mistral:latest')
+    rag_chatbot = st.session_state.rag_chatbot
+    rag_chatbot.model_name = selected_model or 'mistral:latest'
+    rag_chatbot.refresh()
+    
+    rag_files = st.file_uploader(
+        "Upload dokumen panduan",
+        type=['pdf', 'docx'],
+        accept_multiple_files=True,
+        key="rag_upload"
+    )
+    ingest_results = []
+    if rag_files and st.button("📥 Index Documents", use_container_width=True):
+        with st.spinner("Indexing dokumen..."):
+            ingest_results = [rag_chatbot.ingest_document(rag_file) for rag_file in rag_files]
+    if st.button("📄 Index Bundled Template", use_container_width=True,
+                 help="Index dokumen di data/documents (mis. EDA_SummaryReport_Template.docx)"):
+        with st.spinner("Indexing dokumen bawaan..."):
+            ingest_results = rag_chatbot.sync_directory()
+    for result in filter(None, ingest_results):
+        if result['status'] == 'unchanged':
+            st.info(f"{result['doc_id']}: tidak berubah ({result['chunks']} chunks)")
+        elif result['status'] == 'removed':
+            st.info(f"🗑️ {result['doc_id']}: dihapus dari index")
+        else:
+            st.success(f"✅ {result['doc_id']}: {result['chunks']} chunks "
+                       f"({result['embedded']} di-embed, {result['reused']} dipakai ulang, "
+                       f"{result['removed']} dihapus)")
+    
+    st.session_state.rag_loaded = rag_chatbot.documents_loaded
+    if rag_chatbot.documents_loaded:
+        st.caption(f"{len(rag_chatbot.index.documents())} dokumen · {len(rag_chatbot.index)} chunks · "
+                   f"embedding: {rag_chatbot.embedder.name}")
+        with st.expander("Dokumen ter-index"):
+            for doc_id, chunk_count in rag_chatbot.index.documents().items():
+                st.write(f"• {doc_id} ({chunk_count} chunks)")
+            remove_doc = st.selectbox("Hapus dokumen:", ['-'] + list(rag_chatbot.index.documents()),
+                                      key="rag_remove")
+            st.button("🗑️ Remove Document", use_container_width=True, disabled=remove_doc == '-',
+                      on_click=lambda: rag_chatbot.remove_document(remove_doc))
 
 # Main content
 if not st.session_state.data_loaded:
@@ -174,17 +364,28 @@ else:
     df = st.session_state.df
     processor = DataProcessor()
     processor.df = df
+    if st.session_state.dataset_version is None:
+        st.session_state.dataset_version = dataset_fingerprint(df)
+    if st.session_state.dataset_store is None:
+        st.session_state.dataset_store = VersionedDataset(df, st.session_state.dataset_version, 'load')
+    processor.dataset_version = st.session_state.dataset_version
+    processor.quantile_error = quantile_error
+    dataset_version = processor.dataset_version
+    profile = cached_profile(dataset_version, df)
     
-    eda_analyzer = EDAAnalyzer(df, model_name=selected_model if selected_model else 'mistral:latest')
-    risk_analyzer = RiskAnalyzer(df)
+    eda_analyzer = EDAAnalyzer(df, model_name=selected_model if selected_model else 'mistral:latest', profile=profile,
+                               client=ollama_client)
+    # Analisis AI per tab dikumpulkan di sini lalu diminta bersamaan setelah semua tab dirender
+    ai_slots = {}
     
     # Create tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "📊 Overview", 
         "🔍 Missing Data", 
         "⚠️ Risk Analysis", 
-        "🤖 AI Assistant"
-    ])  # RAG Chatbot dihapus sementara
+        "🤖 AI Assistant",
+        "📚 RAG Chatbot"
+    ])
     
     # Tab 1: Overview
     with tab1:
@@ -193,25 +394,21 @@ else:
         # Basic info in columns
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total Records", len(df))
+            st.metric("Total Records", profile.n_rows)
         with col2:
-            st.metric("Total Columns", len(df.columns))
+            st.metric("Total Columns", profile.n_columns)
         with col3:
-            missing_total = df.isnull().sum().sum()
-            st.metric("Missing Values", missing_total)
+            st.metric("Missing Values", profile.missing_total)
         with col4:
-            if 'Delinquent_Account' in df.columns:
-                del_rate = (df['Delinquent_Account'].sum() / len(df)) * 100
-                st.metric("Delinquency Rate", f"{del_rate:.2f}%")
+            if profile.target_rate is not None:
+                st.metric("Delinquency Rate", f"{profile.target_rate:.2f}%")
         
         st.markdown("---")
         
         # AI Summary (dengan fallback jika Ollama tidak tersedia)
         with st.expander("📊 Dataset Summary", expanded=True):
             if st.session_state.ollama_available:
-                with st.spinner("AI sedang menganalisis data..."):
-                    summary = eda_analyzer.get_ai_summary()
-                    st.markdown(f'<div class="info-box">{summary}</div>', unsafe_allow_html=True)
+                reserve_ai_slot(eda_analyzer, "summary", "regenerate_summary", ai_slots)
             else:
                 st.markdown("""
                 <div class="info-box">
@@ -230,16 +427,14 @@ else:
         
         # Column details
         st.markdown("### 📋 Column Details")
-        col_info = processor.get_basic_info()
+        st.dataframe(profile.column_details(), use_container_width=True)
         
-        col_df = pd.DataFrame({
-            'Column': df.columns,
-            'Type': df.dtypes.astype(str),
-            'Non-Null Count': df.count().values,
-            'Null Count': df.isnull().sum().values,
-            'Unique Values': [df[col].nunique() for col in df.columns]
-        })
-        st.dataframe(col_df, use_container_width=True)
+        # Outlier summary seluruh kolom numerik
+        st.markdown("### 🎯 Outlier Summary")
+        outlier_methods = {'IQR (1.5×)': 'iqr', 'Z-score (|z| > 3)': 'zscore', 'MAD (modified z > 3.5)': 'mad'}
+        outlier_method = st.selectbox("Metode deteksi outlier:", list(outlier_methods.keys()))
+        outlier_summary = cached_outlier_summary(dataset_version, outlier_methods[outlier_method], quantile_error, df)
+        st.dataframe(outlier_summary[outlier_summary['Outliers'] > 0], use_container_width=True, hide_index=True)
     
     # Tab 2: Missing Data
     with tab2:
@@ -251,7 +446,7 @@ else:
             st.markdown(f'<div class="warning-box">⚠️ Ditemukan {len(missing_df)} kolom dengan missing values</div>', unsafe_allow_html=True)
             
             # Missing values chart
-            fig = eda_analyzer.create_missing_value_chart()
+            fig = cached_missing_value_chart(dataset_version, df)
             if fig:
                 st.plotly_chart(fig, use_container_width=True)
             
@@ -261,9 +456,7 @@ else:
             # AI Recommendations
             st.markdown("### 🤖 AI Recommendations for Missing Data")
             if st.session_state.ollama_available:
-                with st.spinner("AI merekomendasikan strategi penanganan..."):
-                    recommendations = eda_analyzer.get_missing_value_recommendation()
-                    st.markdown(f'<div class="info-box">{recommendations}</div>', unsafe_allow_html=True)
+                reserve_ai_slot(eda_analyzer, "missing_values", "regenerate_missing", ai_slots)
             else:
                 st.markdown("""
                 <div class="info-box">
@@ -276,48 +469,116 @@ else:
                 </div>
                 """, unsafe_allow_html=True)
             
-            # Manual imputation
+            # Manual imputation: semua kolom dikumpulkan dalam satu plan, diterapkan dalam satu rerun
             st.markdown("### 🛠️ Manual Imputation")
             
-            for _, row in missing_df.iterrows():
-                col = row['Column']
-                pct = row['Missing Percentage']
-                
-                with st.expander(f"Handle missing values in: {col} ({pct:.1f}% missing)"):
-                    strategy = st.selectbox(
-                        f"Pilih strategi untuk {col}",
-                        ['Median Imputation', 'Mean Imputation', 'Mode Imputation', 
-                         'Drop Column', 'Fill with Zero', 'Fill with Unknown'],
+            strategy_options = {
+                'Skip': None,
+                'Median Imputation': 'median',
+                'Mean Imputation': 'mean',
+                'Mode Imputation': 'mode',
+                'Regression Imputation': 'regression',
+                'Drop Column': 'drop_column',
+                'Fill with Zero': 'zero',
+                'Fill with Unknown': 'unknown'
+            }
+            
+            with st.form("imputation_plan_form"):
+                selected_strategies = {}
+                for _, row in missing_df.iterrows():
+                    col = row['Column']
+                    pct = row['Missing Percentage']
+                    selected_strategies[col] = st.selectbox(
+                        f"{col} ({pct:.1f}% missing)",
+                        list(strategy_options.keys()),
                         key=f"strategy_{col}"
                     )
-                    
-                    if st.button(f"Apply to {col}", key=f"apply_{col}"):
-                        if strategy == 'Median Imputation':
-                            processor.apply_imputation('median', col)
-                        elif strategy == 'Mean Imputation':
-                            processor.apply_imputation('mean', col)
-                        elif strategy == 'Mode Imputation':
-                            processor.apply_imputation('mode', col)
-                        elif strategy == 'Drop Column':
-                            processor.apply_imputation('drop_column', col)
-                        elif strategy == 'Fill with Zero':
-                            processor.apply_imputation('zero', col)
-                        elif strategy == 'Fill with Unknown':
-                            processor.apply_imputation('unknown', col)
-                        
-                        st.success(f"✅ Applied {strategy} to {col}")
+                submitted = st.form_submit_button("✅ Apply Imputation Plan")
+            
+            if submitted:
+                plan = ImputationPlan()
+                for col, label in selected_strategies.items():
+                    if strategy_options[label] is not None:
+                        plan.add(col, strategy_options[label])
+                
+                if plan.steps:
+                    try:
+                        processor.apply_plan(plan)
+                    except ValueError as e:
+                        st.error(f"Imputasi gagal: {str(e)}")
+                    else:
+                        st.session_state.dataset_store.commit(
+                            processor.df, processor.dataset_version, f"impute: {', '.join(plan.steps)}"
+                        )
+                        sync_dataset_store()
+                        st.session_state.imputation_plan = plan.to_json()
                         st.rerun()
+                else:
+                    st.info("Pilih strategi untuk minimal satu kolom.")
         
         else:
             st.markdown('<div class="success-box">✅ Tidak ada missing values dalam dataset!</div>', unsafe_allow_html=True)
-    
+        
+        store = st.session_state.dataset_store
+        if store.position > 0:
+            with st.expander(f"🔀 Perubahan versi terakhir: {store.operation}"):
+                version_diff = store.diff()
+                st.dataframe(version_diff[version_diff['Status'] != 'unchanged'], use_container_width=True, hide_index=True)
+        
+        # Plan tersimpan bisa dipakai ulang untuk file bulanan berikutnya tanpa fit ulang
+        with st.expander("💾 Imputation Plan"):
+            if 'imputation_plan' in st.session_state:
+                st.download_button(
+                    "📥 Download Imputation Plan",
+                    st.session_state.imputation_plan,
+                    "imputation_plan.json",
+                    "application/json"
+                )
+            
+            plan_file = st.file_uploader("Terapkan plan tersimpan (JSON)", type=['json'], key="plan_upload")
+            if plan_file is not None and st.button("Apply Saved Plan"):
+                try:
+                    plan = ImputationPlan.from_json(plan_file.getvalue().decode('utf-8'))
+                except (ValueError, KeyError) as e:
+                    st.error(f"File plan tidak valid: {str(e)}")
+                else:
+                    try:
+                        processor.apply_plan(plan)
+                    except ValueError as e:
+                        st.error(f"Plan tidak bisa diterapkan: {str(e)}")
+                    else:
+                        st.session_state.dataset_store.commit(
+                            processor.df, processor.dataset_version, f"impute: {', '.join(plan.steps)}"
+                        )
+                        sync_dataset_store()
+                        st.session_state.imputation_plan = plan.to_json()
+                        st.rerun()
+
     # Tab 3: Risk Analysis
     with tab3:
         st.markdown('<p class="sub-header">⚠️ Risk Factor Analysis</p>', unsafe_allow_html=True)
         
         if 'Delinquent_Account' in df.columns:
+            # Statistik histori: batch bulanan baru di-merge tanpa upload ulang seluruh histori
+            with st.expander("🗂️ Risk statistics (incremental update)"):
+                history_file = st.file_uploader(
+                    "Gabungkan dengan statistik histori (JSON)",
+                    type=['json'],
+                    key="risk_history"
+                )
+                history_json = history_file.getvalue().decode('utf-8') if history_file else None
+            
+            try:
+                risk_results = cached_risk_results(dataset_version, df, history_json)
+            except (ValueError, KeyError) as e:
+                st.error(f"File statistik tidak valid: {str(e)}")
+                risk_results = cached_risk_results(dataset_version, df)
+            
+            if history_json:
+                st.info("📅 Hasil di bawah menggabungkan statistik histori dengan dataset saat ini.")
+            
             # Overall delinquency rate
-            fig, rate, del_count, total = risk_analyzer.analyze_delinquency_rate()
+            fig, rate, del_count, total = risk_results['delinquency_rate']
             if fig:
                 col1, col2 = st.columns([1, 1])
                 with col1:
@@ -334,44 +595,46 @@ else:
             
             with col1:
                 # Credit utilization risk
-                fig, data = risk_analyzer.risk_by_credit_utilization()
+                fig, data = risk_results['credit_utilization']
                 if fig:
                     st.plotly_chart(fig, use_container_width=True)
                 
                 # Employment status risk
-                fig, data = risk_analyzer.risk_by_employment()
+                fig, data = risk_results['employment']
                 if fig:
                     st.plotly_chart(fig, use_container_width=True)
             
             with col2:
                 # Missed payments risk
-                fig, data = risk_analyzer.risk_by_missed_payments()
+                fig, data = risk_results['missed_payments']
                 if fig:
                     st.plotly_chart(fig, use_container_width=True)
                 
                 # Credit card type risk
-                fig, data = risk_analyzer.risk_by_credit_card_type()
+                fig, data = risk_results['credit_card_type']
                 if fig:
                     st.plotly_chart(fig, use_container_width=True)
             
             # Age group risk
-            fig, data = risk_analyzer.risk_by_age_group()
+            fig, data = risk_results['age_group']
             if fig:
                 st.plotly_chart(fig, use_container_width=True)
             
+            # Kombinasi dua faktor risiko
+            if risk_results['utilization_x_missed']:
+                fig, data = risk_results['utilization_x_missed']
+                st.plotly_chart(fig, use_container_width=True)
+            
             st.markdown("---")
             
             # AI Risk Analysis
             st.markdown("### 🤖 AI Risk Factor Analysis")
             if st.session_state.ollama_available:
-                with st.spinner("AI menganalisis faktor risiko..."):
-                    risk_analysis = eda_analyzer.get_risk_factors_analysis()
-                    st.markdown(f'<div class="info-box">{risk_analysis}</div>', unsafe_allow_html=True)
+                reserve_ai_slot(eda_analyzer, "risk_factors", "regenerate_risk", ai_slots)
             else:
                 # Hitung korelasi manual
-                numeric_cols = df.select_dtypes(include=['number']).columns
-                if 'Delinquent_Account' in numeric_cols:
-                    correlations = df[numeric_cols].corr()['Delinquent_Account'].sort_values(ascending=False)
+                correlations = profile.target_correlations()
+                if len(correlations) > 0:
                     st.markdown("### 📊 Top Risk Factors (by correlation):")
                     for col, corr in correlations.head(6).items():
                         if col != 'Delinquent_Account':
@@ -380,14 +643,20 @@ else:
             
             # High risk profile
             with st.expander("📊 High-Risk Customer Profile"):
-                profile = risk_analyzer.get_high_risk_profile()
-                st.markdown(profile)
+                st.markdown(risk_results['high_risk_profile'])
             
             # Top risk factors
-            top_risks = risk_analyzer.get_top_risk_factors()
+            top_risks = risk_results['top_risk_factors']
             if len(top_risks) > 0:
                 st.markdown("### 🎯 Top Risk Factors")
                 st.dataframe(top_risks, use_container_width=True)
+            
+            st.download_button(
+                label="📥 Download Risk Statistics",
+                data=risk_results['statistics'],
+                file_name="risk_statistics.json",
+                mime="application/json"
+            )
         
         else:
             st.warning("Column 'Delinquent_Account' tidak ditemukan dalam dataset.")
@@ -412,17 +681,16 @@ else:
             
             if st.button("Ask AI", type="primary"):
                 if user_query:
-                    with st.spinner("AI sedang berpikir..."):
-                        # Create context with data
-                        context = f"""
-                        Dataset info:
-                        - Total records: {len(df)}
-                        - Columns: {', '.join(df.columns[:10])}...
-                        - Delinquency rate: {(df['Delinquent_Account'].sum()/len(df)*100):.2f}%
-                        """
-                        
-                        prompt = f"""Anda adalah AI assistant untuk data analyst di Gellium Finance.
-                        
+                    # Create context with data
+                    context = f"""
+                    Dataset info:
+                    - Total records: {len(df)}
+                    - Columns: {', '.join(df.columns[:10])}...
+                    - Delinquency rate: {profile.target_rate or 0:.2f}%
+                    """
+                    
+                    prompt = f"""Anda adalah AI assistant untuk data analyst di Gellium Finance.
+                    
         Konteks dataset:
         {context}
 
@@ -430,30 +698,8 @@ else:
 
         Jawab pertanyaan dengan singkat dan informatif dalam Bahasa Indonesia. Gunakan data yang tersedia.
         """
-                        
-                        try:
-                            response = requests.post(
-                                f"http://localhost:11434/api/chat",
-                                json={
-                                    "model": selected_model,
-                                    "messages": [{"role": "user", "content": prompt}],
-                                    "stream": False
-                                },
-                                timeout=130
-                            )
-                            
-                            if response.status_code == 200:
-                                answer = response.json()['message']['content']
-                                st.markdown(f'<div class="success-box">{answer}</div>', unsafe_allow_html=True)
-                            else:
-                                st.error(f"Error: {response.status_code}")
-                                
-                        except requests.exceptions.Timeout:
-                            st.error("⏱️ Waktu permintaan habis. Model mungkin sibuk. Coba lagi nanti.")
-                        except requests.exceptions.ConnectionError:
-                            st.error("🔌 Tidak dapat terhubung ke Ollama. Pastikan Ollama sudah running: `ollama serve`")
-                        except Exception as e:
-                            st.error(f"Error: {str(e)}")
+                    
+                    render_ai_stream(eda_analyzer.stream_chat(prompt, timeout=130), css_class='success-box')
                 else:
                     st.warning("Silakan masukkan pertanyaan.")
         else:
@@ -475,19 +721,71 @@ else:
         
         if selected_col:
             # Distribution chart (selalu tersedia)
-            fig = eda_analyzer.create_distribution_chart(selected_col)
+            fig = cached_distribution_chart(dataset_version, selected_col, df)
             if fig:
                 st.plotly_chart(fig, use_container_width=True)
             
             # Statistik dasar
-            if df[selected_col].dtype in ['int64', 'float64']:
+            if pd.api.types.is_numeric_dtype(df[selected_col]) and not pd.api.types.is_bool_dtype(df[selected_col]):
+                column_stats = cached_column_stats(dataset_version, selected_col, quantile_error, df)
                 col1, col2, col3 = st.columns(3)
                 with col1:
-                    st.metric("Mean", f"{df[selected_col].mean():.2f}")
+                    st.metric("Mean", f"{column_stats['mean']:.2f}")
                 with col2:
-                    st.metric("Median", f"{df[selected_col].median():.2f}")
+                    st.metric("Median" if quantile_error is None else "Median (≈)", f"{column_stats['median']:.2f}")
                 with col3:
-                    st.metric("Std Dev", f"{df[selected_col].std():.2f}")
+                    st.metric("Std Dev", f"{column_stats['std']:.2f}")
+    
+    # Tab 5: RAG Chatbot atas dokumen panduan
+    with tab5:
+        st.markdown('<p class="sub-header">📚 RAG Chatbot</p>', unsafe_allow_html=True)
+        
+        if not st.session_state.rag_loaded:
+            st.info("Upload dokumen panduan (PDF/DOCX) di sidebar lalu klik Index Documents untuk mulai bertanya.")
+        else:
+            rag_query = st.text_input("Tanya tentang dokumen panduan:", key="rag_query",
+                                      placeholder="Contoh: Apa arti kolom Credit_Utilization?")
+            col_ask, col_column = st.columns(2)
+            with col_ask:
+                ask_rag = st.button("🔎 Ask Documents", type="primary", use_container_width=True)
+            with col_column:
+                explain_col = st.selectbox("Atau jelaskan kolom:", ['-'] + list(df.columns), key="rag_column")
+                explain_rag = st.button("📖 Explain Column", use_container_width=True, disabled=explain_col == '-')
+            
+            if ask_rag and rag_query:
+                with st.spinner("Mencari di dokumen..."):
+                    answer, passages = rag_chatbot.ask(rag_query)
+                    st.markdown(answer)
+                with st.expander("📄 Sumber"):
+                    for passage in passages:
+                        st.markdown(f"**{passage['doc_id']}** #{passage['position'] + 1} "
+                                    f"(skor {passage['score']:.2f})")
+                        st.caption(passage['text'])
+            elif explain_rag and explain_col != '-':
+                with st.spinner("Mencari di dokumen..."):
+                    st.markdown(rag_chatbot.get_column_explanation(explain_col))
+    
+    # Export ditulis per chunk ke file; file yang sama dipakai ulang selama versi data tidak berubah
+    with st.expander("📤 Export Processed Data"):
+        export_labels = {'CSV': 'csv', 'CSV (gzip)': 'csv.gz', 'Parquet': 'parquet', 'Excel': 'excel'}
+        export_format = export_labels[st.selectbox("Format", list(export_labels), key="export_format")]
+        export_dir = os.path.join(DEFAULT_CACHE_DIR, 'exports')
+        export_file = export_path(export_dir, f"processed_{dataset_version}", export_format)
+        if not os.path.exists(export_file) and st.button("Prepare Export"):
+            prune_exports(export_dir)
+            with st.spinner("Exporting..."):
+                try:
+                    processor.save_processed_data(export_format, path=export_file)
+                except (OSError, ValueError) as e:
+                    st.error(f"Export gagal: {str(e)}")
+        if os.path.exists(export_file):
+            with open(export_file, 'rb') as export_handle:
+                st.download_button(
+                    "📥 Download Processed Data",
+                    export_handle,
+                    os.path.basename(export_file).replace(dataset_version, datetime.now().strftime('%Y%m%d')),
+                    use_container_width=True
+                )
     
     # Report Generation (bottom of all tabs)
     st.markdown("---")
@@ -499,10 +797,11 @@ else:
                 # Prepare analysis results
                 results = {
                     'missing_treatment': "Median imputation untuk numeric, 'Unknown' untuk categorical",
-                    'risk_factors': "Credit Utilization, Missed Payments, Debt to Income Ratio"
+                    'risk_factors': "Credit Utilization, Missed Payments, Debt to Income Ratio",
+                    'outliers': cached_outlier_summary(dataset_version, 'iqr', quantile_error, df)
                 }
                 
-                report_gen = ReportGenerator(df, results)
+                report_gen = ReportGenerator(df, results, profile=profile)
                 report = report_gen.generate_markdown_report()
                 
                 st.session_state.report = report
@@ -520,11 +819,15 @@ else:
     
     with col3:
         if st.button("🔄 Reset All", use_container_width=True):
-            for key in ['df', 'data_loaded', 'rag_loaded', 'chat_history', 'report']:
+            for key in ['df', 'data_loaded', 'rag_loaded', 'rag_chatbot', 'chat_history', 'report', 'dataset_version', 'loaded_file_key', 'dataset_store']:
                 if key in st.session_state:
                     del st.session_state[key]
             st.rerun()
 
 # Footer
 st.markdown("---")
-st.markdown("© 2024 Gellium Finance x Tata iQ | AI-Powered EDA System | Port: 8505")
\ No newline at end of file
+st.markdown("© 2024 Gellium Finance x Tata iQ | AI-Powered EDA System | Port: 8505")
+
+# Analisis AI diminta paling akhir agar seluruh halaman sudah tampil selama menunggu
+if st.session_state.data_loaded:
+    fill_ai_slots(eda_analyzer, ai_slots, ai_concurrency)
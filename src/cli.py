@@ -0,0 +1,212 @@
+"""
+Batch CLI: load -> profile -> imputation plan -> risk analysis -> report tanpa Streamlit
+
+Contoh:
+    python -m src.cli data/extracts/*.csv --output-dir reports --workers 4
+    python -m src.cli data/2024-06/ --plan imputation_plan.json --history risk_statistics.json
+
+Setiap dataset (file, atau folder partisi) diproses di proses terpisah. Ringkasan
+berisi timing per tahap ditulis sebagai JSON ke stdout atau ke --timings.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from src import notifications
+from src.data_processor import ID_COLUMNS, DataProcessor
+from src.dataset_profile import TARGET_COLUMN
+from src.exporter import EXPORT_FORMATS
+from src.imputation import ImputationPlan
+from src.report_generator import ReportGenerator
+from src.risk_analyzer import RiskAnalyzer
+from src.risk_statistics import RiskStatistics
+
+
+def default_plan(df: pd.DataFrame) -> ImputationPlan:
+    """Median for numeric columns and 'Unknown' for categorical ones, as recommended in the app"""
+    plan = ImputationPlan()
+    for col in df.columns[df.isna().any()]:
+        if col in ID_COLUMNS or col == TARGET_COLUMN:
+            continue
+        numeric = pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])
+        plan.add(col, 'median' if numeric else 'unknown')
+    return plan
+
+
+def _describe_plan(plan: ImputationPlan) -> str:
+    if not plan.steps:
+        return "Tidak ada imputasi"
+    return ", ".join(f"{col}: {step['strategy']}" for col, step in plan.steps.items())
+
+
+def _output_names(sources: List[str]) -> List[str]:
+    """Output directory name per source: the file stem, or the full file name if stems collide"""
+    names = []
+    for source in sources:
+        name = os.path.basename(os.path.normpath(source))
+        for ext in ('.csv.gz', '.csv', '.xlsx', '.xls'):
+            if name.lower().endswith(ext):
+                name = name[:-len(ext)]
+                break
+        names.append(name)
+    return [
+        name if names.count(name) == 1 else os.path.basename(os.path.normpath(source)).replace('.', '_')
+        for name, source in zip(names, sources)
+    ]
+
+
+def run_pipeline(source: str, output_dir: str, name: Optional[str] = None, plan_path: Optional[str] = None,
+                 history_path: Optional[str] = None, export_format: Optional[str] = None,
+                 compact: bool = False, use_cache: bool = True, quantile_error: Optional[float] = None,
+                 partition_workers: Optional[int] = None) -> Dict:
+    """Run the full analysis for one dataset and return its outputs and per-stage timings"""
+    result = {'source': source, 'status': 'ok', 'timings': {}, 'outputs': {}}
+    timings = result['timings']
+    target_dir = os.path.join(output_dir, name or _output_names([source])[0])
+    started = time.perf_counter()
+
+    def stage(name, started_at):
+        timings[name] = round(time.perf_counter() - started_at, 4)
+        return time.perf_counter()
+
+    try:
+        t = time.perf_counter()
+        processor = DataProcessor()
+        processor.quantile_error = quantile_error
+        with notifications.capture() as messages:
+            if os.path.isdir(source):
+                df = processor.load_partitions(source, use_cache=use_cache, max_workers=partition_workers,
+                                               compact=compact)
+            else:
+                df = processor.load_data(file_path=source, use_cache=use_cache, compact=compact)
+        result['messages'] = [f"{level}: {message}" for level, message in messages]
+        if df is None:
+            raise ValueError(messages[-1][1] if messages else f"Could not load {source}")
+        result['rows'] = len(df)
+        t = stage('load', t)
+
+        profile = processor.get_profile()
+        result['missing_cells'] = profile.missing_total
+        t = stage('profile', t)
+
+        plan = ImputationPlan.load(plan_path) if plan_path else default_plan(processor.df)
+        if plan.steps:
+            processor.apply_plan(plan)
+        t = stage('impute', t)
+
+        stats = RiskStatistics.from_frame(processor.df)
+        if history_path:
+            stats = RiskStatistics.load(history_path).merge(stats)
+        analyzer = RiskAnalyzer(processor.df, stats=stats)
+        top_risks = analyzer.get_top_risk_factors()
+        delinquency = analyzer.delinquency_rate()
+        result['delinquency_rate'] = round(delinquency[0], 4) if delinquency else None
+        outliers = processor.detect_outliers_all('iqr').get('summary', pd.DataFrame())
+        t = stage('risk', t)
+
+        results = {
+            'missing_treatment': _describe_plan(plan),
+            'outliers': outliers
+        }
+        if len(top_risks) > 0:
+            results['risk_factors'] = ", ".join(top_risks['Risk Factor'])
+        # Profil sebelum imputasi, agar laporan tetap menampilkan missing values dan penanganannya
+        report = ReportGenerator(processor.df, results, profile=profile).generate_markdown_report()
+        t = stage('report', t)
+
+        os.makedirs(target_dir, exist_ok=True)
+        outputs = {
+            'report': os.path.join(target_dir, 'EDA_Report.md'),
+            'statistics': os.path.join(target_dir, 'risk_statistics.json'),
+            'plan': os.path.join(target_dir, 'imputation_plan.json')
+        }
+        with open(outputs['report'], 'w', encoding='utf-8') as f:
+            f.write(report)
+        stats.save(outputs['statistics'])
+        plan.save(outputs['plan'])
+        if export_format:
+            outputs['data'] = processor.save_processed_data(
+                export_format, path=os.path.join(target_dir, f"processed{EXPORT_FORMATS[export_format]}")
+            )
+        result['outputs'] = outputs
+        result['dataset_version'] = processor.dataset_version
+        stage('write', t)
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = f"{type(e).__name__}: {e}"
+
+    timings['total'] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m src.cli',
+        description="Run the Gellium delinquency analysis pipeline on one or more datasets"
+    )
+    parser.add_argument('sources', nargs='+',
+                        help="CSV/Excel files, or directories of partitions (one dataset per directory)")
+    parser.add_argument('-o', '--output-dir', default='reports', help="Directory for reports and artifacts")
+    parser.add_argument('--plan', help="Saved imputation plan (JSON) applied without refitting")
+    parser.add_argument('--history', help="Saved risk statistics (JSON) merged with each dataset")
+    parser.add_argument('--export', choices=list(EXPORT_FORMATS), help="Also write the processed data")
+    parser.add_argument('--compact', action='store_true', help="Load with compact dtypes")
+    parser.add_argument('--approx-quantiles', action='store_true',
+                        help="Median/IQR from a quantile sketch (±1%% rank)")
+    parser.add_argument('--no-cache', action='store_true', help="Do not use the columnar dataset cache")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="Datasets processed in parallel (default: CPU count)")
+    parser.add_argument('--timings', help="Write the JSON summary here instead of stdout")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    options = {
+        'output_dir': args.output_dir,
+        'plan_path': args.plan,
+        'history_path': args.history,
+        'export_format': args.export,
+        'compact': args.compact,
+        'use_cache': not args.no_cache,
+        'quantile_error': 0.01 if args.approx_quantiles else None
+    }
+
+    started = time.perf_counter()
+    workers = args.workers or os.cpu_count() or 1
+    names = _output_names(args.sources)
+    if len(args.sources) == 1 or workers == 1:
+        results = [run_pipeline(source, name=name, **options)
+                   for source, name in zip(args.sources, names)]
+    else:
+        # Partisi dalam satu dataset dibaca berurutan; paralelisme ada di level dataset
+        with ProcessPoolExecutor(max_workers=min(workers, len(args.sources))) as executor:
+            futures = [executor.submit(run_pipeline, source, name=name, partition_workers=1, **options)
+                       for source, name in zip(args.sources, names)]
+            results = [future.result() for future in futures]
+
+    summary = {
+        'datasets': results,
+        'workers': workers,
+        'total_seconds': round(time.perf_counter() - started, 4),
+        'failed': sum(result['status'] != 'ok' for result in results)
+    }
+    text = json.dumps(summary, indent=2, default=str)
+    if args.timings:
+        with open(args.timings, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
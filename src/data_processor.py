@@ -3,13 +3,176 @@ Data Processor untuk dataset delinquency
 """
 import pandas as pd
 import numpy as np
-import streamlit as st
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import hashlib
 import io
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+from pandas.api.types import CategoricalDtype, union_categoricals
+
+from src import notifications
+from src.dataset_profile import DatasetProfile, dataset_fingerprint, get_dataset_profile
+from src.disk_cache import DatasetCache, hash_bytes
+from src.exporter import DEFAULT_EXPORT_CHUNKSIZE, iter_export, write_export
+from src.imputation import ImputationPlan
+from src.shared_store import SharedDatasetStore
+from src.streaming_stats import QuantileSketch, series_quantiles
+
+MONTH_COLUMNS = [f'Month_{i}' for i in range(1, 7)]
+MONTH_CODES = {'On-time': 0, 'Late': 1, 'Missed': 2}
+ID_COLUMNS = ['Customer_ID']
+PARTITION_EXTENSIONS = ('.csv', '.csv.gz', '.xlsx', '.xls')
+# Ambang default per metode outlier: kelipatan IQR, |z|, dan modified z-score (MAD)
+OUTLIER_THRESHOLDS = {'iqr': 1.5, 'zscore': 3.0, 'mad': 3.5}
+# Skala desimal maksimum yang dicoba saat memeriksa apakah float32 cukup untuk sebuah kolom
+MAX_FLOAT_DECIMALS = 6
+
+
+def concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate frames, keeping categorical columns categorical across differing categories"""
+    frames = [f for f in frames if f is not None]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+    
+    frames = [f.copy(deep=False) for f in frames]
+    for col in frames[0].columns:
+        if not all(col in f.columns and isinstance(f[col].dtype, CategoricalDtype) for f in frames):
+            continue
+        categories = union_categoricals([f[col] for f in frames], ignore_order=True).categories
+        for f in frames:
+            f[col] = f[col].cat.set_categories(categories)
+    
+    return pd.concat(frames, ignore_index=True)
+
+
+def _decimal_scale(values: np.ndarray) -> Optional[int]:
+    """Fewest decimals (at most MAX_FLOAT_DECIMALS) that write every value exactly, or None"""
+    for decimals in range(MAX_FLOAT_DECIMALS + 1):
+        if np.array_equal(np.round(values, decimals), values):
+            return decimals
+    return None
+
+
+def _fits_float32(values: np.ndarray, float_rtol: Optional[float]) -> bool:
+    """Whether float64 values survive a float32 round trip
+
+    Default (float_rtol=None): nilai float32 yang dibulatkan ke skala desimal data
+    harus sama persis dengan aslinya, mis. 0.22 lolos, tetapi saldo di atas 2^24
+    dengan sen atau nilai hasil hitung (presisi penuh) tetap float64.
+    """
+    restored = values.astype('float32').astype('float64')
+    if float_rtol is not None:
+        return np.allclose(restored, values, rtol=float_rtol, atol=0)
+    decimals = _decimal_scale(values)
+    return decimals is not None and np.array_equal(np.round(restored, decimals), values)
+
+
+def _compact_series(series: pd.Series, float_rtol: Optional[float]) -> pd.Series:
+    """Smallest dtype that holds the column without losing information"""
+    dtype = series.dtype
+    
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        if isinstance(dtype, CategoricalDtype):
+            return series
+        if series.name in ID_COLUMNS or series.nunique() > len(series) // 2:
+            # Hampir unik: kategori tidak menghemat, pakai string berbasis Arrow
+            try:
+                return series.astype('string[pyarrow]')
+            except (ImportError, TypeError):
+                return series
+        return series.astype('category')
+    
+    if pd.api.types.is_bool_dtype(dtype) or not pd.api.types.is_numeric_dtype(dtype):
+        return series
+    
+    values = series.dropna()
+    has_nans = len(values) < len(series)
+    if len(values) == 0:
+        return series.astype('float32')
+    
+    if pd.api.types.is_integer_dtype(dtype) or (values % 1 == 0).all():
+        smallest = pd.to_numeric(values, downcast='integer')
+        if has_nans:
+            # Integer nullable agar NaN tidak memaksa float64
+            return series.astype(smallest.dtype.name.capitalize())
+        return series.astype(smallest.dtype)
+    
+    if _fits_float32(values.to_numpy('float64'), float_rtol):
+        return series.astype('float32')
+    return series
+
+
+def compact_frame(df: pd.DataFrame, float_rtol: Optional[float] = None) -> pd.DataFrame:
+    """Return a copy of df converted to categoricals, small (nullable) ints and float32
+
+    Float hanya menjadi float32 jika lolos round trip di skala desimal data, kecuali
+    float_rtol diberikan (toleransi relatif yang diterima, jadi lossy).
+    """
+    return pd.DataFrame({col: _compact_series(df[col], float_rtol) for col in df.columns}, index=df.index)
+
+
+def derive_version(parent: str, operation: str) -> str:
+    """Version token of a dataset after applying operation to the dataset with token parent"""
+    return hashlib.sha256(f"{parent}|{operation}".encode()).hexdigest()[:16]
+
+
+def _open_source(source):
+    """(readable source, content hash) of a path or uploaded file
+
+    Path dibaca langsung oleh reader; file upload menjadi BytesIO bernama (picklable,
+    dan namanya dipakai untuk mengenali CSV/Excel).
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            content_hash = hash_bytes(iter(lambda: f.read(1024 * 1024), b''))
+        return source, content_hash
+    content = source.getvalue() if hasattr(source, 'getvalue') else source.read()
+    buffer = io.BytesIO(content)
+    buffer.name = _source_name(source)
+    return buffer, hash_bytes([content])
+
+
+def _load_partition(source, use_cache: bool = True,
+                    content_hash: Optional[str] = None) -> Tuple[str, pd.DataFrame, str]:
+    """Process-pool worker: read and validate one partition, returning (name, frame, content hash)
+
+    Tanpa content_hash, source dibuka (dan di-hash) di worker dengan _open_source.
+    """
+    processor = DataProcessor()
+    if content_hash is None:
+        source, content_hash = _open_source(source)
+    name = os.path.basename(_source_name(source))
+    df = processor._read_source(source, content_hash, use_cache)
+    return name, processor.conform_partition(df, name), content_hash
+
+
+def _source_name(source) -> str:
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    return getattr(source, 'name', '') or ''
+
+
+def is_csv_source(source) -> bool:
+    """True if the file name says CSV"""
+    return _source_name(source).lower().endswith(('.csv', '.csv.gz'))
 
 class DataProcessor:
     def __init__(self):
         self.df = None
+        self.memory_report = None
+        self._profile = None
+        self._profile_df = None
+        # Token versi dataset: berubah setiap kali data dimuat atau dimodifikasi
+        self.dataset_version = None
+        # None = kuantil eksak; angka = QuantileSketch dengan rank error ini (median, IQR)
+        self.quantile_error = None
+        # {nama file: frame} dan {nama file: content hash} dari load_partitions
+        self.partitions = {}
+        self.partition_hashes = {}
         self.column_descriptions = {
             'Customer_ID': 'Unique identifier (Categorical)',
             'Age': 'Customer age in years (Numerical)',
@@ -32,63 +195,285 @@ class DataProcessor:
             'Month_6': 'Payment month 6'
         }
     
-    def load_data(self, file_path=None, uploaded_file=None):
-        """Load data from Excel file"""
-        try:
-            if uploaded_file is not None:
-                self.df = pd.read_excel(uploaded_file)
-            elif file_path:
-                self.df = pd.read_excel(file_path)
+    def get_csv_schema(self) -> Dict[str, object]:
+        """Explicit read dtypes for CSV extracts, derived from column_descriptions"""
+        schema = {}
+        for col, desc in self.column_descriptions.items():
+            if col in MONTH_COLUMNS:
+                # Dibaca sebagai kategori tetap lalu dikonversi ke kode int8
+                schema[col] = CategoricalDtype(list(MONTH_CODES))
+            elif col in ID_COLUMNS:
+                schema[col] = 'object'
+            elif '(Categorical)' in desc:
+                schema[col] = 'category'
+            elif '(Binary)' in desc:
+                schema[col] = 'Int8'
             else:
-                st.error("No data source provided")
+                schema[col] = 'float64'
+        return schema
+    
+    def iter_csv_chunks(self, source, chunksize: int = 100_000,
+                        progress_callback: Optional[Callable[[float], None]] = None) -> Iterator[pd.DataFrame]:
+        """Yield typed chunks of a CSV file without a dtype inference pass"""
+        handle = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+        try:
+            handle.seek(0, os.SEEK_END)
+            total_size = handle.tell() or 1
+            handle.seek(0)
+            
+            compression = 'gzip' if _source_name(source).lower().endswith('.gz') else None
+            reader = pd.read_csv(handle, dtype=self.get_csv_schema(), chunksize=chunksize,
+                                 compression=compression)
+            for chunk in reader:
+                for col in MONTH_COLUMNS:
+                    if col in chunk.columns:
+                        codes = chunk[col].cat.codes
+                        chunk[col] = codes.astype('Int8').mask(codes < 0)
+                if progress_callback is not None and compression is None:
+                    progress_callback(min(handle.tell() / total_size, 1.0))
+                yield chunk
+        finally:
+            if handle is not source:
+                handle.close()
+        
+        if progress_callback is not None:
+            progress_callback(1.0)
+    
+    def _read_csv(self, source, chunksize: int = 100_000,
+                  progress_callback: Optional[Callable[[float], None]] = None) -> pd.DataFrame:
+        df = concat_frames(list(self.iter_csv_chunks(source, chunksize, progress_callback)))
+        for col in MONTH_COLUMNS:
+            if col in df.columns and not df[col].hasnans:
+                df[col] = df[col].astype('int8')
+        return df
+    
+    def load_data(self, file_path=None, uploaded_file=None, use_cache: bool = True,
+                  progress_callback: Optional[Callable[[float], None]] = None, compact: bool = False,
+                  shared: bool = False):
+        """Load data from an Excel or CSV file, reusing the columnar cache for files seen before
+
+        Dengan shared=True dataset dibuka memory-mapped dari SharedDatasetStore, sehingga
+        session yang memuat file yang sama berbagi satu salinan di page cache.
+        """
+        try:
+            if uploaded_file is None and not file_path:
+                notifications.error("No data source provided")
                 return None
+            source, content_hash = _open_source(uploaded_file if uploaded_file is not None else file_path)
             
-            # Convert month columns to categorical
-            month_cols = [f'Month_{i}' for i in range(1, 7)]
-            for col in month_cols:
-                if col in self.df.columns:
-                    self.df[col] = self.df[col].map({'On-time': 0, 'Late': 1, 'Missed': 2})
+            is_csv = is_csv_source(source)
+            self.dataset_version = derive_version(content_hash, 'load')
+            store = SharedDatasetStore() if shared else None
+            # 'exact-float32': entri lama dibuat dengan aturan downcast float32 yang lossy
+            shared_key = derive_version(content_hash, f"shared:{'csv' if is_csv else 'excel'}:{compact}:exact-float32")
+            if store is not None:
+                df, version = store.open(shared_key)
+                if df is not None:
+                    self.df = df
+                    self.dataset_version = version
+                    return self.df
             
-            return self.df
+            self.df = self._read_source(source, content_hash, use_cache, progress_callback)
+            
+            if compact:
+                self.compact_memory()
+            
+            return self._share(store, shared_key)
+            
+        except Exception as e:
+            notifications.error(f"Error loading data: {str(e)}")
+            return None
+    
+    def _read_source(self, source, content_hash: str, use_cache: bool = True,
+                     progress_callback: Optional[Callable[[float], None]] = None) -> pd.DataFrame:
+        """Read one CSV/Excel source, or its cached columnar copy"""
+        is_csv = is_csv_source(source)
+        cache = DatasetCache() if use_cache else None
+        cache_key = cache.make_key(content_hash, 'csv' if is_csv else 'excel') if cache else None
+        if cache is not None:
+            cached = cache.load(cache_key)
+            if cached is not None:
+                return cached
+        
+        if is_csv:
+            df = self._read_csv(source, progress_callback=progress_callback)
+        else:
+            df = pd.read_excel(source)
+            
+            # Convert month columns to categorical
+            for col in MONTH_COLUMNS:
+                if col in df.columns:
+                    df[col] = df[col].map(MONTH_CODES)
+        
+        if cache is not None:
+            cache.store(cache_key, df)
+        return df
+    
+    def conform_partition(self, df: pd.DataFrame, name: str = 'partition') -> pd.DataFrame:
+        """Check df has exactly the columns of column_descriptions and cast them to the CSV schema
+
+        Dengan tipe yang sama di setiap partisi, hasil concat tidak bergantung pada
+        tipe yang kebetulan diinferensi read_excel per file.
+        """
+        missing = [col for col in self.column_descriptions if col not in df.columns]
+        unexpected = [col for col in df.columns if col not in self.column_descriptions]
+        if missing or unexpected:
+            raise ValueError(f"{name}: schema does not match column_descriptions "
+                             f"(missing: {missing or '-'}, unexpected: {unexpected or '-'})")
+        
+        schema = self.get_csv_schema()
+        columns = {}
+        for col in df.columns:
+            series = df[col]
+            dtype = schema[col]
+            try:
+                if col in MONTH_COLUMNS:
+                    # Sudah berupa kode 0/1/2 (lihat _read_source)
+                    series = pd.to_numeric(series).astype('Int8')
+                    series = series.astype('int8') if not series.hasnans else series
+                elif col in ID_COLUMNS:
+                    series = series if pd.api.types.is_object_dtype(series.dtype) else series.astype(object)
+                elif dtype == 'category':
+                    series = series if isinstance(series.dtype, CategoricalDtype) else series.astype('category')
+                else:
+                    series = pd.to_numeric(series).astype(dtype)
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"{name}: column {col} does not match its schema ({e})") from e
+            columns[col] = series
+        return pd.DataFrame(columns, index=df.index)
+    
+    def load_partitions(self, sources, use_cache: bool = True, max_workers: Optional[int] = None,
+                        combine: bool = True, compact: bool = False,
+                        progress_callback: Optional[Callable[[float], None]] = None):
+        """Load several files (paths, uploaded files, or a directory of partitions) in parallel
+
+        Setiap partisi dibaca di proses terpisah, divalidasi terhadap column_descriptions,
+        lalu digabung menjadi self.df (combine=True). self.partitions selalu berisi
+        {nama: frame} untuk agregasi per partisi (mis. RiskStatistics.from_frame lalu merge),
+        dan self.partition_hashes content hash tiap partisi. dataset_version hanya berubah
+        jika self.df diganti (combine=True).
+        Partisi yang tidak valid menghasilkan notifications.error dan None.
+        """
+        try:
+            if isinstance(sources, (str, os.PathLike)):
+                directory = os.fspath(sources)
+                sources = sorted(
+                    os.path.join(directory, name) for name in os.listdir(directory)
+                    if name.lower().endswith(PARTITION_EXTENSIONS)
+                )
+            # Path di-hash di worker; file upload dibuka di sini dan dikirim sebagai buffer bernama
+            opened = [(source, None) if isinstance(source, (str, os.PathLike)) else _open_source(source)
+                      for source in sources]
+            if not opened:
+                notifications.error("No data source provided")
+                return None
+            sources, hashes = zip(*opened)
             
+            results = {}
+            executor = None
+            if len(sources) == 1 or max_workers == 1:
+                loaded = map(_load_partition, sources, [use_cache] * len(sources), hashes)
+            else:
+                executor = ProcessPoolExecutor(max_workers=max_workers)
+                loaded = executor.map(_load_partition, sources, [use_cache] * len(sources), hashes)
+            try:
+                for i, (name, df, content_hash) in enumerate(loaded, 1):
+                    if name in results:
+                        # Nama file sama dari folder berbeda (mis. per region)
+                        name = f"{name} ({i})"
+                    results[name] = (df, content_hash)
+                    if progress_callback is not None:
+                        progress_callback(i / len(sources))
+            finally:
+                if executor is not None:
+                    executor.shutdown(cancel_futures=True)
         except Exception as e:
-            st.error(f"Error loading data: {str(e)}")
+            notifications.error(f"Error loading partitions: {str(e)}")
+            return None
+        
+        self.partitions = {name: df for name, (df, _) in results.items()}
+        self.partition_hashes = {name: content_hash for name, (_, content_hash) in results.items()}
+        if not combine:
+            return self.partitions
+        
+        self.df = concat_frames(list(self.partitions.values()))
+        self.dataset_version = derive_version(','.join(self.partition_hashes.values()), 'load_partitions')
+        self._profile = None
+        if compact:
+            self.compact_memory()
+        return self.df
+    
+    def _share(self, store: Optional[SharedDatasetStore], key: str) -> pd.DataFrame:
+        """Persist the loaded frame to the shared store and switch to its memory-mapped copy"""
+        if store is None:
+            return self.df
+        try:
+            store.put(key, self.df, version=self.dataset_version)
+        except (OSError, ValueError, TypeError) as e:
+            notifications.warning(f"Shared dataset store unavailable: {str(e)}")
+            return self.df
+        df, _ = store.open(key)
+        if df is not None:
+            self.df = df
+        return self.df
+    
+    def _bump_version(self, operation: str):
+        """Derive the version token after operation; call only once the new frame is in self.df"""
+        # Tanpa versi (frame di-set langsung), basisnya fingerprint isi frame: dua dataset
+        # berbeda tidak boleh berbagi token, karena token menjadi kunci cache hasil analisis
+        parent = self.dataset_version or dataset_fingerprint(self.df)
+        self.dataset_version = derive_version(parent, operation)
+        self._profile = None
+    
+    def get_profile(self) -> Optional[DatasetProfile]:
+        """Profile of the current dataset, computed once until the data changes"""
+        if self.df is None:
             return None
+        if self._profile is None or self._profile_df is not self.df:
+            self._profile = get_dataset_profile(self.df, fingerprint=self.dataset_version)
+            self._profile_df = self.df
+        return self._profile
     
     def get_basic_info(self) -> Dict:
         """Get basic dataset information"""
-        if self.df is None:
+        profile = self.get_profile()
+        if profile is None:
             return {}
         
         info = {
-            'total_records': len(self.df),
-            'total_columns': len(self.df.columns),
-            'missing_values': self.df.isnull().sum().to_dict(),
-            'data_types': self.df.dtypes.astype(str).to_dict(),
-            'numeric_columns': self.df.select_dtypes(include=[np.number]).columns.tolist(),
-            'categorical_columns': self.df.select_dtypes(include=['object']).columns.tolist(),
-            'memory_usage': f"{self.df.memory_usage(deep=True).sum() / 1024**2:.2f} MB"
+            'total_records': profile.n_rows,
+            'total_columns': profile.n_columns,
+            'missing_values': profile.null_counts.to_dict(),
+            'data_types': profile.dtypes.astype(str).to_dict(),
+            'numeric_columns': profile.numeric_columns,
+            'categorical_columns': profile.categorical_columns,
+            'memory_usage': profile.memory_usage
         }
         
         # Basic statistics
-        info['statistics'] = self.df.describe().to_dict()
+        info['statistics'] = profile.describe.to_dict()
         
         return info
     
-    def detect_missing_values(self) -> pd.DataFrame:
-        """Detect and analyze missing values"""
+    def compact_memory(self, float_rtol: Optional[float] = None) -> Dict:
+        """Convert the dataset to compact dtypes and report memory before/after"""
         if self.df is None:
-            return pd.DataFrame()
+            return {}
         
-        missing_df = pd.DataFrame({
-            'Column': self.df.columns,
-            'Missing Count': self.df.isnull().sum().values,
-            'Missing Percentage': (self.df.isnull().sum().values / len(self.df) * 100).round(2)
-        })
+        before = self.get_basic_info()['memory_usage']
+        self.df = compact_frame(self.df, float_rtol)
+        self._bump_version(f"compact:{float_rtol}")
+        self.memory_report = {'before': before, 'after': self.get_basic_info()['memory_usage']}
         
-        missing_df = missing_df[missing_df['Missing Count'] > 0].sort_values('Missing Percentage', ascending=False)
+        return self.memory_report
+    
+    def detect_missing_values(self) -> pd.DataFrame:
+        """Detect and analyze missing values"""
+        profile = self.get_profile()
+        if profile is None:
+            return pd.DataFrame()
         
-        return missing_df
+        return profile.missing_table()
     
     def suggest_imputation(self, column: str, missing_pct: float) -> Dict:
         """Suggest imputation strategy based on column type and missing percentage"""
@@ -107,7 +492,7 @@ class DataProcessor:
             elif missing_pct < 20:
                 suggestions['strategy'] = 'Regression Imputation'
                 suggestions['rationale'] = f'{missing_pct}% missing, can predict using correlated features'
-                suggestions['code'] = f"# Use linear regression with Age and Credit_Score to predict {column}"
+                suggestions['code'] = f"df = ImputationPlan().add('{column}', 'regression').fit(df).apply(df)"
             else:
                 suggestions['strategy'] = 'Consider Dropping'
                 suggestions['rationale'] = f'{missing_pct}% missing is too high, consider dropping column'
@@ -135,28 +520,61 @@ class DataProcessor:
         if self.df is None:
             return None
         
-        if strategy == 'drop_column':
-            self.df.drop(column, axis=1, inplace=True)
-        elif strategy == 'median':
-            self.df[column].fillna(self.df[column].median(), inplace=True)
-        elif strategy == 'mean':
-            self.df[column].fillna(self.df[column].mean(), inplace=True)
-        elif strategy == 'mode':
-            self.df[column].fillna(self.df[column].mode()[0], inplace=True)
-        elif strategy == 'unknown':
-            self.df[column].fillna('Unknown', inplace=True)
-        elif strategy == 'zero':
-            self.df[column].fillna(0, inplace=True)
+        # Frame baru (kolom lain berbagi buffer); frame lama bisa masih dipakai VersionedDataset
+        plan = ImputationPlan().add(column, strategy).fit(self.df, self.quantile_error)
+        self.df = plan.apply(self.df)
+        # Fingerprint memuat nilai hasil fit (mis. median eksak vs sketch), sama seperti apply_plan
+        self._bump_version(f"plan:{plan.fingerprint()}")
+        
+        return self.df
+    
+    def apply_plan(self, plan: ImputationPlan, refit: bool = False) -> Optional[pd.DataFrame]:
+        """Apply an imputation plan to all its columns at once
+
+        Plan yang sudah di-fit (mis. dimuat dari file) dipakai apa adanya kecuali refit=True.
+        self.df diganti dengan frame baru; frame lama tidak diubah.
+        """
+        if self.df is None:
+            return None
         
+        if refit or not plan.is_fitted:
+            plan.fit(self.df, self.quantile_error)
+        df = plan.apply(self.df)
+        self.df = df
+        self._bump_version(f"plan:{plan.fingerprint()}")
         return self.df
     
+    def _quantiles(self, column: str, qs: List[float]) -> List[float]:
+        return series_quantiles(self.df[column], qs, self.quantile_error)
+    
+    def sketch_columns(self, source=None, columns: Optional[List[str]] = None, error: float = 0.01,
+                       chunksize: int = 100_000) -> Dict[str, QuantileSketch]:
+        """Quantile sketches of numeric columns, from self.df or streamed from a CSV source
+
+        Sketch dari beberapa partisi bisa digabung dengan QuantileSketch.merge.
+        """
+        if source is not None:
+            chunks = self.iter_csv_chunks(source, chunksize=chunksize)
+        elif self.df is not None:
+            chunks = (self.df.iloc[start:start + chunksize] for start in range(0, len(self.df), chunksize))
+        else:
+            return {}
+        
+        sketches = {}
+        for chunk in chunks:
+            if not sketches:
+                numeric = chunk.select_dtypes(include=[np.number]).columns
+                sketches = {col: QuantileSketch(error) for col in (columns or numeric) if col in numeric}
+            for col, sketch in sketches.items():
+                sketch.update(chunk[col])
+        return sketches
+    
     def detect_outliers(self, column: str) -> pd.DataFrame:
         """Detect outliers using IQR method"""
         if self.df is None or column not in self.df.columns:
             return pd.DataFrame()
         
-        Q1 = self.df[column].quantile(0.25)
-        Q3 = self.df[column].quantile(0.75)
+        Q1, Q3 = self._quantiles(column, [0.25, 0.75])
         IQR = Q3 - Q1
         
         lower_bound = Q1 - 1.5 * IQR
@@ -166,15 +584,87 @@ class DataProcessor:
         
         return outliers
     
-    def save_processed_data(self, format='csv'):
-        """Save processed data"""
+    def detect_outliers_all(self, method: str = 'iqr', columns: Optional[List[str]] = None,
+                            threshold: Optional[float] = None) -> Dict:
+        """Outlier bounds, mask, counts and row indices for many numeric columns at once
+
+        Returns dict dengan 'columns', 'mask' (array bool n_rows x n_columns),
+        'bounds' (DataFrame lower/upper), 'counts', 'indices' (label baris per kolom)
+        dan 'summary' untuk ditampilkan. Baris data tidak disalin.
+        """
+        if self.df is None or method not in OUTLIER_THRESHOLDS:
+            return {}
+        threshold = OUTLIER_THRESHOLDS[method] if threshold is None else threshold
+        
+        if columns is None:
+            # Kolom biner/kode (<= 2 nilai unik) selalu "outlier" menurut IQR, jadi dilewati
+            profile = self.get_profile()
+            columns = [col for col in profile.numeric_columns
+                       if not pd.api.types.is_bool_dtype(self.df[col]) and profile.nunique[col] > 2]
+        values = self.df[columns].to_numpy(dtype='float64', na_value=np.nan)
+        
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # kolom yang seluruhnya NaN
+            if method == 'iqr':
+                if self.quantile_error is None:
+                    q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+                else:
+                    q1, q3 = np.array([QuantileSketch.from_series(self.df[col], self.quantile_error).quantile([0.25, 0.75])
+                                       for col in columns]).reshape(-1, 2).T
+                lower, upper = q1 - threshold * (q3 - q1), q3 + threshold * (q3 - q1)
+            elif method == 'zscore':
+                mean, std = np.nanmean(values, axis=0), np.nanstd(values, axis=0, ddof=1)
+                lower, upper = mean - threshold * std, mean + threshold * std
+            else:
+                median = np.nanmedian(values, axis=0)
+                mad = np.nanmedian(np.abs(values - median), axis=0)
+                # Modified z-score = 0.6745 * (x - median) / MAD
+                lower, upper = median - threshold * mad / 0.6745, median + threshold * mad / 0.6745
+        
+        mask = (values < lower) | (values > upper)
+        counts = pd.Series(mask.sum(axis=0), index=columns, dtype='int64')
+        bounds = pd.DataFrame({'lower': lower, 'upper': upper}, index=columns)
+        
+        summary = pd.DataFrame({
+            'Column': columns,
+            'Method': method,
+            'Lower Bound': lower,
+            'Upper Bound': upper,
+            'Outliers': counts.values,
+            'Outlier %': (counts.values / max(len(self.df), 1) * 100).round(2)
+        }).sort_values('Outliers', ascending=False)
+        
+        return {
+            'method': method,
+            'columns': columns,
+            'mask': mask,
+            'bounds': bounds,
+            'counts': counts,
+            'indices': {col: self.df.index[mask[:, i]] for i, col in enumerate(columns)},
+            'summary': summary
+        }
+    
+    def save_processed_data(self, format='csv', path: Optional[str] = None, chunksize: Optional[int] = None):
+        """Save processed data
+
+        Tanpa path/chunksize seluruh hasil dikembalikan sekaligus (str/bytes). Dengan path
+        data ditulis per chunk ke file; dengan chunksize saja dikembalikan generator bytes.
+        Format: 'csv', 'csv.gz', 'parquet', 'excel'.
+        """
         if self.df is None:
             return None
         
+        if path is not None:
+            return write_export(self.df, path, format, chunksize or DEFAULT_EXPORT_CHUNKSIZE)
+        if chunksize is not None:
+            return iter_export(self.df, format, chunksize)
+        
         if format == 'csv':
             return self.df.to_csv(index=False)
         elif format == 'excel':
             output = io.BytesIO()
             with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
                 self.df.to_excel(writer, index=False, sheet_name='Processed_Data')
-            return output.getvalue()
\ No newline at end of file
+            return output.getvalue()
+        else:
+            return b''.join(iter_export(self.df, format))
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Dataset Profile: statistik dataset yang dihitung sekali dan dipakai bersama
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.streaming_stats import correlation_matrix
+
+TARGET_COLUMN = 'Delinquent_Account'
+
+_PROFILE_CACHE: "OrderedDict[str, DatasetProfile]" = OrderedDict()
+_PROFILE_CACHE_SIZE = 8
+_PROFILE_LOCK = threading.Lock()
+
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a DataFrame (values, index, column names and dtypes)"""
+    digest = hashlib.sha256()
+    digest.update(repr((df.shape, list(df.columns), df.dtypes.astype(str).tolist())).encode())
+    if len(df.columns) > 0:
+        digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+class DatasetProfile:
+    """Null counts, cardinality, describe, dtypes, target rate and correlations of one dataset"""
+
+    def __init__(self, df: pd.DataFrame, fingerprint: Optional[str] = None):
+        self.fingerprint = fingerprint or dataset_fingerprint(df)
+        self.n_rows = len(df)
+        self.n_columns = len(df.columns)
+        self.columns = list(df.columns)
+        self.dtypes = df.dtypes
+
+        self.null_counts = df.isna().sum()
+        self.non_null_counts = self.n_rows - self.null_counts
+        self.nunique = df.nunique()
+        self.memory_bytes = int(df.memory_usage(deep=True).sum())
+
+        numeric_df = df.select_dtypes(include=[np.number])
+        self.numeric_columns = numeric_df.columns.tolist()
+        self.categorical_columns = df.select_dtypes(include=['object', 'category', 'string']).columns.tolist()
+        self.describe = df.describe() if self.numeric_columns else pd.DataFrame()
+        self.correlations = correlation_matrix(numeric_df) if len(self.numeric_columns) > 1 else pd.DataFrame()
+
+        self.target_rate = None
+        self.target_count = None
+        if TARGET_COLUMN in df.columns and self.n_rows > 0:
+            self.target_count = df[TARGET_COLUMN].sum()
+            self.target_rate = self.target_count / self.n_rows * 100
+
+    @property
+    def missing_total(self) -> int:
+        return int(self.null_counts.sum())
+
+    @property
+    def memory_usage(self) -> str:
+        return f"{self.memory_bytes / 1024**2:.2f} MB"
+
+    def missing_percentages(self) -> pd.Series:
+        """Missing percentage per column"""
+        if self.n_rows == 0:
+            return self.null_counts.astype(float)
+        return (self.null_counts / self.n_rows * 100).round(2)
+
+    def missing_table(self) -> pd.DataFrame:
+        """Columns with missing values, most affected first"""
+        missing_df = pd.DataFrame({
+            'Column': self.columns,
+            'Missing Count': self.null_counts.values,
+            'Missing Percentage': self.missing_percentages().values
+        })
+        return missing_df[missing_df['Missing Count'] > 0].sort_values('Missing Percentage', ascending=False)
+
+    def column_details(self) -> pd.DataFrame:
+        """Type, null and cardinality summary for every column"""
+        return pd.DataFrame({
+            'Column': self.columns,
+            'Type': self.dtypes.astype(str).values,
+            'Non-Null Count': self.non_null_counts.values,
+            'Null Count': self.null_counts.values,
+            'Unique Values': self.nunique.values
+        })
+
+    def target_correlations(self) -> pd.Series:
+        """Correlation of every numeric column with the target, highest first"""
+        if TARGET_COLUMN not in self.correlations.columns:
+            return pd.Series(dtype=float)
+        return self.correlations[TARGET_COLUMN].sort_values(ascending=False)
+
+
+def get_dataset_profile(df: pd.DataFrame, fingerprint: Optional[str] = None) -> DatasetProfile:
+    """Return the profile of df, reusing a previous one for identical data"""
+    fingerprint = fingerprint or dataset_fingerprint(df)
+    with _PROFILE_LOCK:
+        profile = _PROFILE_CACHE.get(fingerprint)
+        if profile is not None:
+            _PROFILE_CACHE.move_to_end(fingerprint)
+            return profile
+
+    profile = DatasetProfile(df, fingerprint)
+    with _PROFILE_LOCK:
+        _PROFILE_CACHE[fingerprint] = profile
+        while len(_PROFILE_CACHE) > _PROFILE_CACHE_SIZE:
+            _PROFILE_CACHE.popitem(last=False)
+    return profile
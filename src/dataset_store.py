@@ -0,0 +1,160 @@
+"""
+Dataset Store: versi dataset dengan copy-on-write per kolom, undo/redo dan diff
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _shares_buffer(left: pd.Series, right: pd.Series) -> bool:
+    """True if both series are backed by the same data buffer"""
+    if left.array is right.array:
+        return True
+    if isinstance(left.dtype, np.dtype) and isinstance(right.dtype, np.dtype) and len(left) == len(right):
+        return left.dtype == right.dtype and np.may_share_memory(left.to_numpy(copy=False), right.to_numpy(copy=False))
+    return False
+
+
+def _changed_cells(before: pd.Series, after: pd.Series) -> int:
+    if len(before) != len(after):
+        return max(len(before), len(after))
+    if before.dtype != after.dtype:
+        before, after = before.astype(object), after.astype(object)
+    equal = (before.to_numpy() == after.to_numpy()) | (before.isna().to_numpy() & after.isna().to_numpy())
+    return int((~equal).sum())
+
+
+class DatasetVersion:
+    """One immutable dataset state: column series (possibly shared with other versions) and its token"""
+
+    def __init__(self, columns: Dict[str, pd.Series], index: pd.Index, token: str, operation: str):
+        self.columns = columns
+        self.index = index
+        self.token = token
+        self.operation = operation
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns, index=self.index, copy=False)
+
+
+class VersionedDataset:
+    """Linear history of dataset versions with undo/redo
+
+    Setiap commit hanya menyimpan kolom yang berubah; kolom lain memakai ulang
+    Series versi induk, jadi memori bertambah sebanding kolom yang diubah.
+    Frame dari current dianggap read-only: ubah data lewat commit, bukan in-place.
+    """
+
+    def __init__(self, df: pd.DataFrame, token: str, operation: str = 'load', max_versions: int = 20):
+        self.max_versions = max_versions
+        self.versions: List[DatasetVersion] = []
+        self.position = -1
+        self._frame: Optional[pd.DataFrame] = None
+        self._frame_position = None
+        self._memory_bytes = None
+        self._append(DatasetVersion({col: df[col] for col in df.columns}, df.index, token, operation))
+
+    def _append(self, version: DatasetVersion):
+        # Commit setelah undo membuang cabang redo
+        del self.versions[self.position + 1:]
+        self.versions.append(version)
+        if len(self.versions) > self.max_versions:
+            del self.versions[0]
+        self.position = len(self.versions) - 1
+        self._memory_bytes = None
+
+    @property
+    def current(self) -> pd.DataFrame:
+        """Frame of the current version (built once per version, sharing column buffers)"""
+        if self._frame_position != self.position:
+            self._frame = self.versions[self.position].to_frame()
+            self._frame_position = self.position
+        return self._frame
+
+    @property
+    def version(self) -> str:
+        return self.versions[self.position].token
+
+    @property
+    def operation(self) -> str:
+        return self.versions[self.position].operation
+
+    def commit(self, df: pd.DataFrame, token: str, operation: str) -> str:
+        """Record df as a new version; columns unchanged from the current version are shared"""
+        parent = self.versions[self.position]
+        same_rows = df.index.equals(parent.index)
+        columns = {}
+        for col in df.columns:
+            series = df[col]
+            previous = parent.columns.get(col)
+            if same_rows and previous is not None and _shares_buffer(series, previous):
+                series = previous
+            columns[col] = series
+        self._append(DatasetVersion(columns, parent.index if same_rows else df.index, token, operation))
+        return token
+
+    @property
+    def can_undo(self) -> bool:
+        return self.position > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self.position < len(self.versions) - 1
+
+    def undo(self) -> pd.DataFrame:
+        if self.can_undo:
+            self.position -= 1
+        return self.current
+
+    def redo(self) -> pd.DataFrame:
+        if self.can_redo:
+            self.position += 1
+        return self.current
+
+    def history(self) -> pd.DataFrame:
+        """Version list, oldest first, with the current one marked"""
+        return pd.DataFrame({
+            'Version': range(len(self.versions)),
+            'Operation': [v.operation for v in self.versions],
+            'Token': [v.token for v in self.versions],
+            'Current': [i == self.position for i in range(len(self.versions))]
+        })
+
+    def diff(self, before: Optional[int] = None, after: Optional[int] = None) -> pd.DataFrame:
+        """Per-column comparison of two versions (default: previous vs current)"""
+        after = self.position if after is None else after
+        before = max(after - 1, 0) if before is None else before
+        old, new = self.versions[before], self.versions[after]
+
+        rows = []
+        for col in list(old.columns) + [c for c in new.columns if c not in old.columns]:
+            left, right = old.columns.get(col), new.columns.get(col)
+            if right is None:
+                status, changed = 'removed', len(left)
+            elif left is None:
+                status, changed = 'added', len(right)
+            elif left is right:
+                status, changed = 'unchanged', 0
+            else:
+                changed = _changed_cells(left, right)
+                status = 'changed' if changed or left.dtype != right.dtype else 'unchanged'
+            rows.append({
+                'Column': col,
+                'Status': status,
+                'Changed Cells': changed,
+                'Missing Before': int(left.isna().sum()) if left is not None else None,
+                'Missing After': int(right.isna().sum()) if right is not None else None,
+                'Dtype': str(right.dtype if right is not None else left.dtype)
+            })
+        return pd.DataFrame(rows)
+
+    def memory_bytes(self) -> int:
+        """Bytes held by all versions, counting shared columns once"""
+        if self._memory_bytes is None:
+            seen = {}
+            for version in self.versions:
+                for series in version.columns.values():
+                    seen[id(series)] = series
+            self._memory_bytes = int(sum(series.memory_usage(index=False, deep=True) for series in seen.values()))
+        return self._memory_bytes
@@ -0,0 +1,196 @@
+"""
+Disk cache sederhana dengan eviction LRU berbasis ukuran
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.environ.get('GELLIUM_CACHE_DIR', os.path.join(PROJECT_ROOT, 'data', 'cache'))
+
+
+def hash_bytes(chunks: Iterable[bytes]) -> str:
+    """Return the sha256 hex digest of a stream of byte chunks"""
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """Content-addressed files in one directory, evicted least-recently-used first"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = 2 * 1024**3, suffix: str = ''):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        """Path of the entry stored under key"""
+        return os.path.join(self.cache_dir, f"{key}{self.suffix}")
+
+    def get_path(self, key: str) -> Optional[str]:
+        """Return the entry path if present, marking it as recently used"""
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    @staticmethod
+    def discard(path: str):
+        """Remove an entry file; another session or eviction may already have removed it"""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def put_bytes(self, key: str, data: bytes) -> str:
+        """Store raw bytes under key"""
+        return self._atomic_write(key, lambda f: f.write(data))
+
+    def _atomic_write(self, key: str, writer, evict: bool = True) -> str:
+        path = self.path_for(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                writer(f)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if evict:
+            self.evict()
+        return path
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(self.suffix) or name.endswith('.tmp'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+class DatasetCache(DiskCache):
+    """Parquet copies of already-parsed datasets keyed by the hash of the source file"""
+
+    # Naikkan versi ini jika transformasi saat load berubah (mis. mapping Month)
+    FORMAT_VERSION = 'v1'
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = 2 * 1024**3):
+        super().__init__(cache_dir or os.path.join(DEFAULT_CACHE_DIR, 'datasets'), max_bytes, suffix='.parquet')
+
+    def make_key(self, content_hash: str, variant: str = '') -> str:
+        """Combine source hash, load options and cache format into one key"""
+        return hashlib.sha256(f"{self.FORMAT_VERSION}:{variant}:{content_hash}".encode()).hexdigest()
+
+    def load(self, key: str) -> Optional[pd.DataFrame]:
+        """Read a cached frame, or None on miss"""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception:
+            # Entry rusak/terpotong: buang dan perlakukan sebagai miss
+            self.discard(path)
+            return None
+
+    def store(self, key: str, df: pd.DataFrame) -> Optional[str]:
+        """Write a frame to the cache; returns None if it cannot be serialized"""
+        try:
+            return self._atomic_write(key, lambda f: df.to_parquet(f, index=False))
+        except Exception:
+            return None
+
+
+class LLMCache(DiskCache):
+    """LLM responses keyed by model, options and prompt, expiring after ttl_seconds"""
+
+    def __init__(self, cache_dir: str = None, ttl_seconds: float = 7 * 24 * 3600, max_bytes: int = 50 * 1024**2):
+        super().__init__(cache_dir or os.path.join(DEFAULT_CACHE_DIR, 'llm'), max_bytes, suffix='.json')
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def make_key(model: str, messages: list, options: dict = None) -> str:
+        """Stable key for one chat request"""
+        payload = json.dumps({'model': model, 'messages': messages, 'options': options or {}}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response text, or None if missing or expired"""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get('created', 0) > self.ttl_seconds:
+            self.discard(path)
+            return None
+        return entry.get('content')
+
+    def put(self, key: str, content: str, model: str = None):
+        """Store a response text"""
+        entry = {'created': time.time(), 'model': model, 'content': content}
+        self.put_bytes(key, json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+
+class EmbeddingCache(DiskCache):
+    """Embedding vectors keyed by embedder name and chunk content hash"""
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = 200 * 1024**2):
+        super().__init__(cache_dir or os.path.join(DEFAULT_CACHE_DIR, 'embeddings'), max_bytes, suffix='.npy')
+
+    @staticmethod
+    def make_key(embedder: str, chunk_hash: str) -> str:
+        return hashlib.sha256(f"{embedder}:{chunk_hash}".encode()).hexdigest()
+
+    def get_many(self, embedder: str, chunk_hashes: Iterable[str]) -> dict:
+        """{chunk_hash: vector} for the hashes already cached"""
+        found = {}
+        for chunk_hash in chunk_hashes:
+            path = self.get_path(self.make_key(embedder, chunk_hash))
+            if path is None:
+                continue
+            try:
+                found[chunk_hash] = np.load(path)
+            except (OSError, ValueError):
+                self.discard(path)
+        return found
+
+    def put_many(self, embedder: str, vectors: dict):
+        """Store {chunk_hash: vector}; eviction runs once for the whole batch"""
+        for chunk_hash, vector in vectors.items():
+            self._atomic_write(self.make_key(embedder, chunk_hash),
+                               lambda f, v=vector: np.save(f, np.asarray(v, dtype='float32')), evict=False)
+        self.evict()
@@ -3,36 +3,192 @@ EDA Analyzer dengan bantuan AI
 """
 import pandas as pd
 import numpy as np
-import streamlit as st
 import requests
 import json
-from typing import Dict, List
-import plotly.express as px
-import plotly.graph_objects as go
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.dataset_profile import DatasetProfile, get_dataset_profile
+from src.disk_cache import LLMCache
+from src.ollama_client import OllamaClient, get_ollama_client
+
+# Di atas jumlah baris ini histogram dihitung di server (lihat create_distribution_chart)
+BINNED_HISTOGRAM_ROWS = 50_000
 
 class EDAAnalyzer:
-    def __init__(self, df: pd.DataFrame, model_name='mistral:latest'):
+    def __init__(self, df: pd.DataFrame, model_name='mistral:latest', profile: Optional[DatasetProfile] = None,
+                 llm_cache: Optional[LLMCache] = None, use_llm_cache: bool = True,
+                 client: Optional[OllamaClient] = None):
         self.df = df
         self.model_name = model_name
-        self.ollama_url = 'http://localhost:11434'
+        self.client = client or get_ollama_client()
+        self._profile = profile
+        self.llm_cache = (llm_cache or LLMCache()) if use_llm_cache else None
+    
+    @property
+    def profile(self) -> DatasetProfile:
+        """Shared dataset profile, computed on first use if not passed in"""
+        if self._profile is None:
+            self._profile = get_dataset_profile(self.df)
+        return self._profile
     
     def check_ollama(self):
         """Check if Ollama is available"""
-        try:
-            response = requests.get(f"{self.ollama_url}/api/tags")
-            return response.status_code == 200
-        except:
-            return False
+        return self.client.is_available()
     
-    def get_ai_summary(self, column: str = None) -> str:
-        """Get AI-powered summary of data"""
+    # Analisis AI standar: prompt builder, opsi Ollama, timeout dan pesan jika Ollama tidak tersedia
+    ANALYSES = {
+        'summary': {
+            'prompt': '_summary_prompt',
+            'options': {"temperature": 0.7, "num_predict": 500},
+            'timeout': 30,
+            'unavailable_message': "Ollama tidak tersedia. Jalankan 'ollama serve' di terminal."
+        },
+        'missing_values': {
+            'prompt': '_missing_value_prompt',
+            'options': {"temperature": 0.7, "num_predict": 800},
+            'timeout': None,
+            'unavailable_message': "Ollama tidak tersedia"
+        },
+        'risk_factors': {
+            'prompt': '_risk_factors_prompt',
+            'options': {"temperature": 0.7, "num_predict": 1000},
+            'timeout': None,
+            'unavailable_message': "Ollama tidak tersedia"
+        }
+    }
+    
+    def stream_chat(self, prompt: str, options: dict = None, timeout=None, force_refresh: bool = False,
+                    unavailable_message: str = "Ollama tidak tersedia") -> Iterator[str]:
+        """Yield response tokens from Ollama's NDJSON chat stream, or the cached response at once"""
+        messages = [{"role": "user", "content": prompt}]
+        cache_key = LLMCache.make_key(self.model_name, messages, options)
+        if self.llm_cache is not None and not force_refresh:
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+        
         if not self.check_ollama():
-            return "Ollama tidak tersedia. Jalankan 'ollama serve' di terminal."
+            yield unavailable_message
+            return
+        
+        parts = []
+        stream = self.client.chat_stream(self.model_name, messages, options, timeout)
+        try:
+            for token in stream:
+                parts.append(token)
+                yield token
+            
+            if self.llm_cache is not None and parts:
+                self.llm_cache.put(cache_key, ''.join(parts), model=self.model_name)
+                
+        except requests.exceptions.Timeout:
+            yield "⏱️ Waktu permintaan habis. Model mungkin sibuk. Coba lagi nanti."
+        except requests.exceptions.ConnectionError:
+            yield "🔌 Tidak dapat terhubung ke Ollama. Pastikan Ollama sudah running: `ollama serve`"
+        except Exception as e:
+            yield f"Error: {str(e)}"
+        finally:
+            # Jika konsumen berhenti di tengah (cancel), koneksi ditutup di sini
+            # sehingga Ollama ikut berhenti dan jawaban parsial tidak masuk cache
+            stream.close()
+    
+    def stream_analysis(self, name: str, force_refresh: bool = False, **prompt_kwargs) -> Iterator[str]:
+        """Yield the tokens of one of the standard ANALYSES"""
+        spec = self.ANALYSES[name]
+        prompt = getattr(self, spec['prompt'])(**prompt_kwargs)
+        if prompt is None:
+            yield "✅ Tidak ada missing values dalam dataset."
+            return
+        yield from self.stream_chat(prompt, spec['options'], spec['timeout'], force_refresh,
+                                    spec['unavailable_message'])
+    
+    def run_analysis(self, name: str, force_refresh: bool = False, **prompt_kwargs) -> str:
+        """Return the full text of one of the standard ANALYSES"""
+        return ''.join(self.stream_analysis(name, force_refresh, **prompt_kwargs))
+    
+    def iter_analyses_concurrently(self, names: List[str], max_concurrency: int = 2,
+                                   force_refresh: Iterable[str] = ()) -> Iterator[Tuple[str, Optional[str]]]:
+        """Run several ANALYSES at once, yielding (name, token) as tokens arrive and (name, None) when one finishes
+
+        max_concurrency membatasi jumlah request paralel ke instance Ollama lokal.
+        Menutup iterator ini menghentikan semua analisis yang masih berjalan.
+        """
+        force_refresh = set(force_refresh)
+        events = queue.Queue()
+        cancelled = threading.Event()
+        # Hitung profil sekali di thread utama, bukan berlomba di tiap worker
+        self.profile
+        
+        def worker(name):
+            stream = self.stream_analysis(name, force_refresh=name in force_refresh)
+            try:
+                for token in stream:
+                    if cancelled.is_set():
+                        break
+                    events.put((name, token))
+            except Exception as e:
+                events.put((name, f"Error: {str(e)}"))
+            finally:
+                stream.close()
+                events.put((name, None))
         
+        executor = ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix='ollama')
+        try:
+            for name in names:
+                executor.submit(worker, name)
+            remaining = len(names)
+            while remaining:
+                name, token = events.get()
+                if token is None:
+                    remaining -= 1
+                yield name, token
+        finally:
+            cancelled.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def run_analyses_concurrently(self, names: List[str], max_concurrency: int = 2) -> Dict[str, str]:
+        """Full text of several ANALYSES, requested concurrently"""
+        results = {name: '' for name in names}
+        for name, token in self.iter_analyses_concurrently(names, max_concurrency):
+            if token is not None:
+                results[name] += token
+        return results
+    
+    def get_cached_analysis(self, name: str, **prompt_kwargs) -> Optional[str]:
+        """Cached text of an analysis without contacting Ollama, or None"""
+        spec = self.ANALYSES[name]
+        prompt = getattr(self, spec['prompt'])(**prompt_kwargs)
+        if prompt is None:
+            return "✅ Tidak ada missing values dalam dataset."
+        if self.llm_cache is None:
+            return None
+        messages = [{"role": "user", "content": prompt}]
+        return self.llm_cache.get(LLMCache.make_key(self.model_name, messages, spec['options']))
+    
+    def get_ai_summary(self, column: str = None, force_refresh: bool = False) -> str:
+        """Get AI-powered summary of data"""
+        return self.run_analysis('summary', force_refresh, column=column)
+    
+    def get_missing_value_recommendation(self, force_refresh: bool = False) -> str:
+        """Get AI recommendation for handling missing values"""
+        return self.run_analysis('missing_values', force_refresh)
+    
+    def get_risk_factors_analysis(self, force_refresh: bool = False) -> str:
+        """Identify key risk factors for delinquency"""
+        return self.run_analysis('risk_factors', force_refresh)
+    
+    def _summary_prompt(self, column: str = None) -> str:
         if column:
             # Summary for specific column
             data_sample = self.df[column].head(20).to_string()
-            stats = self.df[column].describe().to_string()
+            if column in self.profile.describe.columns:
+                stats = self.profile.describe[column].to_string()
+            else:
+                stats = self.df[column].describe().to_string()
             
             prompt = f"""Anda adalah data analyst untuk perusahaan keuangan Gellium.
 Analisis kolom berikut dari dataset delinquency:
@@ -53,11 +209,11 @@ Berdasarkan data di atas, berikan analisis singkat (3-4 kalimat) dalam Bahasa In
         else:
             # Overall dataset summary
             info = {
-                'total_rows': len(self.df),
-                'total_columns': len(self.df.columns),
-                'columns': list(self.df.columns),
-                'missing_summary': self.df.isnull().sum().to_dict(),
-                'dtypes': self.df.dtypes.astype(str).to_dict()
+                'total_rows': self.profile.n_rows,
+                'total_columns': self.profile.n_columns,
+                'columns': self.profile.columns,
+                'missing_summary': {col: int(n) for col, n in self.profile.null_counts.items()},
+                'dtypes': self.profile.dtypes.astype(str).to_dict()
             }
             
             prompt = f"""Anda adalah data analyst untuk perusahaan keuangan Gellium.
@@ -76,39 +232,17 @@ Berdasarkan data di atas, berikan analisis singkat (3-4 kalimat) dalam Bahasa In
 3. Langkah awal yang perlu dilakukan untuk EDA
 """
         
-        try:
-            response = requests.post(
-                f"{self.ollama_url}/api/chat",
-                json={
-                    "model": self.model_name,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "stream": False,
-                    "options": {"temperature": 0.7, "num_predict": 500}
-                },
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                return response.json()['message']['content']
-            else:
-                return f"Error: {response.status_code}"
-                
-        except Exception as e:
-            return f"Error: {str(e)}"
+        return prompt
     
-    def get_missing_value_recommendation(self) -> str:
-        """Get AI recommendation for handling missing values"""
-        if not self.check_ollama():
-            return "Ollama tidak tersedia"
-        
+    def _missing_value_prompt(self) -> Optional[str]:
         missing_df = pd.DataFrame({
-            'Column': self.df.columns,
-            'Missing_Pct': (self.df.isnull().sum() / len(self.df) * 100).round(2)
+            'Column': self.profile.columns,
+            'Missing_Pct': self.profile.missing_percentages().values
         })
         missing_df = missing_df[missing_df['Missing_Pct'] > 0].sort_values('Missing_Pct', ascending=False)
         
         if len(missing_df) == 0:
-            return "✅ Tidak ada missing values dalam dataset."
+            return None
         
         prompt = f"""Anda adalah data analyst untuk perusahaan keuangan Gellium.
 Dataset delinquency memiliki missing values sebagai berikut:
@@ -123,30 +257,13 @@ Berdasarkan praktik terbaik industri keuangan, berikan rekomendasi dalam Bahasa
 Format respons dalam bullet points per kolom.
 """
         
-        try:
-            response = requests.post(
-                f"{self.ollama_url}/api/chat",
-                json={
-                    "model": self.model_name,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "stream": False,
-                    "options": {"temperature": 0.7, "num_predict": 800}
-                }
-            )
-            return response.json()['message']['content']
-        except Exception as e:
-            return f"Error: {str(e)}"
+        return prompt
     
-    def get_risk_factors_analysis(self) -> str:
-        """Identify key risk factors for delinquency"""
-        if not self.check_ollama():
-            return "Ollama tidak tersedia"
-        
+    def _risk_factors_prompt(self) -> str:
         # Calculate correlations with Delinquent_Account if exists
         risk_analysis = ""
-        if 'Delinquent_Account' in self.df.columns:
-            numeric_cols = self.df.select_dtypes(include=[np.number]).columns
-            correlations = self.df[numeric_cols].corr()['Delinquent_Account'].sort_values(ascending=False)
+        correlations = self.profile.target_correlations()
+        if len(correlations) > 0:
             risk_analysis = f"Korelasi dengan Delinquent_Account:\n{correlations.to_string()}\n\n"
         
         # Sample data for high-risk customers
@@ -172,25 +289,14 @@ Berdasarkan data di atas, berikan analisis dalam Bahasa Indonesia tentang:
 Format respons dalam paragraf yang jelas dan mudah dipahami.
 """
         
-        try:
-            response = requests.post(
-                f"{self.ollama_url}/api/chat",
-                json={
-                    "model": self.model_name,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "stream": False,
-                    "options": {"temperature": 0.7, "num_predict": 1000}
-                }
-            )
-            return response.json()['message']['content']
-        except Exception as e:
-            return f"Error: {str(e)}"
+        return prompt
     
     def create_correlation_heatmap(self):
         """Create correlation heatmap"""
-        numeric_df = self.df.select_dtypes(include=[np.number])
-        if len(numeric_df.columns) > 1:
-            corr = numeric_df.corr()
+        import plotly.express as px
+
+        corr = self.profile.correlations
+        if len(corr.columns) > 1:
             
             fig = px.imshow(
                 corr,
@@ -205,7 +311,9 @@ Format respons dalam paragraf yang jelas dan mudah dipahami.
     
     def create_missing_value_chart(self):
         """Create missing value visualization"""
-        missing = self.df.isnull().sum()
+        import plotly.express as px
+
+        missing = self.profile.null_counts
         missing = missing[missing > 0].sort_values(ascending=True)
         
         if len(missing) > 0:
@@ -222,12 +330,24 @@ Format respons dalam paragraf yang jelas dan mudah dipahami.
             return fig
         return None
     
-    def create_distribution_chart(self, column: str):
-        """Create distribution chart for a column"""
+    def create_distribution_chart(self, column: str, binned: Optional[bool] = None):
+        """Create distribution chart for a column
+
+        binned=True menghitung bin histogram dan statistik box di server sehingga
+        hanya trace agregat yang dikirim ke browser; None = otomatis untuk dataset
+        dengan lebih dari BINNED_HISTOGRAM_ROWS baris.
+        """
+        import plotly.express as px
+
         if column not in self.df.columns:
             return None
         
-        if self.df[column].dtype in ['int64', 'float64']:
+        if binned is None:
+            binned = len(self.df) > BINNED_HISTOGRAM_ROWS
+        
+        if pd.api.types.is_numeric_dtype(self.df[column]) and not pd.api.types.is_bool_dtype(self.df[column]):
+            if binned and self.df[column].notna().any():
+                return self._binned_distribution_chart(column)
             fig = px.histogram(
                 self.df, x=column,
                 title=f'Distribusi {column}',
@@ -244,4 +364,36 @@ Format respons dalam paragraf yang jelas dan mudah dipahami.
             )
         
         fig.update_layout(height=400)
-        return fig
\ No newline at end of file
+        return fig
+    
+    def _binned_distribution_chart(self, column: str, nbins: int = 50):
+        """Histogram + box marginal from server-side aggregates (payload independent of row count)"""
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+
+        values = self.df[column].to_numpy(dtype='float64', na_value=np.nan)
+        values = values[~np.isnan(values)]
+        
+        counts, edges = np.histogram(values, bins=nbins)
+        q1, median, q3 = np.percentile(values, [25, 50, 75])
+        iqr = q3 - q1
+        # Whisker Tukey: nilai terjauh yang masih di dalam 1.5 IQR
+        lower_fence = values[values >= q1 - 1.5 * iqr].min()
+        upper_fence = values[values <= q3 + 1.5 * iqr].max()
+        
+        fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.2, 0.8], vertical_spacing=0.02)
+        fig.add_trace(go.Box(
+            name=column, orientation='h', y=[column],
+            q1=[q1], median=[median], q3=[q3],
+            lowerfence=[lower_fence], upperfence=[upper_fence], mean=[values.mean()],
+            boxpoints=False, showlegend=False, marker_color='#636efa'
+        ), row=1, col=1)
+        fig.add_trace(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+            name=column, showlegend=False, marker_color='#636efa'
+        ), row=2, col=1)
+        fig.update_yaxes(showticklabels=False, row=1, col=1)
+        fig.update_xaxes(title_text=column, row=2, col=1)
+        fig.update_yaxes(title_text='count', row=2, col=1)
+        fig.update_layout(title=f'Distribusi {column}', bargap=0, height=400)
+        return fig
@@ -0,0 +1,150 @@
+"""
+Exporter: tulis dataset per chunk ke CSV (opsional gzip), Parquet atau XLSX
+
+Memori puncak dibatasi oleh ukuran chunk, bukan ukuran seluruh file hasil.
+"""
+import os
+import tempfile
+import time
+import zlib
+from typing import Iterator
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+EXPORT_FORMATS = {
+    'csv': '.csv',
+    'csv.gz': '.csv.gz',
+    'parquet': '.parquet',
+    'excel': '.xlsx'
+}
+DEFAULT_EXPORT_CHUNKSIZE = 50_000
+# Batas baris worksheet Excel (termasuk header)
+EXCEL_MAX_ROWS = 1_048_576
+READ_BLOCK_SIZE = 1024 * 1024
+
+
+def _chunks(df: pd.DataFrame, chunksize: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def iter_csv(df: pd.DataFrame, chunksize: int = DEFAULT_EXPORT_CHUNKSIZE, compress: bool = False) -> Iterator[bytes]:
+    """CSV bytes chunk by chunk (gzip-compressed when compress=True)"""
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31 -> format gzip
+    header = True
+    for chunk in _chunks(df, chunksize):
+        data = chunk.to_csv(index=False, header=header).encode('utf-8')
+        header = False
+        data = compressor.compress(data) if compressor else data
+        if data:
+            yield data
+    if header:
+        # Dataset kosong: tetap tulis header
+        data = df.head(0).to_csv(index=False).encode('utf-8')
+        yield compressor.compress(data) + compressor.flush() if compressor else data
+    elif compressor:
+        yield compressor.flush()
+
+
+def write_parquet(df: pd.DataFrame, path: str, chunksize: int = DEFAULT_EXPORT_CHUNKSIZE):
+    """Write df as Parquet, one row group per chunk"""
+    # Skema dari seluruh frame agar chunk yang kolomnya kosong semua tetap bertipe sama
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in _chunks(df, chunksize):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_excel(df: pd.DataFrame, path: str, chunksize: int = DEFAULT_EXPORT_CHUNKSIZE,
+                sheet_name: str = 'Processed_Data'):
+    """Write df as XLSX with xlsxwriter's constant_memory mode (rows are flushed as written)"""
+    import xlsxwriter
+
+    if len(df) + 1 > EXCEL_MAX_ROWS:
+        raise ValueError(f"Excel sheets hold at most {EXCEL_MAX_ROWS - 1} data rows; use CSV or Parquet")
+
+    workbook = xlsxwriter.Workbook(path, {
+        'constant_memory': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+        'remove_timezone': True
+    })
+    try:
+        worksheet = workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, [str(col) for col in df.columns])
+        row = 1
+        for chunk in _chunks(df, chunksize):
+            # NaN/NA -> sel kosong (xlsxwriter menolak NaN)
+            values = chunk.astype(object).where(chunk.notna(), None)
+            for record in values.itertuples(index=False, name=None):
+                worksheet.write_row(row, 0, record)
+                row += 1
+    finally:
+        workbook.close()
+
+
+def write_export(df: pd.DataFrame, path: str, format: str = 'csv',
+                 chunksize: int = DEFAULT_EXPORT_CHUNKSIZE) -> str:
+    """Write df to path in one of EXPORT_FORMATS; the file appears atomically when complete"""
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {format}")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=EXPORT_FORMATS[format])
+    os.close(fd)
+    try:
+        if format in ('csv', 'csv.gz'):
+            with open(tmp_path, 'wb') as f:
+                for data in iter_csv(df, chunksize, compress=format == 'csv.gz'):
+                    f.write(data)
+        elif format == 'parquet':
+            write_parquet(df, tmp_path, chunksize)
+        else:
+            write_excel(df, tmp_path, chunksize)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def iter_export(df: pd.DataFrame, format: str = 'csv',
+                chunksize: int = DEFAULT_EXPORT_CHUNKSIZE) -> Iterator[bytes]:
+    """Export bytes block by block
+
+    CSV di-stream langsung dari chunk; Parquet dan XLSX butuh file yang bisa di-seek,
+    jadi ditulis ke file sementara lalu dibaca per blok.
+    """
+    if format in ('csv', 'csv.gz'):
+        yield from iter_csv(df, chunksize, compress=format == 'csv.gz')
+        return
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {format}")
+
+    fd, tmp_path = tempfile.mkstemp(suffix=EXPORT_FORMATS[format])
+    os.close(fd)
+    try:
+        write_export(df, tmp_path, format, chunksize)
+        with open(tmp_path, 'rb') as f:
+            yield from iter(lambda: f.read(READ_BLOCK_SIZE), b'')
+    finally:
+        os.remove(tmp_path)
+
+
+def export_path(directory: str, name: str, format: str) -> str:
+    """Path for an export of name in format under directory"""
+    return os.path.join(directory, f"{name}{EXPORT_FORMATS[format]}")
+
+
+def prune_exports(directory: str, max_age_seconds: float = 24 * 3600):
+    """Create directory if needed and remove exports older than max_age_seconds"""
+    os.makedirs(directory, exist_ok=True)
+    cutoff = time.time() - max_age_seconds
+    for entry in os.scandir(directory):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            continue
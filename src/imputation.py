@@ -0,0 +1,236 @@
+"""
+Imputation Plan: strategi imputasi banyak kolom yang di-fit sekali dan bisa disimpan
+"""
+import hashlib
+import json
+import warnings
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+from src.dataset_profile import TARGET_COLUMN
+from src.streaming_stats import QuantileSketch
+
+STRATEGIES = ('median', 'mean', 'mode', 'zero', 'unknown', 'drop_column', 'regression')
+# Kolom yang tidak dipakai sebagai prediktor regresi (identitas dan target analisis)
+NON_PREDICTORS = ['Customer_ID', TARGET_COLUMN]
+# Prediktor otomatis hanya kolom numerik dengan missing <= batas ini
+MAX_PREDICTOR_MISSING = 0.01
+
+
+def _native(value):
+    """numpy scalar -> Python scalar so it can go into JSON"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def prepare_fill(series: pd.Series, value) -> Tuple[pd.Series, object]:
+    """Adjust series dtype and value so that series.fillna(value) keeps a sensible dtype"""
+    if isinstance(series.dtype, CategoricalDtype):
+        if value not in series.cat.categories:
+            series = series.cat.add_categories([value])
+    elif pd.api.types.is_integer_dtype(series.dtype) and isinstance(value, float) and not float(value).is_integer():
+        series = series.astype('float32' if series.dtype.itemsize <= 2 else 'float64')
+    if pd.api.types.is_float_dtype(series.dtype) and isinstance(value, float):
+        # Jaga agar kolom float32 tidak naik ke float64
+        value = series.dtype.type(value)
+    return series, value
+
+
+class ImputationPlan:
+    """Imputation strategy per column plus the fill values fitted for it"""
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, regression_features: Optional[List[str]] = None):
+        # column -> {'strategy': ..., 'value': nilai hasil fit (None = belum di-fit)}
+        # Untuk 'regression', value = {'coef', 'intercept', 'fallback'}
+        self.steps: Dict[str, Dict] = {}
+        # Prediktor bersama semua kolom 'regression'; None = dipilih otomatis saat fit
+        self.regression_features = regression_features
+
+    def add(self, column: str, strategy: str) -> 'ImputationPlan':
+        """Set the strategy for a column (clears any fitted value)"""
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown imputation strategy: {strategy}")
+        self.steps[column] = {'strategy': strategy, 'value': None}
+        return self
+
+    @property
+    def is_fitted(self) -> bool:
+        return all(step['strategy'] == 'drop_column' or step['value'] is not None
+                   for step in self.steps.values())
+
+    def _columns(self, df: pd.DataFrame, strategy: str):
+        return [col for col, step in self.steps.items() if step['strategy'] == strategy and col in df.columns]
+
+    def fit(self, df: pd.DataFrame, quantile_error: Optional[float] = None) -> 'ImputationPlan':
+        """Compute the fill value of every step from df"""
+        fitted = {}
+
+        median_cols = self._columns(df, 'median')
+        if median_cols:
+            if quantile_error is None:
+                fitted.update(df[median_cols].median())
+            else:
+                fitted.update({col: QuantileSketch.from_series(df[col], quantile_error).median()
+                               for col in median_cols})
+
+        mean_cols = self._columns(df, 'mean')
+        if mean_cols:
+            fitted.update(df[mean_cols].mean())
+
+        for col in self._columns(df, 'mode'):
+            counts = df[col].value_counts()
+            if len(counts) > 0:
+                fitted[col] = counts.index[0]
+            else:
+                # Kolom tanpa nilai sama sekali: seperti median/mean (NaN) untuk numerik, 'Unknown' selain itu
+                numeric = pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])
+                fitted[col] = np.nan if numeric else 'Unknown'
+
+        fitted.update({col: 0 for col in self._columns(df, 'zero')})
+        fitted.update({col: 'Unknown' for col in self._columns(df, 'unknown')})
+
+        for col, value in fitted.items():
+            value = _native(value)
+            self.steps[col]['value'] = float(value) if isinstance(value, float) else value
+
+        regression_cols = self._columns(df, 'regression')
+        if regression_cols:
+            self._fit_regression(df, regression_cols)
+        return self
+
+    def _select_features(self, df: pd.DataFrame) -> List[str]:
+        limit = MAX_PREDICTOR_MISSING * len(df)
+        return [
+            col for col in df.select_dtypes(include=[np.number]).columns
+            if col not in self.steps and col not in NON_PREDICTORS
+            and not pd.api.types.is_bool_dtype(df[col]) and df[col].isna().sum() <= limit
+        ]
+
+    def _fit_regression(self, df: pd.DataFrame, targets: List[str]):
+        """One least-squares solve for all targets over the shared complete-case rows"""
+        for col in targets:
+            if not pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col]):
+                raise ValueError(f"Regression imputation needs a numeric column: {col}")
+
+        if self.regression_features is None:
+            self.regression_features = self._select_features(df)
+        features = [col for col in self.regression_features if col in df.columns]
+        self.regression_features = features
+
+        x = df[features].to_numpy(dtype='float64', na_value=np.nan)
+        y = df[targets].to_numpy(dtype='float64', na_value=np.nan)
+        complete = ~np.isnan(x).any(axis=1) & ~np.isnan(y).any(axis=1)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # target tanpa nilai sama sekali
+            fallback = np.nanmedian(y, axis=0)
+
+        if complete.sum() > len(features):
+            # Design matrix [X, 1] -> koefisien (p x t) dan intercept (t) sekaligus
+            design = np.column_stack([x[complete], np.ones(complete.sum())])
+            solution, *_ = np.linalg.lstsq(design, y[complete], rcond=None)
+            coef, intercept = solution[:-1], solution[-1]
+        else:
+            # Terlalu sedikit baris lengkap: setara imputasi median
+            coef, intercept = np.zeros((len(features), len(targets))), fallback
+
+        for i, col in enumerate(targets):
+            self.steps[col]['value'] = {
+                'coef': coef[:, i].tolist(),
+                'intercept': float(intercept[i]),
+                'fallback': float(fallback[i])
+            }
+
+    def _predict(self, df: pd.DataFrame, targets: List[str]) -> pd.DataFrame:
+        """Predictions for every row; rows with missing predictors get the fallback"""
+        x = df[self.regression_features].to_numpy(dtype='float64', na_value=np.nan)
+        coef = np.array([self.steps[col]['value']['coef'] for col in targets]).T.reshape(len(self.regression_features), len(targets))
+        intercept = np.array([self.steps[col]['value']['intercept'] for col in targets])
+        fallback = np.array([self.steps[col]['value']['fallback'] for col in targets])
+        predictions = x @ coef + intercept
+        predictions = np.where(np.isnan(predictions), fallback, predictions)
+        return pd.DataFrame(predictions, index=df.index, columns=targets)
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return a new frame with every step applied
+
+        Hanya kolom yang diimputasi yang dibuat ulang; kolom lain berbagi buffer
+        dengan df (lihat VersionedDataset), dan df sendiri tidak diubah.
+        """
+        if not self.is_fitted:
+            raise ValueError("ImputationPlan must be fitted before it is applied")
+
+        fills = {}
+
+        regression_cols = [col for col in self._columns(df, 'regression') if df[col].isna().any()]
+        if regression_cols:
+            missing = [col for col in self.regression_features if col not in df.columns]
+            if missing:
+                raise ValueError(f"Regression imputation of {', '.join(regression_cols)} needs predictors "
+                                 f"missing from the data: {', '.join(missing)}")
+            predictions = self._predict(df, regression_cols)
+            for col in regression_cols:
+                series = df[col]
+                values = predictions[col]
+                if pd.api.types.is_integer_dtype(series.dtype):
+                    values = values.round()
+                elif pd.api.types.is_float_dtype(series.dtype):
+                    values = values.astype(series.dtype)
+                fills[col] = values
+
+        for col, step in self.steps.items():
+            if col not in df.columns or step['strategy'] in ('drop_column', 'regression'):
+                continue
+            fills[col] = step['value']
+
+        dropped = {col for col, step in self.steps.items() if step['strategy'] == 'drop_column'}
+        columns = {}
+        for col in df.columns:
+            if col in dropped:
+                continue
+            if col in fills and df[col].isna().any():
+                series, value = prepare_fill(df[col], fills[col])
+                columns[col] = series.fillna(value)
+            else:
+                columns[col] = df[col]
+        return pd.DataFrame(columns, index=df.index, copy=False)
+
+    def fingerprint(self) -> str:
+        """Short hash of the plan, used to version the imputed dataset"""
+        return hashlib.sha256(self.to_json().encode()).hexdigest()[:16]
+
+    def to_dict(self) -> dict:
+        return {'format_version': self.FORMAT_VERSION, 'steps': self.steps,
+                'regression_features': self.regression_features}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ImputationPlan':
+        if data.get('format_version') != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported imputation plan format: {data.get('format_version')}")
+        plan = cls(data.get('regression_features'))
+        for col, step in data['steps'].items():
+            plan.add(col, step['strategy'])
+            plan.steps[col]['value'] = step.get('value')
+        return plan
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), sort_keys=True)
+
+    @classmethod
+    def from_json(cls, text) -> 'ImputationPlan':
+        return cls.from_dict(json.loads(text))
+
+    def save(self, path: str):
+        """Write the plan (with fitted values) as JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+    @classmethod
+    def load(cls, path: str) -> 'ImputationPlan':
+        """Read a plan written by save(); it can be applied without refitting"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_json(f.read())
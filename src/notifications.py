@@ -0,0 +1,71 @@
+"""
+Notifications: pesan error/warning dari modul inti, diteruskan ke sink yang dipasang
+
+Modul inti (DataProcessor, analyzer) tidak mengimpor Streamlit; app memasang
+streamlit_sink, sedangkan CLI dan worker process memakai logging (default) atau
+capture() untuk mengumpulkan pesan.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Tuple
+
+LEVELS = {'error': logging.ERROR, 'warning': logging.WARNING, 'info': logging.INFO, 'success': logging.INFO}
+
+logger = logging.getLogger('gellium')
+
+# sink(level, message); None = logging
+Sink = Callable[[str, str], None]
+_sink: Optional[Sink] = None
+_local = threading.local()
+
+
+def set_sink(sink: Optional[Sink]) -> Optional[Sink]:
+    """Install the process-wide sink (None restores logging); returns the previous one"""
+    global _sink
+    previous, _sink = _sink, sink
+    return previous
+
+
+def notify(level: str, message: str):
+    """Send message to the active sink: the innermost capture() of this thread, else the installed one"""
+    captured = getattr(_local, 'stack', None)
+    if captured:
+        captured[-1].append((level, message))
+    elif _sink is not None:
+        _sink(level, message)
+    else:
+        logger.log(LEVELS.get(level, logging.INFO), message)
+
+
+def error(message: str):
+    notify('error', message)
+
+
+def warning(message: str):
+    notify('warning', message)
+
+
+def info(message: str):
+    notify('info', message)
+
+
+@contextmanager
+def capture() -> Iterator[List[Tuple[str, str]]]:
+    """Collect (level, message) pairs raised in this thread instead of forwarding them"""
+    messages: List[Tuple[str, str]] = []
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(messages)
+    try:
+        yield messages
+    finally:
+        stack.pop()
+
+
+def streamlit_sink(level: str, message: str):
+    """Show the message with st.error / st.warning / st.info / st.success"""
+    import streamlit as st
+
+    getattr(st, level if level in LEVELS else 'info')(message)
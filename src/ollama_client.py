@@ -0,0 +1,146 @@
+"""
+Ollama client bersama dengan connection pool dan health check ber-TTL
+"""
+import json
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_OLLAMA_URL = 'http://localhost:11434'
+
+
+class OllamaError(Exception):
+    """Ollama answered with an HTTP error or an error line in the stream"""
+
+
+class OllamaClient:
+    """Keep-alive HTTP session to one Ollama server, safe to share between threads"""
+
+    def __init__(self, base_url: str = DEFAULT_OLLAMA_URL, health_ttl: float = 15.0,
+                 connect_timeout: float = 2.0, read_timeout: float = 130.0, pool_size: int = 8):
+        self.base_url = base_url.rstrip('/')
+        self.health_ttl = health_ttl
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        self._health_checked_at = 0.0
+        self._available = False
+        self._models: List[str] = []
+
+    def _timeout(self, read_timeout: Optional[float] = None):
+        return (self.connect_timeout, read_timeout or self.read_timeout)
+
+    def _refresh_health(self):
+        try:
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=self._timeout(self.connect_timeout))
+            available = response.status_code == 200
+            models = [m['name'] for m in response.json().get('models', [])] if available else []
+        except (requests.RequestException, ValueError):
+            available, models = False, []
+
+        with self._lock:
+            self._available = available
+            self._models = models
+            self._health_checked_at = time.monotonic()
+
+    def _ensure_health(self, force: bool = False):
+        # Satu probe sekaligus; thread lain menunggu hasilnya alih-alih ikut mem-probe
+        with self._probe_lock:
+            if force or time.monotonic() - self._health_checked_at >= self.health_ttl:
+                self._refresh_health()
+
+    def is_available(self, force: bool = False) -> bool:
+        """Whether Ollama answered /api/tags recently (re-probed at most once per health_ttl)"""
+        self._ensure_health(force)
+        return self._available
+
+    def list_models(self, force: bool = False) -> List[str]:
+        """Names of the locally pulled models, from the same cached probe"""
+        self._ensure_health(force)
+        return list(self._models)
+
+    def chat_stream(self, model: str, messages: List[Dict], options: dict = None,
+                    timeout: Optional[float] = None) -> Iterator[str]:
+        """Yield response tokens from the NDJSON chat stream
+
+        timeout adalah batas waktu menunggu token berikutnya, bukan total durasi.
+        Menutup generator menutup koneksi sehingga Ollama berhenti menghasilkan token.
+        """
+        with self.session.post(
+            f"{self.base_url}/api/chat",
+            json={"model": model, "messages": messages, "stream": True, "options": options or {}},
+            timeout=self._timeout(timeout),
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                raise OllamaError(str(response.status_code))
+
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if 'error' in chunk:
+                    raise OllamaError(chunk['error'])
+                token = chunk.get('message', {}).get('content', '')
+                if token:
+                    yield token
+                if chunk.get('done'):
+                    return
+
+    def chat(self, model: str, messages: List[Dict], options: dict = None, timeout: Optional[float] = None) -> str:
+        """Whole chat response in one request"""
+        response = self.session.post(
+            f"{self.base_url}/api/chat",
+            json={"model": model, "messages": messages, "stream": False, "options": options or {}},
+            timeout=self._timeout(timeout)
+        )
+        if response.status_code != 200:
+            raise OllamaError(str(response.status_code))
+        return response.json()['message']['content']
+
+    def embed(self, model: str, texts: List[str], timeout: Optional[float] = None) -> List[List[float]]:
+        """Embedding vectors of texts (batched /api/embed, or /api/embeddings per text on older servers)"""
+        response = self.session.post(
+            f"{self.base_url}/api/embed",
+            json={"model": model, "input": texts},
+            timeout=self._timeout(timeout)
+        )
+        if response.status_code == 200:
+            return response.json()['embeddings']
+        if response.status_code != 404:
+            raise OllamaError(str(response.status_code))
+
+        vectors = []
+        for text in texts:
+            response = self.session.post(
+                f"{self.base_url}/api/embeddings",
+                json={"model": model, "prompt": text},
+                timeout=self._timeout(timeout)
+            )
+            if response.status_code != 200:
+                raise OllamaError(str(response.status_code))
+            vectors.append(response.json()['embedding'])
+        return vectors
+
+
+_CLIENTS: Dict[str, OllamaClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_ollama_client(base_url: str = DEFAULT_OLLAMA_URL) -> OllamaClient:
+    """Process-wide shared client for base_url"""
+    key = base_url.rstrip('/')
+    with _CLIENTS_LOCK:
+        if key not in _CLIENTS:
+            _CLIENTS[key] = OllamaClient(key)
+        return _CLIENTS[key]
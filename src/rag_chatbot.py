@@ -1,42 +1,316 @@
 """
-RAG Chatbot untuk query dokumen panduan - VERSI NONAKTIF SEMENTARA
+RAG Chatbot untuk query dokumen panduan
+
+Dokumen dipecah per chunk secara streaming, di-embed sekali (cache per hash chunk)
+dan disimpan di VectorIndex lokal; retrieval top-k selesai sebelum LLM dipanggil.
+
+Ingest inkremental: dokumen yang hash isinya tidak berubah dilewati, chunk yang
+hash-nya sudah ada di index memakai vektor lama, dan chunk yang hilang dihapus.
+Chunk tidak melewati batas halaman PDF / heading DOCX, sehingga edit di satu bagian
+hanya mengubah chunk bagian itu.
 """
-import streamlit as st
-import requests
-import json
+import io
 import os
-from typing import List, Dict
-import hashlib
+import zipfile
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+import numpy as np
+
+from src import notifications
+from src.disk_cache import DEFAULT_CACHE_DIR, PROJECT_ROOT, EmbeddingCache, LLMCache, hash_bytes
+from src.ollama_client import OllamaError, get_ollama_client
+from src.vector_index import (CHUNK_OVERLAP, CHUNK_SIZE, EMBED_BATCH_SIZE, VectorIndex, chunk_hash,
+                              get_embedder, split_text)
+
+DEFAULT_INDEX_DIR = os.path.join(DEFAULT_CACHE_DIR, 'rag')
+BUNDLED_DOCUMENTS_DIR = os.path.join(PROJECT_ROOT, 'data', 'documents')
+DOCUMENT_TYPES = ('.pdf', '.docx')
+
+_WORD = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def _source_name(source) -> str:
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.basename(os.fspath(source))
+    return getattr(source, 'name', '') or 'document'
+
+
+def _pdf_pages(pdf_file) -> Iterator[str]:
+    """Text of each PDF page, extracted one page at a time"""
+    try:
+        from PyPDF2 import PdfReader
+    except ImportError:
+        from pypdf import PdfReader
+
+    for page in PdfReader(pdf_file).pages:
+        yield page.extract_text() or ''
+
+
+def _docx_sections(docx_file) -> Iterator[List[str]]:
+    """Paragraphs of a DOCX body grouped into sections that start at each heading
+
+    word/document.xml di-parse dengan iterparse, jadi paragraf yang sudah dibaca
+    langsung dibuang dari pohon XML.
+    """
+    with zipfile.ZipFile(docx_file) as archive, archive.open('word/document.xml') as xml:
+        section: List[str] = []
+        runs: List[str] = []
+        heading = False
+        for _, element in ElementTree.iterparse(xml, events=('end',)):
+            tag = element.tag
+            if tag == f"{_WORD}t":
+                runs.append(element.text or '')
+            elif tag == f"{_WORD}tab":
+                runs.append('\t')
+            elif tag in (f"{_WORD}br", f"{_WORD}cr"):
+                runs.append('\n')
+            elif tag == f"{_WORD}pStyle":
+                style = element.get(f"{_WORD}val", '')
+                heading = style.startswith(('Heading', 'Title'))
+            elif tag == f"{_WORD}p":
+                text = ''.join(runs).strip()
+                if text:
+                    if heading and section:
+                        yield section
+                        section = []
+                    section.append(text)
+                runs = []
+                heading = False
+                element.clear()
+        if section:
+            yield section
+
+
+def _open_document(source):
+    """(readable source, content hash) of a document path or uploaded file"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            content_hash = hash_bytes(iter(lambda: f.read(1024 * 1024), b''))
+        return source, content_hash
+    content = source.getvalue() if hasattr(source, 'getvalue') else source.read()
+    return io.BytesIO(content), hash_bytes([content])
+
 
-# RAG Chatbot dinonaktifkan sementara karena masalah dependency
 class RAGChatbot:
-    def __init__(self, model_name='mistral:latest'):
+    def __init__(self, model_name='mistral:latest', index_dir: Optional[str] = None, embedder=None,
+                 chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP):
         self.model_name = model_name
-        self.ollama_url = 'http://localhost:11434'
-        self.documents_loaded = False
-        st.warning("⚠️ RAG Chatbot sedang dalam perbaikan. Fitur ini akan segera hadir.")
-    
+        self.client = get_ollama_client()
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.index = VectorIndex.load(index_dir or DEFAULT_INDEX_DIR)
+        self._index_mtime = self.index.modified_at()
+        self.embedding_cache = EmbeddingCache()
+        # Kunci cache memuat passage hasil retrieval, jadi jawaban lama tidak dipakai setelah index berubah
+        self.llm_cache = LLMCache()
+
+        if embedder is None and self.index.embedder:
+            # Query harus di-embed dengan embedder yang sama dengan index
+            try:
+                embedder = get_embedder(self.index.embedder, self.client)
+            except Exception:
+                notifications.warning(f"Embedder index ({self.index.embedder}) tidak tersedia; index dibangun ulang.")
+                self.index = VectorIndex(self.index.directory)
+        self.embedder = embedder or get_embedder(client=self.client)
+        if self.index.embedder is None:
+            self.index.embedder = self.embedder.name
+
+    @property
+    def documents_loaded(self) -> bool:
+        return len(self.index) > 0
+
+    def refresh(self):
+        """Reload the index if another session saved it since it was loaded"""
+        modified_at = self.index.modified_at()
+        if modified_at != self._index_mtime:
+            self.index = VectorIndex.load(self.index.directory)
+            self._index_mtime = modified_at
+
     def check_ollama(self):
         """Check if Ollama is available"""
-        return False
-    
-    def load_pdf_document(self, pdf_file, doc_id: str = "dataset_guide"):
-        """Load PDF document - dinonaktifkan"""
-        st.error("RAG Chatbot sedang dalam perbaikan. Fitur tidak tersedia.")
-        return False
-    
-    def _split_text(self, text: str, chunk_size: int = 500, overlap: int = 100) -> List[str]:
-        """Split text - placeholder"""
-        return []
-    
+        return self.client.is_available()
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Vectors of texts, reusing cached embeddings of identical chunks"""
+        hashes = [chunk_hash(text) for text in texts]
+        cached = self.embedding_cache.get_many(self.embedder.name, set(hashes))
+        missing = list(dict.fromkeys(h for h in hashes if h not in cached))
+        by_hash = {h: text for h, text in zip(hashes, texts)}
+        for start in range(0, len(missing), EMBED_BATCH_SIZE):
+            batch = missing[start:start + EMBED_BATCH_SIZE]
+            fresh = dict(zip(batch, self.embedder.embed([by_hash[h] for h in batch])))
+            self.embedding_cache.put_many(self.embedder.name, fresh)
+            cached.update(fresh)
+        return np.array([cached[h] for h in hashes], dtype='float32').reshape(len(texts), -1)
+
+    def _index_chunks(self, doc_id: str, chunks: Iterable[str]) -> Dict[str, int]:
+        """Replace the chunks of doc_id, embedding only chunks whose hash is not in the index yet
+
+        Returns {'chunks', 'embedded', 'reused', 'removed'}.
+        """
+        entries = [{'hash': chunk_hash(text), 'doc_id': doc_id, 'position': position, 'text': text}
+                   for position, text in enumerate(chunks)]
+        hashes = [entry['hash'] for entry in entries]
+        old_rows = self.index.rows(doc_id)
+        old_hashes = [self.index.chunks[row]['hash'] for row in old_rows]
+        stats = {'chunks': len(entries), 'embedded': 0, 'reused': 0,
+                 'removed': len(set(old_hashes) - set(hashes))}
+        if hashes == old_hashes:
+            # Teks sama (mis. file disimpan ulang): vektor dan posisi tetap
+            stats['reused'] = len(entries)
+            return stats
+
+        # Vektor chunk yang sudah ada di index (dokumen ini atau dokumen lain) dipakai ulang
+        wanted = set(hashes)
+        known: Dict[str, int] = {}
+        for row, chunk in enumerate(self.index.chunks):
+            if chunk['hash'] in wanted:
+                known.setdefault(chunk['hash'], row)
+        vectors: Dict[str, np.ndarray] = {}
+        if known:
+            rows = np.fromiter(known.values(), dtype='int64', count=len(known))
+            vectors.update(zip(known, np.asarray(self.index.vectors)[rows]))
+        new_texts = list({entry['hash']: entry['text'] for entry in entries if entry['hash'] not in vectors}.values())
+        if new_texts:
+            vectors.update(zip((chunk_hash(text) for text in new_texts), self._embed(new_texts)))
+        stats['embedded'] = sum(h not in known for h in hashes)
+        stats['reused'] = len(hashes) - stats['embedded']
+
+        self.index.keep(np.array([chunk['doc_id'] != doc_id for chunk in self.index.chunks], dtype=bool))
+        if entries:
+            self.index.add(entries, np.stack([vectors[h] for h in hashes]))
+        return stats
+
+    def _document_chunks(self, source, name: str) -> Iterator[str]:
+        """Chunks of a PDF (per page) or DOCX (per heading section), lazily"""
+        extension = os.path.splitext(name)[1].lower()
+        if extension == '.pdf':
+            sections = ([page] for page in _pdf_pages(source))
+        elif extension == '.docx':
+            sections = _docx_sections(source)
+        else:
+            raise ValueError(f"Tipe dokumen tidak didukung: {extension or name} (gunakan PDF atau DOCX)")
+        return chain.from_iterable(self._split_text(section) for section in sections)
+
+    def _save_index(self):
+        self.index.save()
+        self._index_mtime = self.index.modified_at()
+
+    def ingest_document(self, source, doc_id: Optional[str] = None) -> Optional[Dict]:
+        """Index a PDF or DOCX (path or uploaded file) incrementally
+
+        Returns {'doc_id', 'status' ('added', 'updated' or 'unchanged'), 'chunks',
+        'embedded', 'reused', 'removed'}, or None on error.
+        """
+        name = _source_name(source)
+        doc_id = doc_id or name
+        try:
+            readable, content_hash = _open_document(source)
+            path = os.path.abspath(source) if isinstance(source, (str, os.PathLike)) else None
+            known = self.index.sources.get(doc_id)
+            if known and known['content_hash'] == content_hash:
+                if path and known.get('source') != path:
+                    known['source'] = path
+                    self._save_index()
+                return {'doc_id': doc_id, 'status': 'unchanged', 'chunks': len(self.index.rows(doc_id)),
+                        'embedded': 0, 'reused': 0, 'removed': 0}
+
+            stats = self._index_chunks(doc_id, self._document_chunks(readable, name))
+            self.index.sources[doc_id] = {'content_hash': content_hash, 'source': path}
+            self._save_index()
+        except ImportError:
+            notifications.error("PyPDF2 belum terinstall. Jalankan: pip install PyPDF2")
+            return None
+        except (OllamaError, OSError, ValueError, KeyError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+            notifications.error(f"Gagal memuat dokumen {doc_id}: {str(e)}")
+            return None
+
+        if stats['chunks'] == 0:
+            notifications.warning(f"Tidak ada teks yang bisa diekstrak dari {doc_id}")
+        return dict(stats, doc_id=doc_id, status='updated' if known else 'added')
+
+    def load_pdf_document(self, pdf_file, doc_id: Optional[str] = None):
+        """Index a PDF document (path or uploaded file); returns the number of chunks, or False on error"""
+        result = self.ingest_document(pdf_file, doc_id)
+        return False if result is None else result['chunks']
+
+    def remove_document(self, doc_id: str) -> int:
+        """Drop doc_id and its vectors from the index; returns the number of chunks removed"""
+        removed = self.index.remove(doc_id)
+        self._save_index()
+        return removed
+
+    def sync_directory(self, directory: str = BUNDLED_DOCUMENTS_DIR, prune: bool = True) -> List[Dict]:
+        """Ingest every PDF/DOCX in directory; with prune, drop documents indexed from it that are gone"""
+        paths = sorted(
+            entry.path for entry in os.scandir(directory)
+            if entry.is_file() and entry.name.lower().endswith(DOCUMENT_TYPES)
+        )
+        results = [result for result in map(self.ingest_document, paths) if result is not None]
+
+        if prune:
+            directory = os.path.abspath(directory)
+            present = {os.path.abspath(path) for path in paths}
+            for doc_id, info in list(self.index.sources.items()):
+                path = info.get('source')
+                if path and os.path.dirname(path) == directory and path not in present:
+                    results.append({'doc_id': doc_id, 'status': 'removed', 'chunks': 0, 'embedded': 0,
+                                    'reused': 0, 'removed': self.remove_document(doc_id)})
+        return results
+
+    def _split_text(self, text, chunk_size: Optional[int] = None, overlap: Optional[int] = None) -> Iterator[str]:
+        """Split text (a string or a stream of pages) into overlapping chunks, lazily"""
+        return split_text(text, chunk_size or self.chunk_size, self.overlap if overlap is None else overlap)
+
+    def retrieve(self, query: str, n_results: int = 3) -> List[Dict]:
+        """Most similar chunks to query: [{'text', 'doc_id', 'position', 'score'}]"""
+        if not self.documents_loaded:
+            return []
+        query_vector = self.embedder.embed([query])[0]
+        return [dict(self.index.chunks[row], score=score) for row, score in self.index.search(query_vector, n_results)]
+
+    def ask(self, query: str, n_results: int = 3) -> Tuple[str, List[Dict]]:
+        """(answer, retrieved passages) for query; the query is embedded and searched once"""
+        try:
+            passages = self.retrieve(query, n_results)
+        except (OllamaError, OSError) as e:
+            return f"⚠️ Gagal membuat embedding pertanyaan: {str(e)}", []
+        return self._answer(query, passages), passages
+
     def query_documents(self, query: str, n_results: int = 3) -> str:
-        """Query documents - dinonaktifkan"""
-        return "RAG Chatbot sedang dalam perbaikan. Silakan gunakan tab lain untuk analisis."
-    
+        """Answer query from the indexed documents (the retrieved passages if Ollama is unavailable)"""
+        return self.ask(query, n_results)[0]
+
+    def _answer(self, query: str, passages: List[Dict]) -> str:
+        if not passages:
+            return "Belum ada dokumen yang di-index. Upload dokumen panduan di sidebar terlebih dahulu."
+
+        context = "\n\n".join(f"[{p['doc_id']} #{p['position'] + 1}]\n{p['text']}" for p in passages)
+        messages = [
+            {"role": "system", "content": "Jawab hanya berdasarkan konteks dokumen yang diberikan. "
+                                          "Jika jawabannya tidak ada di konteks, katakan tidak ditemukan."},
+            {"role": "user", "content": f"Konteks:\n{context}\n\nPertanyaan: {query}"}
+        ]
+        options = {"temperature": 0.2}
+        cache_key = LLMCache.make_key(self.model_name, messages, options)
+        cached = self.llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        if not self.check_ollama():
+            return f"⚠️ Ollama tidak tersedia. Bagian dokumen yang paling relevan:\n\n{context}"
+        try:
+            answer = self.client.chat(self.model_name, messages, options=options)
+            self.llm_cache.put(cache_key, answer, model=self.model_name)
+            return answer
+        except (OllamaError, OSError) as e:
+            return f"⚠️ Gagal menghubungi Ollama ({str(e)}). Bagian dokumen yang paling relevan:\n\n{context}"
+
     def get_column_explanation(self, column: str) -> str:
-        """Get column explanation - dinonaktifkan"""
-        return "Fitur ini sedang dalam perbaikan."
-    
+        """Explain a dataset column from the guide documents"""
+        return self.query_documents(f"Apa arti dan definisi kolom {column} dalam dataset?")
+
     def suggest_features_for_modeling(self) -> str:
-        """Get feature suggestions - dinonaktifkan"""
-        return "Fitur ini sedang dalam perbaikan."
\ No newline at end of file
+        """Feature suggestions for a delinquency model from the guide documents"""
+        return self.query_documents("Fitur apa yang paling relevan untuk memprediksi delinquency?", n_results=5)
@@ -2,14 +2,17 @@
 Report Generator untuk EDA Summary
 """
 import pandas as pd
-import streamlit as st
 from datetime import datetime
+from typing import Optional
 import io
 
+from src.dataset_profile import DatasetProfile, get_dataset_profile
+
 class ReportGenerator:
-    def __init__(self, df: pd.DataFrame, analysis_results: dict):
+    def __init__(self, df: pd.DataFrame, analysis_results: dict, profile: Optional[DatasetProfile] = None):
         self.df = df
         self.results = analysis_results
+        self.profile = profile or get_dataset_profile(df)
     
     def generate_markdown_report(self) -> str:
         """Generate EDA report in markdown format"""
@@ -29,8 +32,8 @@ class ReportGenerator:
         # 2. Dataset Overview
         report.append("## 2. Dataset Overview")
         report.append("")
-        report.append(f"**Number of records:** {len(self.df)}")
-        report.append(f"**Number of columns:** {len(self.df.columns)}")
+        report.append(f"**Number of records:** {self.profile.n_rows}")
+        report.append(f"**Number of columns:** {self.profile.n_columns}")
         report.append("")
         report.append("**Key variables:**")
         report.append("")
@@ -54,8 +57,8 @@ class ReportGenerator:
         }
         
         for col, desc in col_descriptions.items():
-            if col in self.df.columns:
-                dtype = self.df[col].dtype
+            if col in self.profile.dtypes.index:
+                dtype = self.profile.dtypes[col]
                 report.append(f"- **{col}**: {desc} ({dtype})")
         
         report.append("")
@@ -64,13 +67,13 @@ class ReportGenerator:
         report.append("## 3. Missing Data Analysis")
         report.append("")
         
-        missing = self.df.isnull().sum()
+        missing = self.profile.null_counts
         missing = missing[missing > 0]
         
         if len(missing) > 0:
             report.append("**Missing values detected:**")
             for col, count in missing.items():
-                pct = (count / len(self.df)) * 100
+                pct = (count / self.profile.n_rows) * 100
                 report.append(f"- {col}: {count} records ({pct:.2f}%)")
             
             report.append("")
@@ -81,6 +84,19 @@ class ReportGenerator:
         
         report.append("")
         
+        outliers = self.results.get('outliers')
+        if outliers is not None and len(outliers) > 0:
+            flagged = outliers[outliers['Outliers'] > 0]
+            method = outliers['Method'].iloc[0].upper()
+            if len(flagged) > 0:
+                report.append(f"**Outliers detected ({method}):**")
+                for _, row in flagged.iterrows():
+                    report.append(f"- {row['Column']}: {row['Outliers']} records ({row['Outlier %']:.2f}%), "
+                                  f"outside [{row['Lower Bound']:.2f}, {row['Upper Bound']:.2f}]")
+            else:
+                report.append(f"✅ No outliers detected ({method}).")
+            report.append("")
+        
         # 4. Key Findings and Risk Indicators
         report.append("## 4. Key Findings and Risk Indicators")
         report.append("")
@@ -89,10 +105,8 @@ class ReportGenerator:
             report.append(self.results['risk_factors'])
         else:
             # Calculate correlations
-            if 'Delinquent_Account' in self.df.columns:
-                numeric_df = self.df.select_dtypes(include=['int64', 'float64'])
-                corr = numeric_df.corr()['Delinquent_Account'].sort_values(ascending=False)
-                
+            corr = self.profile.target_correlations()
+            if len(corr) > 0:
                 report.append("**Top correlations with Delinquent_Account:**")
                 for col, val in corr.head(6).items():
                     if col != 'Delinquent_Account':
@@ -122,8 +136,8 @@ class ReportGenerator:
         report.append("")
         report.append("### Key Findings:")
         report.append("")
-        if 'Delinquent_Account' in self.df.columns:
-            rate = (self.df['Delinquent_Account'].sum() / len(self.df)) * 100
+        if self.profile.target_rate is not None:
+            rate = self.profile.target_rate
             report.append(f"- Overall delinquency rate: **{rate:.2f}%**")
         
         report.append("- Dataset memerlukan penanganan missing values sebelum modeling")
@@ -0,0 +1,79 @@
+"""
+Cache hasil analisis untuk Streamlit, dikunci dengan token versi dataset
+
+Argumen berawalan underscore tidak di-hash oleh Streamlit; dataset_version
+adalah satu-satunya kunci, jadi token ini wajib berubah setiap kali data berubah
+(lihat DataProcessor.dataset_version).
+"""
+import pandas as pd
+import streamlit as st
+
+from src.data_processor import DataProcessor
+from src.dataset_profile import DatasetProfile, get_dataset_profile
+from src.eda_analyzer import EDAAnalyzer
+from src.risk_analyzer import RiskAnalyzer
+from src.risk_statistics import RiskStatistics
+from src.streaming_stats import QuantileSketch
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def cached_profile(dataset_version: str, _df: pd.DataFrame) -> DatasetProfile:
+    """Dataset profile shared by every rerun and session on the same data version"""
+    return get_dataset_profile(_df, fingerprint=dataset_version)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def cached_risk_results(dataset_version: str, _df: pd.DataFrame, history_json: str = None) -> dict:
+    """All Risk Analysis tab charts and tables for one data version
+
+    history_json: RiskStatistics tersimpan dari batch sebelumnya; jika ada, hasil
+    adalah gabungan histori + data saat ini tanpa memproses ulang histori.
+    """
+    stats = RiskStatistics.from_frame(_df)
+    if history_json:
+        stats = RiskStatistics.from_json(history_json).merge(stats)
+    risk_analyzer = RiskAnalyzer(_df, stats=stats)
+    return {
+        'delinquency_rate': risk_analyzer.analyze_delinquency_rate(),
+        'credit_utilization': risk_analyzer.risk_by_credit_utilization(),
+        'missed_payments': risk_analyzer.risk_by_missed_payments(),
+        'employment': risk_analyzer.risk_by_employment(),
+        'credit_card_type': risk_analyzer.risk_by_credit_card_type(),
+        'age_group': risk_analyzer.risk_by_age_group(),
+        'utilization_x_missed': risk_analyzer.risk_by_cross('Utilization_Bin', 'Missed_Payments'),
+        'high_risk_profile': risk_analyzer.get_high_risk_profile(),
+        'top_risk_factors': risk_analyzer.get_top_risk_factors(),
+        'statistics': stats.to_json()
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def cached_missing_value_chart(dataset_version: str, _df: pd.DataFrame):
+    """Missing values bar chart for one data version"""
+    return EDAAnalyzer(_df, profile=cached_profile(dataset_version, _df)).create_missing_value_chart()
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def cached_distribution_chart(dataset_version: str, column: str, _df: pd.DataFrame):
+    """Distribution chart of one column for one data version"""
+    return EDAAnalyzer(_df, profile=cached_profile(dataset_version, _df)).create_distribution_chart(column)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def cached_column_stats(dataset_version: str, column: str, quantile_error, _df: pd.DataFrame) -> dict:
+    """Mean, median and std of one numeric column; median from a sketch when quantile_error is set"""
+    if quantile_error is None:
+        series = _df[column]
+        return {'mean': series.mean(), 'median': series.median(), 'std': series.std()}
+    sketch = QuantileSketch.from_series(_df[column], quantile_error)
+    return {'mean': sketch.mean(), 'median': sketch.median(), 'std': sketch.std()}
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def cached_outlier_summary(dataset_version: str, method: str, quantile_error, _df: pd.DataFrame) -> pd.DataFrame:
+    """Per-column outlier bounds and counts for one data version"""
+    processor = DataProcessor()
+    processor.df = _df
+    processor.dataset_version = dataset_version
+    processor.quantile_error = quantile_error
+    return processor.detect_outliers_all(method).get('summary', pd.DataFrame())
@@ -3,23 +3,55 @@ Risk Analyzer untuk identifikasi faktor risiko
 """
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import streamlit as st
+from typing import Optional
+
+from src.data_processor import concat_frames
+from src.risk_cube import RiskCube
+from src.risk_statistics import RiskStatistics
 
 class RiskAnalyzer:
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: Optional[pd.DataFrame] = None, stats: Optional[RiskStatistics] = None):
+        # stats memungkinkan analisis dari statistik tersimpan tanpa seluruh histori baris
         self.df = df
+        self._stats = stats
+    
+    @property
+    def stats(self) -> RiskStatistics:
+        """Mergeable risk statistics, computed from df on first use"""
+        if self._stats is None:
+            self._stats = RiskStatistics.from_frame(self.df)
+        return self._stats
+    
+    @property
+    def cube(self) -> RiskCube:
+        """Risk aggregates for every dimension"""
+        return self.stats.cube
+    
+    def update(self, new_df: pd.DataFrame):
+        """Add a new batch of records; only the batch itself is aggregated"""
+        # Rebind, jangan ubah in-place: stats bisa milik pemanggil atau hasil load/cache
+        self._stats = self.stats.merge(RiskStatistics.from_frame(new_df))
+        if self.df is not None:
+            self.df = concat_frames([self.df, new_df])
+        return self
+    
+    def delinquency_rate(self):
+        """(rate in %, delinquent, total) from the risk statistics; None without the target column"""
+        if not self.stats.has_target or not self.stats.n_rows:
+            return None
+        total = self.stats.n_rows
+        delinquent = self.stats.delinquent
+        return (delinquent / total) * 100, delinquent, total
     
     def analyze_delinquency_rate(self):
         """Analyze overall delinquency rate"""
-        if 'Delinquent_Account' not in self.df.columns:
+        summary = self.delinquency_rate()
+        if summary is None:
             return None
         
-        total = len(self.df)
-        delinquent = self.df['Delinquent_Account'].sum()
-        rate = (delinquent / total) * 100
+        import plotly.express as px
+
+        rate, delinquent, total = summary
         
         # Create pie chart
         fig = px.pie(
@@ -34,22 +66,13 @@ class RiskAnalyzer:
     
     def risk_by_credit_utilization(self):
         """Analyze risk by credit utilization bins"""
-        if 'Credit_Utilization' not in self.df.columns or 'Delinquent_Account' not in self.df.columns:
+        import plotly.express as px
+
+        if not self.cube.has('Utilization_Bin'):
             return None
         
-        # Create bins
-        bins = [0, 30, 50, 70, 100]
-        labels = ['Low (0-30%)', 'Medium (30-50%)', 'High (50-70%)', 'Very High (70-100%)']
-        
-        self.df['Utilization_Bin'] = pd.cut(
-            self.df['Credit_Utilization'] * 100,  # Convert to percentage
-            bins=bins,
-            labels=labels
-        )
-        
         # Calculate risk per bin
-        risk_by_util = self.df.groupby('Utilization_Bin')['Delinquent_Account'].agg(['mean', 'count']).reset_index()
-        risk_by_util['Risk_Rate'] = risk_by_util['mean'] * 100
+        risk_by_util = self.cube.table('Utilization_Bin')
         
         fig = px.bar(
             risk_by_util,
@@ -66,11 +89,12 @@ class RiskAnalyzer:
     
     def risk_by_missed_payments(self):
         """Analyze risk by number of missed payments"""
-        if 'Missed_Payments' not in self.df.columns or 'Delinquent_Account' not in self.df.columns:
+        import plotly.express as px
+
+        if not self.cube.has('Missed_Payments'):
             return None
         
-        risk_by_missed = self.df.groupby('Missed_Payments')['Delinquent_Account'].agg(['mean', 'count']).reset_index()
-        risk_by_missed['Risk_Rate'] = risk_by_missed['mean'] * 100
+        risk_by_missed = self.cube.table('Missed_Payments')
         
         fig = px.line(
             risk_by_missed,
@@ -85,11 +109,12 @@ class RiskAnalyzer:
     
     def risk_by_employment(self):
         """Analyze risk by employment status"""
-        if 'Employment_Status' not in self.df.columns or 'Delinquent_Account' not in self.df.columns:
+        import plotly.express as px
+
+        if not self.cube.has('Employment_Status'):
             return None
         
-        risk_by_emp = self.df.groupby('Employment_Status')['Delinquent_Account'].agg(['mean', 'count']).reset_index()
-        risk_by_emp['Risk_Rate'] = risk_by_emp['mean'] * 100
+        risk_by_emp = self.cube.table('Employment_Status')
         risk_by_emp = risk_by_emp.sort_values('Risk_Rate', ascending=False)
         
         fig = px.bar(
@@ -107,11 +132,12 @@ class RiskAnalyzer:
     
     def risk_by_credit_card_type(self):
         """Analyze risk by credit card type"""
-        if 'Credit_Card_Type' not in self.df.columns or 'Delinquent_Account' not in self.df.columns:
+        import plotly.express as px
+
+        if not self.cube.has('Credit_Card_Type'):
             return None
         
-        risk_by_card = self.df.groupby('Credit_Card_Type')['Delinquent_Account'].agg(['mean', 'count']).reset_index()
-        risk_by_card['Risk_Rate'] = risk_by_card['mean'] * 100
+        risk_by_card = self.cube.table('Credit_Card_Type')
         risk_by_card = risk_by_card.sort_values('Risk_Rate', ascending=False)
         
         fig = px.bar(
@@ -129,17 +155,12 @@ class RiskAnalyzer:
     
     def risk_by_age_group(self):
         """Analyze risk by age group"""
-        if 'Age' not in self.df.columns or 'Delinquent_Account' not in self.df.columns:
+        import plotly.express as px
+
+        if not self.cube.has('Age_Group'):
             return None
         
-        # Create age groups
-        bins = [18, 25, 35, 45, 55, 65, 100]
-        labels = ['18-25', '26-35', '36-45', '46-55', '56-65', '65+']
-        
-        self.df['Age_Group'] = pd.cut(self.df['Age'], bins=bins, labels=labels)
-        
-        risk_by_age = self.df.groupby('Age_Group')['Delinquent_Account'].agg(['mean', 'count']).reset_index()
-        risk_by_age['Risk_Rate'] = risk_by_age['mean'] * 100
+        risk_by_age = self.cube.table('Age_Group')
         
         fig = px.bar(
             risk_by_age,
@@ -154,53 +175,70 @@ class RiskAnalyzer:
         
         return fig, risk_by_age
     
+    def risk_by_cross(self, first: str = 'Utilization_Bin', second: str = 'Missed_Payments'):
+        """Analyze risk by combination of two dimensions"""
+        import plotly.express as px
+
+        if not self.cube.has((first, second)):
+            return None
+        
+        risk_cross = self.cube.cross_table(first, second)
+        pivot = risk_cross.pivot(index=first, columns=second, values='Risk_Rate')
+        
+        fig = px.imshow(
+            pivot,
+            text_auto='.1f',
+            aspect='auto',
+            title=f'Delinquency Risk by {first} x {second}',
+            labels={'color': 'Delinquency Rate (%)'},
+            color_continuous_scale='Reds'
+        )
+        
+        return fig, risk_cross
+    
     def get_high_risk_profile(self) -> str:
         """Generate profile of high-risk customers"""
-        if 'Delinquent_Account' not in self.df.columns:
+        if not self.stats.has_target:
             return "Column Delinquent_Account not found"
         
-        high_risk = self.df[self.df['Delinquent_Account'] == 1]
-        
-        if len(high_risk) == 0:
+        if self.stats.high_risk_count == 0:
             return "No high-risk customers found"
         
         profile = []
         profile.append("### 📊 High-Risk Customer Profile")
         profile.append("")
-        profile.append(f"**Total high-risk customers:** {len(high_risk)}")
+        profile.append(f"**Total high-risk customers:** {self.stats.high_risk_count}")
         profile.append("")
         
         # Numeric columns statistics
         numeric_cols = ['Age', 'Credit_Utilization', 'Missed_Payments', 'Debt_to_Income_Ratio']
         for col in numeric_cols:
-            if col in high_risk.columns:
-                mean_val = high_risk[col].mean()
-                std_val = high_risk[col].std()
+            if col in self.stats.moments:
+                mean_val, std_val = self.stats.mean_std(col)
                 profile.append(f"**Average {col}:** {mean_val:.2f} (±{std_val:.2f})")
         
         profile.append("")
         profile.append("**Employment Status Distribution:**")
-        if 'Employment_Status' in high_risk.columns:
-            emp_dist = high_risk['Employment_Status'].value_counts(normalize=True) * 100
-            for status, pct in emp_dist.items():
+        if 'Employment_Status' in self.stats.high_risk_counts:
+            emp_dist = self.stats.distribution('Employment_Status')
+            for status, pct in emp_dist[emp_dist > 0].items():
                 profile.append(f"- {status}: {pct:.1f}%")
         
         profile.append("")
         profile.append("**Credit Card Type Distribution:**")
-        if 'Credit_Card_Type' in high_risk.columns:
-            card_dist = high_risk['Credit_Card_Type'].value_counts(normalize=True) * 100
-            for card, pct in card_dist.items():
+        if 'Credit_Card_Type' in self.stats.high_risk_counts:
+            card_dist = self.stats.distribution('Credit_Card_Type')
+            for card, pct in card_dist[card_dist > 0].items():
                 profile.append(f"- {card}: {pct:.1f}%")
         
         return "\n".join(profile)
     
     def get_top_risk_factors(self, n: int = 5) -> pd.DataFrame:
         """Get top n risk factors based on correlation"""
-        if 'Delinquent_Account' not in self.df.columns:
+        if not self.stats.has_target:
             return pd.DataFrame()
         
-        numeric_df = self.df.select_dtypes(include=[np.number])
-        correlations = numeric_df.corr()['Delinquent_Account'].sort_values(ascending=False)
+        correlations = self.stats.target_correlations().sort_values(ascending=False)
         
         # Remove Delinquent_Account itself
         correlations = correlations[correlations.index != 'Delinquent_Account']
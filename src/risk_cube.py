@@ -0,0 +1,179 @@
+"""
+Risk Cube: agregasi delinquency untuk semua dimensi risiko dalam satu pass
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.dataset_profile import TARGET_COLUMN
+
+# Dimensi risiko: kolom sumber dan (opsional) bin numerik dengan label tetap
+DIMENSIONS = {
+    'Utilization_Bin': {
+        'column': 'Credit_Utilization',
+        'scale': 100,  # Convert to percentage
+        'bins': [0, 30, 50, 70, 100],
+        'labels': ['Low (0-30%)', 'Medium (30-50%)', 'High (50-70%)', 'Very High (70-100%)']
+    },
+    'Missed_Payments': {'column': 'Missed_Payments'},
+    'Employment_Status': {'column': 'Employment_Status'},
+    'Credit_Card_Type': {'column': 'Credit_Card_Type'},
+    'Age_Group': {
+        'column': 'Age',
+        'bins': [18, 25, 35, 45, 55, 65, 100],
+        'labels': ['18-25', '26-35', '36-45', '46-55', '56-65', '65+']
+    }
+}
+
+CROSS_DIMENSIONS = [
+    ('Utilization_Bin', 'Missed_Payments'),
+    ('Age_Group', 'Utilization_Bin'),
+    ('Employment_Status', 'Credit_Card_Type')
+]
+
+
+def dimension_codes(df: pd.DataFrame, name: str) -> Tuple[np.ndarray, pd.Index]:
+    """Integer bin code per row (-1 = missing/out of range) and the label of every code"""
+    spec = DIMENSIONS[name]
+    values = df[spec['column']]
+
+    if 'bins' in spec:
+        numeric = pd.to_numeric(values, errors='coerce').astype('float64') * spec.get('scale', 1)
+        codes = pd.cut(numeric, bins=spec['bins'], labels=False)
+        return np.nan_to_num(codes.to_numpy(dtype='float64'), nan=-1).astype(np.int64), pd.Index(spec['labels'])
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(dtype=np.int64), pd.Index(values.cat.categories)
+
+    codes, uniques = pd.factorize(values, sort=True)
+    return codes.astype(np.int64), pd.Index(uniques)
+
+
+def _aggregate(codes: np.ndarray, size: int, target: np.ndarray, valid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    mask = valid & (codes >= 0)
+    delinquent = np.bincount(codes[mask], weights=target[mask], minlength=size)
+    total = np.bincount(codes[mask], minlength=size)
+    return delinquent, total
+
+
+class RiskCube:
+    """Delinquent counts and totals per risk dimension and per selected dimension pair"""
+
+    def __init__(self, tables: Dict, binned: Optional[Dict[str, List[str]]] = None):
+        # tables: nama dimensi (atau tuple pasangan dimensi) -> DataFrame ber-index label
+        # dengan kolom 'delinquent' dan 'total'
+        self.tables = tables
+        self.binned = binned or {name: spec['labels'] for name, spec in DIMENSIONS.items() if 'bins' in spec}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, cross_dimensions: List[Tuple[str, str]] = CROSS_DIMENSIONS) -> 'RiskCube':
+        """Build the cube from df without modifying it"""
+        if TARGET_COLUMN not in df.columns:
+            return cls({})
+
+        target = pd.to_numeric(df[TARGET_COLUMN], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+        valid = ~np.isnan(target)
+        target = np.where(valid, target, 0.0)
+
+        # Kode bin dihitung sekali per dimensi dan dipakai ulang untuk pasangan dimensi
+        codes = {}
+        for name, spec in DIMENSIONS.items():
+            if spec['column'] in df.columns:
+                codes[name] = dimension_codes(df, name)
+
+        tables = {}
+        for name, (dim_codes, labels) in codes.items():
+            delinquent, total = _aggregate(dim_codes, len(labels), target, valid)
+            tables[name] = pd.DataFrame({'delinquent': delinquent, 'total': total}, index=labels)
+
+        for first, second in cross_dimensions:
+            if first not in codes or second not in codes:
+                continue
+            (codes_a, labels_a), (codes_b, labels_b) = codes[first], codes[second]
+            combined = np.where((codes_a >= 0) & (codes_b >= 0), codes_a * len(labels_b) + codes_b, -1)
+            delinquent, total = _aggregate(combined, len(labels_a) * len(labels_b), target, valid)
+            index = pd.MultiIndex.from_product([labels_a, labels_b], names=[first, second])
+            tables[(first, second)] = pd.DataFrame({'delinquent': delinquent, 'total': total}, index=index)
+
+        return cls(tables)
+
+    def has(self, name) -> bool:
+        return name in self.tables
+
+    def merge(self, other: 'RiskCube') -> 'RiskCube':
+        """Cube of both inputs combined; counts are summed per label"""
+        tables = {}
+        for name in list(self.tables) + [name for name in other.tables if name not in self.tables]:
+            if name not in other.tables:
+                tables[name] = self.tables[name].copy()
+                continue
+            if name not in self.tables:
+                tables[name] = other.tables[name].copy()
+                continue
+            merged = self.tables[name].add(other.tables[name], fill_value=0)
+            if name in self.binned:
+                merged = merged.reindex(self.binned[name], fill_value=0)
+            merged['total'] = merged['total'].astype('int64')
+            tables[name] = merged
+        return RiskCube(tables, {**other.binned, **self.binned})
+
+    def to_dict(self) -> dict:
+        tables = []
+        for name, counts in self.tables.items():
+            tables.append({
+                'dimension': list(name) if isinstance(name, tuple) else name,
+                'labels': [
+                    [label.item() if isinstance(label, np.generic) else label for label in
+                     (key if isinstance(key, tuple) else (key,))]
+                    for key in counts.index
+                ],
+                'delinquent': counts['delinquent'].astype('float64').tolist(),
+                'total': counts['total'].astype('int64').tolist()
+            })
+        return {'tables': tables, 'binned': self.binned}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RiskCube':
+        tables = {}
+        for entry in data['tables']:
+            if isinstance(entry['dimension'], list):
+                name = tuple(entry['dimension'])
+                index = pd.MultiIndex.from_tuples([tuple(labels) for labels in entry['labels']], names=list(name))
+            else:
+                name = entry['dimension']
+                index = pd.Index([labels[0] for labels in entry['labels']])
+            tables[name] = pd.DataFrame(
+                {'delinquent': np.asarray(entry['delinquent'], dtype='float64'),
+                 'total': np.asarray(entry['total'], dtype='int64')},
+                index=index
+            )
+        return cls(tables, data.get('binned'))
+
+    def _rates(self, counts: pd.DataFrame) -> pd.DataFrame:
+        result = pd.DataFrame({
+            'mean': counts['delinquent'] / counts['total'].where(counts['total'] > 0),
+            'count': counts['total'].astype('int64')
+        }, index=counts.index)
+        result['Risk_Rate'] = result['mean'] * 100
+        return result
+
+    def table(self, name: str) -> pd.DataFrame:
+        """Risk per bin of one dimension, in the column layout of the risk_by_* charts"""
+        counts = self.tables[name]
+        if name not in self.binned:
+            # Seperti groupby: hanya nilai yang muncul di data
+            counts = counts[counts['total'] > 0]
+        return self._ordered(self._rates(counts).reset_index(names=name), [name])
+
+    def cross_table(self, first: str, second: str) -> pd.DataFrame:
+        """Risk per combination of two dimensions (long format)"""
+        counts = self.tables[(first, second)]
+        return self._ordered(self._rates(counts[counts['total'] > 0]).reset_index(), [first, second])
+
+    def _ordered(self, result: pd.DataFrame, names: List[str]) -> pd.DataFrame:
+        # Label bin numerik tetap berurutan (bukan alfabetis) di chart dan pivot
+        for name in names:
+            if name in self.binned:
+                result[name] = pd.Categorical(result[name], categories=self.binned[name], ordered=True)
+        return result
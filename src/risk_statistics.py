@@ -0,0 +1,196 @@
+"""
+Risk Statistics: sufficient statistics RiskAnalyzer yang bisa di-merge dan disimpan
+
+Batch bulanan baru cukup dihitung sendiri lalu di-merge ke statistik histori,
+tanpa memproses ulang seluruh data lama.
+"""
+import json
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.dataset_profile import TARGET_COLUMN
+from src.risk_cube import RiskCube
+from src.streaming_stats import CoMoments
+
+HIGH_RISK_NUMERIC = ['Age', 'Credit_Utilization', 'Missed_Payments', 'Debt_to_Income_Ratio']
+HIGH_RISK_CATEGORICAL = ['Employment_Status', 'Credit_Card_Type']
+
+
+def _native(value):
+    """numpy scalar -> Python scalar so it can go into JSON"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _add_counts(left: pd.Series, right: pd.Series) -> pd.Series:
+    return left.add(right, fill_value=0)
+
+
+class RiskStatistics:
+    """Row/delinquent totals, risk cube and high-risk moments of one or more batches"""
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, cube: Optional[RiskCube] = None, n_rows: int = 0, delinquent=0,
+                 has_target: bool = False, high_risk_count: int = 0,
+                 moments: Optional[Dict[str, Dict[str, float]]] = None,
+                 high_risk_counts: Optional[Dict[str, pd.Series]] = None,
+                 target_moments: Optional[CoMoments] = None):
+        self.cube = cube or RiskCube({})
+        self.n_rows = n_rows
+        self.delinquent = delinquent
+        self.has_target = has_target
+        self.high_risk_count = high_risk_count
+        # moments[kolom] = {'count', 'sum', 'sumsq'} atas baris Delinquent_Account == 1
+        self.moments = moments or {}
+        # high_risk_counts[kolom] = value counts atas baris Delinquent_Account == 1
+        self.high_risk_counts = high_risk_counts or {}
+        # Co-moment setiap kolom numerik terhadap target, untuk ranking faktor risiko
+        self.target_moments = target_moments or CoMoments([], [TARGET_COLUMN])
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'RiskStatistics':
+        """Statistics of one batch"""
+        if TARGET_COLUMN not in df.columns:
+            return cls(n_rows=len(df))
+
+        high_risk = df[df[TARGET_COLUMN] == 1]
+
+        moments = {}
+        for col in HIGH_RISK_NUMERIC:
+            if col in df.columns:
+                values = pd.to_numeric(high_risk[col], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+                values = values[~np.isnan(values)]
+                moments[col] = {
+                    'count': int(len(values)),
+                    'sum': float(values.sum()),
+                    'sumsq': float(np.square(values).sum())
+                }
+
+        high_risk_counts = {}
+        for col in HIGH_RISK_CATEGORICAL:
+            if col in df.columns:
+                counts = high_risk[col].value_counts()
+                high_risk_counts[col] = counts[counts > 0].astype('int64')
+
+        return cls(
+            cube=RiskCube.from_frame(df),
+            n_rows=len(df),
+            delinquent=_native(df[TARGET_COLUMN].sum()),
+            has_target=True,
+            high_risk_count=len(high_risk),
+            moments=moments,
+            high_risk_counts=high_risk_counts,
+            target_moments=CoMoments.from_frame(df, targets=[TARGET_COLUMN])
+        )
+
+    def merge(self, other: 'RiskStatistics') -> 'RiskStatistics':
+        """Statistics of both inputs combined, as if computed on the concatenated rows"""
+        moments = {}
+        for col in set(self.moments) | set(other.moments):
+            left = self.moments.get(col, {})
+            right = other.moments.get(col, {})
+            moments[col] = {key: left.get(key, 0) + right.get(key, 0) for key in ('count', 'sum', 'sumsq')}
+
+        high_risk_counts = {}
+        for col in set(self.high_risk_counts) | set(other.high_risk_counts):
+            empty = pd.Series(dtype='int64')
+            high_risk_counts[col] = _add_counts(
+                self.high_risk_counts.get(col, empty), other.high_risk_counts.get(col, empty)
+            ).astype('int64')
+
+        return RiskStatistics(
+            cube=self.cube.merge(other.cube),
+            n_rows=self.n_rows + other.n_rows,
+            delinquent=self.delinquent + other.delinquent,
+            has_target=self.has_target or other.has_target,
+            high_risk_count=self.high_risk_count + other.high_risk_count,
+            moments=moments,
+            high_risk_counts=high_risk_counts,
+            target_moments=self.target_moments.merge(other.target_moments)
+        )
+
+    def update(self, df: pd.DataFrame) -> 'RiskStatistics':
+        """Fold a new batch into these statistics in place"""
+        merged = self.merge(RiskStatistics.from_frame(df))
+        self.__dict__.update(merged.__dict__)
+        return self
+
+    def mean_std(self, column: str) -> Tuple[float, float]:
+        """Mean and sample standard deviation of column among high-risk rows"""
+        m = self.moments[column]
+        n = m['count']
+        if n == 0:
+            return np.nan, np.nan
+        mean = m['sum'] / n
+        if n < 2:
+            return mean, np.nan
+        variance = max(m['sumsq'] - m['sum'] * mean, 0.0) / (n - 1)
+        return mean, float(np.sqrt(variance))
+
+    def distribution(self, column: str) -> pd.Series:
+        """Percentage of high-risk rows per category, largest first"""
+        counts = self.high_risk_counts[column]
+        total = counts.sum()
+        if total == 0:
+            return counts.astype(float)
+        return (counts / total * 100).sort_values(ascending=False)
+
+    def target_correlations(self) -> pd.Series:
+        """Correlation of every numeric column with the target"""
+        if TARGET_COLUMN not in self.target_moments.targets:
+            return pd.Series(dtype=float)
+        return self.target_moments.correlation()[TARGET_COLUMN]
+
+    def to_dict(self) -> dict:
+        return {
+            'format_version': self.FORMAT_VERSION,
+            'n_rows': self.n_rows,
+            'delinquent': _native(self.delinquent),
+            'has_target': self.has_target,
+            'high_risk_count': self.high_risk_count,
+            'moments': self.moments,
+            'high_risk_counts': {
+                col: [[_native(label), int(count)] for label, count in counts.items()]
+                for col, counts in self.high_risk_counts.items()
+            },
+            'cube': self.cube.to_dict(),
+            'target_moments': self.target_moments.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RiskStatistics':
+        if data.get('format_version') != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported risk statistics format: {data.get('format_version')}")
+        return cls(
+            cube=RiskCube.from_dict(data['cube']),
+            n_rows=data['n_rows'],
+            delinquent=data['delinquent'],
+            has_target=data['has_target'],
+            high_risk_count=data['high_risk_count'],
+            moments=data['moments'],
+            high_risk_counts={
+                col: pd.Series([count for _, count in pairs], index=[label for label, _ in pairs], dtype='int64')
+                for col, pairs in data['high_risk_counts'].items()
+            },
+            target_moments=CoMoments.from_dict(data['target_moments']) if 'target_moments' in data else None
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, text) -> 'RiskStatistics':
+        return cls.from_dict(json.loads(text))
+
+    def save(self, path: str):
+        """Write the statistics as JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+    @classmethod
+    def load(cls, path: str) -> 'RiskStatistics':
+        """Read statistics written by save()"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_json(f.read())
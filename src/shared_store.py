@@ -0,0 +1,179 @@
+"""
+Shared Dataset Store: dataset sebagai file kolom memory-mapped yang dibuka zero-copy
+
+Semua session yang membuka dataset yang sama memakai halaman page cache yang
+sama, sehingga RAM tidak bertambah per session.
+"""
+import json
+import os
+import shutil
+import tempfile
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pandas.api.types import CategoricalDtype
+
+from src.disk_cache import DEFAULT_CACHE_DIR
+
+ARROW_FILE = 'columns.arrow'
+META_FILE = 'meta.json'
+
+
+def _json_value(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class SharedDatasetStore:
+    """One directory per dataset: .npy per column (plus Arrow IPC for strings), evicted LRU"""
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, root: str = None, max_bytes: int = 8 * 1024**3):
+        self.root = root or os.path.join(DEFAULT_CACHE_DIR, 'shared')
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def has(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self.path_for(key), META_FILE))
+
+    def put(self, key: str, df: pd.DataFrame, version: Optional[str] = None) -> str:
+        """Write df under key (no-op if another session already stored it)
+
+        Raises ValueError for frames the store cannot hold (non-RangeIndex, or an
+        object column Arrow cannot type, e.g. ints mixed with strings).
+        """
+        path = self.path_for(key)
+        if self.has(key):
+            return path
+
+        if isinstance(df.index, pd.RangeIndex):
+            index = {'kind': 'range', 'start': df.index.start, 'stop': df.index.stop, 'step': df.index.step}
+        else:
+            raise ValueError("Shared store only supports a RangeIndex")
+
+        tmp_dir = tempfile.mkdtemp(dir=self.root, prefix='.tmp-')
+        try:
+            columns = []
+            arrow_columns = {}
+            for i, col in enumerate(df.columns):
+                series = df[col]
+                dtype = series.dtype
+                entry = {'name': col}
+                if isinstance(dtype, CategoricalDtype):
+                    entry.update(kind='categorical', ordered=bool(dtype.ordered),
+                                 categories=[_json_value(c) for c in dtype.categories])
+                    np.save(os.path.join(tmp_dir, f"{i}.npy"), series.cat.codes.to_numpy())
+                elif isinstance(dtype, pd.core.dtypes.dtypes.BaseMaskedDtype):
+                    entry.update(kind='masked', dtype=str(dtype))
+                    np.save(os.path.join(tmp_dir, f"{i}.npy"), series.array._data)
+                    np.save(os.path.join(tmp_dir, f"{i}.mask.npy"), series.array._mask)
+                elif isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+                    entry.update(kind='numpy')
+                    np.save(os.path.join(tmp_dir, f"{i}.npy"), series.to_numpy())
+                else:
+                    # String/object: Arrow IPC yang bisa di-mmap
+                    entry.update(kind='arrow')
+                    try:
+                        arrow_columns[str(i)] = pa.array(series, from_pandas=True)
+                    except (TypeError, pa.ArrowException) as e:
+                        raise ValueError(f"Column {col!r} cannot be stored: {e}") from e
+                columns.append(entry)
+
+            if arrow_columns:
+                table = pa.table(arrow_columns)
+                with pa.OSFile(os.path.join(tmp_dir, ARROW_FILE), 'wb') as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+
+            meta = {'format_version': self.FORMAT_VERSION, 'version': version, 'index': index, 'columns': columns}
+            with open(os.path.join(tmp_dir, META_FILE), 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+
+            try:
+                os.rename(tmp_dir, path)
+            except OSError:
+                # Session lain menulis dataset yang sama lebih dulu
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        self.evict()
+        return path
+
+    def open(self, key: str) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """Open a stored dataset zero-copy; returns (df, version) or (None, None) on miss
+
+        Kolom numerik di-mmap copy-on-write: halaman dibaca bersama dari page cache,
+        dan hanya halaman yang ditulis session ini yang disalin (sebagian operasi
+        pandas menolak buffer read-only).
+        """
+        path = self.path_for(key)
+        try:
+            with open(os.path.join(path, META_FILE), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None, None
+        if meta.get('format_version') != self.FORMAT_VERSION:
+            return None, None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        arrow_table = None
+        if any(entry['kind'] == 'arrow' for entry in meta['columns']):
+            arrow_table = pa.ipc.open_file(pa.memory_map(os.path.join(path, ARROW_FILE), 'r')).read_all()
+
+        index = meta['index']
+        index = pd.RangeIndex(index['start'], index['stop'], index['step'])
+        columns = {}
+        for i, entry in enumerate(meta['columns']):
+            kind = entry['kind']
+            if kind == 'arrow':
+                values = arrow_table.column(str(i))
+                if pa.types.is_string(values.type) or pa.types.is_large_string(values.type):
+                    array = pd.arrays.ArrowStringArray(values)
+                else:
+                    array = values.to_pandas().array
+            else:
+                data = np.load(os.path.join(path, f"{i}.npy"), mmap_mode='c')
+                if kind == 'categorical':
+                    dtype = CategoricalDtype(entry['categories'], ordered=entry['ordered'])
+                    array = pd.Categorical.from_codes(data, dtype=dtype)
+                elif kind == 'masked':
+                    mask = np.load(os.path.join(path, f"{i}.mask.npy"), mmap_mode='c')
+                    array_type = pd.api.types.pandas_dtype(entry['dtype']).construct_array_type()
+                    array = array_type(data, mask, copy=False)
+                else:
+                    array = data
+            columns[entry['name']] = pd.Series(array, index=index, name=entry['name'], copy=False)
+
+        return pd.DataFrame(columns, index=index, copy=False), meta.get('version')
+
+    def evict(self):
+        """Remove least recently opened datasets until the store fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.root):
+            if name.startswith('.tmp-'):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(path))
+                entries.append((os.stat(path).st_mtime, size, path))
+            except OSError:
+                continue
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            # File yang sedang di-mmap tetap valid setelah dihapus (POSIX)
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
@@ -0,0 +1,300 @@
+"""
+Streaming statistics: co-moment yang bisa di-merge untuk korelasi per chunk
+"""
+import warnings
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def _as_float_matrix(df: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    return df[columns].to_numpy(dtype='float64', na_value=np.nan)
+
+
+class CoMoments:
+    """Pairwise-complete means and co-moments between row columns and target columns
+
+    Setiap sel (i, j) menyimpan n, mean x, mean y, M2 x, M2 y dan C xy hanya dari
+    baris di mana kedua kolom terisi (sama seperti DataFrame.corr). Chunk digabung
+    dengan rumus Chan et al., jadi hasilnya tidak bergantung pada ukuran chunk.
+    """
+
+    def __init__(self, columns: List[str], targets: Optional[List[str]] = None):
+        self.columns = list(columns)
+        self.targets = list(targets) if targets is not None else list(columns)
+        shape = (len(self.columns), len(self.targets))
+        self.n = np.zeros(shape)
+        self.mean_x = np.zeros(shape)
+        self.mean_y = np.zeros(shape)
+        self.m2x = np.zeros(shape)
+        self.m2y = np.zeros(shape)
+        self.cxy = np.zeros(shape)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, targets: Optional[List[str]] = None,
+                   chunksize: int = DEFAULT_CHUNKSIZE) -> 'CoMoments':
+        """Co-moments of every numeric column of df, chunksize rows at a time"""
+        columns = df.select_dtypes(include=[np.number]).columns.tolist()
+        targets = [t for t in targets if t in columns] if targets is not None else None
+        result = cls(columns, targets)
+        for start in range(0, len(df), chunksize):
+            result.update(df.iloc[start:start + chunksize])
+        return result
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame], targets: Optional[List[str]] = None) -> 'CoMoments':
+        """Co-moments over a stream of chunks (e.g. DataProcessor.iter_csv_chunks)"""
+        result = None
+        for chunk in chunks:
+            if result is None:
+                columns = chunk.select_dtypes(include=[np.number]).columns.tolist()
+                result = cls(columns, [t for t in targets if t in columns] if targets is not None else None)
+            result.update(chunk)
+        return result if result is not None else cls([], targets or [])
+
+    def update(self, chunk: pd.DataFrame) -> 'CoMoments':
+        """Fold one chunk of rows into the accumulator"""
+        if len(chunk) == 0 or not self.columns or not self.targets:
+            return self
+        x = _as_float_matrix(chunk, self.columns)
+        y = _as_float_matrix(chunk, self.targets)
+        self._merge_arrays(*self._chunk_moments(x, y))
+        return self
+
+    @staticmethod
+    def _chunk_moments(x: np.ndarray, y: np.ndarray):
+        valid_x = ~np.isnan(x)
+        valid_y = ~np.isnan(y)
+        # Geser dengan mean kolom chunk agar jumlah kuadrat tidak kehilangan presisi
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # kolom tanpa nilai di chunk ini
+            shift_x = np.nan_to_num(np.nanmean(x, axis=0))
+            shift_y = np.nan_to_num(np.nanmean(y, axis=0))
+        xs = np.where(valid_x, x - shift_x, 0.0)
+        ys = np.where(valid_y, y - shift_y, 0.0)
+        fx = valid_x.astype('float64')
+        fy = valid_y.astype('float64')
+
+        n = fx.T @ fy
+        sum_x = xs.T @ fy
+        sum_y = fx.T @ ys
+        sum_xx = (xs * xs).T @ fy
+        sum_yy = fx.T @ (ys * ys)
+        sum_xy = xs.T @ ys
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inv_n = np.where(n > 0, 1.0 / n, 0.0)
+        mean_xs = sum_x * inv_n
+        mean_ys = sum_y * inv_n
+        m2x = sum_xx - sum_x * mean_xs
+        m2y = sum_yy - sum_y * mean_ys
+        cxy = sum_xy - sum_x * mean_ys
+        return n, mean_xs + shift_x[:, None], mean_ys + shift_y[None, :], m2x, m2y, cxy
+
+    def _merge_arrays(self, n_b, mean_x_b, mean_y_b, m2x_b, m2y_b, cxy_b):
+        n_a = self.n
+        n = n_a + n_b
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(n > 0, n_b / n, 0.0)
+        delta_x = mean_x_b - self.mean_x
+        delta_y = mean_y_b - self.mean_y
+        self.mean_x = self.mean_x + delta_x * weight
+        self.mean_y = self.mean_y + delta_y * weight
+        self.m2x = self.m2x + m2x_b + delta_x * delta_x * n_a * weight
+        self.m2y = self.m2y + m2y_b + delta_y * delta_y * n_a * weight
+        self.cxy = self.cxy + cxy_b + delta_x * delta_y * n_a * weight
+        self.n = n
+
+    def _aligned(self, columns: List[str], targets: List[str]) -> 'CoMoments':
+        result = CoMoments(columns, targets)
+        rows = [columns.index(c) for c in self.columns]
+        cols = [targets.index(t) for t in self.targets]
+        grid = np.ix_(rows, cols)
+        for name in ('n', 'mean_x', 'mean_y', 'm2x', 'm2y', 'cxy'):
+            getattr(result, name)[grid] = getattr(self, name)
+        return result
+
+    def merge(self, other: 'CoMoments') -> 'CoMoments':
+        """Accumulator over the rows of both inputs; columns are unioned"""
+        columns = self.columns + [c for c in other.columns if c not in self.columns]
+        targets = self.targets + [t for t in other.targets if t not in self.targets]
+        result = self._aligned(columns, targets)
+        right = other._aligned(columns, targets)
+        result._merge_arrays(right.n, right.mean_x, right.mean_y, right.m2x, right.m2y, right.cxy)
+        return result
+
+    def correlation(self) -> pd.DataFrame:
+        """Pearson correlation (columns x targets), NaN where undefined"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self.cxy / np.sqrt(self.m2x * self.m2y)
+        corr = np.where((self.n > 1) & (self.m2x > 0) & (self.m2y > 0), np.clip(corr, -1.0, 1.0), np.nan)
+        result = pd.DataFrame(corr, index=self.columns, columns=self.targets)
+        for target in self.targets:
+            if target in self.columns and not np.isnan(result.at[target, target]):
+                result.at[target, target] = 1.0
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            'columns': self.columns,
+            'targets': self.targets,
+            **{name: getattr(self, name).tolist() for name in ('n', 'mean_x', 'mean_y', 'm2x', 'm2y', 'cxy')}
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CoMoments':
+        result = cls(data['columns'], data['targets'])
+        shape = (len(result.columns), len(result.targets))
+        for name in ('n', 'mean_x', 'mean_y', 'm2x', 'm2y', 'cxy'):
+            setattr(result, name, np.asarray(data[name], dtype='float64').reshape(shape))
+        return result
+
+
+def correlation_matrix(df: pd.DataFrame, chunksize: int = DEFAULT_CHUNKSIZE) -> pd.DataFrame:
+    """Correlation matrix of the numeric columns of df, computed chunk by chunk"""
+    return CoMoments.from_frame(df, chunksize=chunksize).correlation()
+
+
+def target_correlations(df: pd.DataFrame, target: str, chunksize: int = DEFAULT_CHUNKSIZE) -> pd.Series:
+    """Correlation of every numeric column with target, without the full matrix"""
+    moments = CoMoments.from_frame(df, targets=[target], chunksize=chunksize)
+    if target not in moments.targets:
+        return pd.Series(dtype=float)
+    return moments.correlation()[target]
+
+
+class QuantileSketch:
+    """KLL quantile sketch with exact count/mean/std, mergeable across chunks and partitions
+
+    Rank error kuantil kira-kira `error` (mis. 0.01 = ±1% rank) dengan memori
+    O(1/error) berapa pun jumlah datanya.
+    """
+
+    def __init__(self, error: float = 0.01, seed: Optional[int] = None):
+        self.error = error
+        self.k = max(8, int(np.ceil(2.5 / error)))
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_series(cls, series: pd.Series, error: float = 0.01,
+                    chunksize: int = DEFAULT_CHUNKSIZE) -> 'QuantileSketch':
+        """Sketch of one column, chunksize values at a time"""
+        sketch = cls(error)
+        for start in range(0, len(series), chunksize):
+            sketch.update(series.iloc[start:start + chunksize])
+        return sketch
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values) -> 'QuantileSketch':
+        """Add values (NaN/NA are skipped)"""
+        values = pd.Series(values).to_numpy(dtype='float64', na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self._merge_moments(len(values), values.mean(), float(((values - values.mean()) ** 2).sum()),
+                            values.min(), values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def _merge_moments(self, n_b, mean_b, m2_b, min_b, max_b):
+        n = self.count + n_b
+        delta = mean_b - self._mean
+        self._m2 += m2_b + delta * delta * self.count * n_b / n
+        self._mean += delta * n_b / n
+        self.count = n
+        self.min = np.fmin(self.min, min_b)
+        self.max = np.fmax(self.max, max_b)
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[level])
+            # Jumlah ganjil: satu item tetap di level ini
+            keep, items = items[:len(items) % 2], items[len(items) % 2:]
+            promoted = items[self._rng.integers(2)::2]
+            self.levels[level] = keep
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            # Level baru memperkecil kapasitas level bawah, jadi periksa ulang dari awal
+            level = 0
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Sketch of the values of both inputs"""
+        result = QuantileSketch(min(self.error, other.error))
+        result.levels = [np.empty(0) for _ in range(max(len(self.levels), len(other.levels)))]
+        for sketch in (self, other):
+            for level, items in enumerate(sketch.levels):
+                result.levels[level] = np.concatenate([result.levels[level], items])
+            if sketch.count:
+                result._merge_moments(sketch.count, sketch._mean, sketch._m2, sketch.min, sketch.max)
+        result._compress()
+        return result
+
+    def quantile(self, q):
+        """Approximate q-quantile (scalar or array of q in [0, 1])"""
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        q = np.clip(np.asarray(q, dtype='float64'), 0.0, 1.0)
+        index = np.minimum(np.searchsorted(cumulative, q * cumulative[-1], side='left'), len(items) - 1)
+        result = np.where(q <= 0, self.min, np.where(q >= 1, self.max, items[index]))
+        return float(result) if result.ndim == 0 else result
+
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+    def mean(self) -> float:
+        return self._mean if self.count else np.nan
+
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1), like Series.std"""
+        return float(np.sqrt(self._m2 / (self.count - 1))) if self.count > 1 else np.nan
+
+    def to_dict(self) -> dict:
+        return {
+            'error': self.error,
+            'levels': [level.tolist() for level in self.levels],
+            'count': self.count,
+            'mean': self._mean,
+            'm2': self._m2,
+            'min': None if np.isnan(self.min) else float(self.min),
+            'max': None if np.isnan(self.max) else float(self.max)
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'QuantileSketch':
+        sketch = cls(data['error'])
+        sketch.levels = [np.asarray(level, dtype='float64') for level in data['levels']]
+        sketch.count = data['count']
+        sketch._mean = data['mean']
+        sketch._m2 = data['m2']
+        sketch.min = np.nan if data['min'] is None else data['min']
+        sketch.max = np.nan if data['max'] is None else data['max']
+        return sketch
+
+
+def series_quantiles(series: pd.Series, qs: List[float], error: Optional[float] = None) -> List[float]:
+    """Quantiles of series: exact when error is None, otherwise from a QuantileSketch"""
+    if error is None:
+        return [float(value) for value in series.quantile(qs)]
+    return [float(value) for value in QuantileSketch.from_series(series, error).quantile(qs)]
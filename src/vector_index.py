@@ -0,0 +1,353 @@
+"""
+Vector Index: chunking streaming, embedder lokal dan index vektor NumPy memory-mapped untuk RAG
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 100
+# Di bawah jumlah vektor ini pencarian brute force sudah di bawah 1 ms; di atasnya IVF
+IVF_MIN_ROWS = 20_000
+DEFAULT_NPROBE = 16
+SENTENCE_TRANSFORMER_MODEL = 'all-MiniLM-L6-v2'
+# Model embedding Ollama yang dipakai jika sudah di-pull
+OLLAMA_EMBEDDING_MODELS = ('nomic-embed-text', 'mxbai-embed-large', 'all-minilm')
+EMBED_BATCH_SIZE = 64
+
+_TOKEN = re.compile(r'\w+')
+_SPACES = re.compile(r'[ \t\r\f\v]+')
+
+
+def _break_point(text: str, chunk_size: int, minimum: int) -> int:
+    """End of the next chunk: the last paragraph, sentence or word boundary before chunk_size"""
+    for separator in ('\n\n', '\n', '. ', ' '):
+        position = text.rfind(separator, minimum, chunk_size)
+        if position != -1:
+            return position + len(separator)
+    return chunk_size
+
+
+def split_text(pieces: Union[str, Iterable[str]], chunk_size: int = CHUNK_SIZE,
+               overlap: int = CHUNK_OVERLAP) -> Iterator[str]:
+    """Chunks of at most chunk_size characters, consecutive chunks sharing about overlap characters
+
+    pieces boleh berupa satu string atau aliran string (mis. halaman PDF); hanya satu
+    jendela chunk yang disimpan di memori, bukan seluruh dokumen.
+    """
+    if not 0 <= overlap < chunk_size:
+        raise ValueError("overlap must be between 0 and chunk_size")
+    if isinstance(pieces, str):
+        pieces = [pieces]
+
+    minimum = max(chunk_size // 2, overlap + 1)
+    buffer = ''
+    carried = 0  # panjang awal buffer yang sudah ikut chunk sebelumnya
+    for piece in pieces:
+        piece = _SPACES.sub(' ', piece or '')
+        if not piece.strip():
+            continue
+        buffer = f"{buffer}\n{piece}" if buffer else piece
+        while len(buffer) > chunk_size:
+            end = _break_point(buffer, chunk_size, minimum)
+            chunk = buffer[:end].strip()
+            if chunk:
+                yield chunk
+            # Chunk berikutnya mulai overlap karakter sebelum end, di awal kata
+            start = end - overlap
+            word_start = buffer.find(' ', start, end)
+            start = word_start + 1 if overlap and word_start != -1 else start
+            buffer = buffer[start:]
+            carried = end - start
+
+    if len(buffer) > carried and buffer.strip():
+        yield buffer.strip()
+
+
+def chunk_hash(text: str) -> str:
+    """Content hash of a chunk, used as embedding cache key and for change detection"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype='float32')
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+class HashingEmbedder:
+    """Offline fallback: signed feature hashing of words and word pairs (no model to download)"""
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype='float32')
+        for i, text in enumerate(texts):
+            tokens = _TOKEN.findall(text.lower())
+            for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+                h = zlib.crc32(feature.encode('utf-8'))
+                vectors[i, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        return _normalize(np.sign(vectors) * np.log1p(np.abs(vectors)))
+
+
+class SentenceTransformerEmbedder:
+    """Local sentence-transformers model (optional dependency, imported on first use)"""
+
+    def __init__(self, model_name: str = SENTENCE_TRANSFORMER_MODEL):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"st:{model_name}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return _normalize(self.model.encode(texts, batch_size=EMBED_BATCH_SIZE, convert_to_numpy=True))
+
+
+class OllamaEmbedder:
+    """Embedding model served by Ollama, through the shared client"""
+
+    def __init__(self, model: str, client=None):
+        from src.ollama_client import get_ollama_client
+
+        self.model = model
+        self.client = client or get_ollama_client()
+        self.name = f"ollama:{model}"
+        self.dim = None
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = _normalize(self.client.embed(self.model, texts))
+        self.dim = vectors.shape[1]
+        return vectors
+
+
+_EMBEDDERS: Dict[Optional[str], object] = {}
+_EMBEDDERS_LOCK = threading.Lock()
+
+
+def get_embedder(name: Optional[str] = None, client=None):
+    """Process-wide embedder by name, or the best available (None): sentence-transformers, Ollama, hashing
+
+    Model dimuat sekali per proses dan dipakai bersama semua session.
+    """
+    with _EMBEDDERS_LOCK:
+        if name not in _EMBEDDERS:
+            _EMBEDDERS[name] = _create_embedder(name, client)
+        return _EMBEDDERS[name]
+
+
+def _create_embedder(name: Optional[str], client):
+    if name is not None:
+        kind, _, arg = name.partition(':')
+        if kind == 'st':
+            return SentenceTransformerEmbedder(arg)
+        if kind == 'ollama':
+            return OllamaEmbedder(arg, client)
+        if kind.startswith('hashing-'):
+            return HashingEmbedder(int(kind.split('-', 1)[1]))
+        raise ValueError(f"Unknown embedder: {name}")
+
+    try:
+        return SentenceTransformerEmbedder()
+    except Exception:
+        # Paket tidak terinstall atau model belum diunduh (offline)
+        pass
+
+    from src.ollama_client import get_ollama_client
+    client = client or get_ollama_client()
+    if client.is_available():
+        pulled = {model.split(':')[0] for model in client.list_models()}
+        for model in OLLAMA_EMBEDDING_MODELS:
+            if model in pulled:
+                return OllamaEmbedder(model, client)
+    return HashingEmbedder()
+
+
+class VectorIndex:
+    """Normalized chunk vectors in a memory-mapped .npy plus chunk metadata; cosine top-k search
+
+    Di bawah IVF_MIN_ROWS pencarian brute force (satu matvec); di atasnya vektor
+    dikelompokkan dengan k-means sferis dan hanya nprobe cluster terdekat yang dipindai.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, directory: str, embedder: Optional[str] = None):
+        self.directory = directory
+        self.embedder = embedder
+        # Satu entri per baris vectors: {'hash', 'doc_id', 'position', 'text'}
+        self.chunks: List[Dict] = []
+        # {doc_id: {'content_hash', 'source'}} dokumen yang sudah di-index, untuk ingest inkremental
+        self.sources: Dict[str, Dict] = {}
+        self.vectors = np.zeros((0, 0), dtype='float32')
+        # (centroids, urutan baris per cluster, offset tiap cluster) atau None
+        self._ivf: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1] if len(self.chunks) else 0
+
+    @classmethod
+    def load(cls, directory: str) -> 'VectorIndex':
+        """Open a saved index (vectors memory-mapped); an empty index if nothing is saved there"""
+        index = cls(directory)
+        try:
+            with open(os.path.join(directory, 'meta.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return index
+        if meta.get('format_version') != cls.FORMAT_VERSION:
+            return index
+
+        index.embedder = meta['embedder']
+        if meta['chunks']:
+            vectors = np.load(os.path.join(directory, 'vectors.npy'), mmap_mode='r')
+            if len(vectors) != len(meta['chunks']):
+                # Tertangkap di tengah save() proses lain
+                return cls(directory, meta['embedder'])
+            index.vectors = vectors
+        index.chunks = meta['chunks']
+        index.sources = meta.get('sources', {})
+        if meta.get('ivf'):
+            index._ivf = tuple(np.load(os.path.join(directory, f"ivf_{name}.npy"))
+                               for name in ('centroids', 'order', 'offsets'))
+        return index
+
+    def modified_at(self) -> Optional[int]:
+        """mtime of the saved metadata (None if never saved)"""
+        try:
+            return os.stat(os.path.join(self.directory, 'meta.json')).st_mtime_ns
+        except OSError:
+            return None
+
+    def documents(self) -> Dict[str, int]:
+        """{doc_id: number of chunks}"""
+        counts: Dict[str, int] = {}
+        for chunk in self.chunks:
+            counts[chunk['doc_id']] = counts.get(chunk['doc_id'], 0) + 1
+        return counts
+
+    def add(self, chunks: List[Dict], vectors: np.ndarray):
+        """Append chunks with their (normalized) vectors"""
+        if not chunks:
+            return
+        vectors = np.asarray(vectors, dtype='float32')
+        if len(self.chunks) and vectors.shape[1] != self.dim:
+            raise ValueError(f"Vector dimension {vectors.shape[1]} does not match index dimension {self.dim}")
+        self.vectors = vectors if not len(self.chunks) else np.vstack([self.vectors, vectors])
+        self.chunks = self.chunks + list(chunks)
+        self._ivf = None
+
+    def keep(self, mask: np.ndarray) -> int:
+        """Keep only the rows where mask is True; returns the number of rows removed"""
+        mask = np.asarray(mask, dtype=bool)
+        removed = int((~mask).sum())
+        if removed:
+            self.vectors = np.asarray(self.vectors)[mask]
+            self.chunks = [chunk for chunk, kept in zip(self.chunks, mask) if kept]
+            self._ivf = None
+        return removed
+
+    def rows(self, doc_id: str) -> np.ndarray:
+        """Row numbers of the chunks of doc_id"""
+        return np.array([i for i, chunk in enumerate(self.chunks) if chunk['doc_id'] == doc_id], dtype='int64')
+
+    def remove(self, doc_id: str) -> int:
+        """Drop every chunk of doc_id"""
+        self.sources.pop(doc_id, None)
+        return self.keep(np.array([chunk['doc_id'] != doc_id for chunk in self.chunks], dtype=bool))
+
+    def build_ivf(self, n_lists: Optional[int] = None, iterations: int = 10, seed: int = 0):
+        """Cluster the vectors with spherical k-means for sub-linear search"""
+        vectors = np.asarray(self.vectors)
+        n = len(vectors)
+        n_lists = n_lists or max(1, int(np.sqrt(n)))
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(n, size=min(n, 256 * n_lists), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)]
+
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            empty = np.bincount(assignment, minlength=n_lists) == 0
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+            centroids = _normalize(sums)
+
+        assignment = np.concatenate([
+            np.argmax(vectors[start:start + 65_536] @ centroids.T, axis=1)
+            for start in range(0, n, 65_536)
+        ])
+        order = np.argsort(assignment, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=n_lists))])
+        self._ivf = (centroids, order, offsets)
+
+    def search(self, query: np.ndarray, k: int = 3, nprobe: int = DEFAULT_NPROBE) -> List[Tuple[int, float]]:
+        """[(row, cosine similarity)] of the k nearest chunks, best first"""
+        if not len(self.chunks):
+            return []
+        query = _normalize(np.asarray(query).reshape(1, -1))[0]
+
+        if self._ivf is None:
+            candidates = None
+            scores = self.vectors @ query
+        else:
+            centroids, order, offsets = self._ivf
+            lists = np.argsort(centroids @ query)[::-1][:nprobe]
+            candidates = np.sort(np.concatenate([order[offsets[i]:offsets[i + 1]] for i in lists]))
+            scores = self.vectors[candidates] @ query
+
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        rows = top if candidates is None else candidates[top]
+        return [(int(row), float(score)) for row, score in zip(rows, scores[top])]
+
+    def save(self):
+        """Write vectors, IVF lists and metadata (metadata last, so readers never see a partial index)"""
+        os.makedirs(self.directory, exist_ok=True)
+        if len(self.chunks) >= IVF_MIN_ROWS and self._ivf is None:
+            self.build_ivf()
+
+        def write(name: str, writer):
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    writer(f)
+                os.replace(tmp_path, os.path.join(self.directory, name))
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        if self.chunks:
+            vectors = np.asarray(self.vectors, dtype='float32')
+            write('vectors.npy', lambda f: np.save(f, vectors))
+        if self._ivf is not None:
+            for name, array in zip(('centroids', 'order', 'offsets'), self._ivf):
+                write(f"ivf_{name}.npy", lambda f, a=array: np.save(f, a))
+        meta = {
+            'format_version': self.FORMAT_VERSION,
+            'embedder': self.embedder,
+            'ivf': self._ivf is not None,
+            'sources': self.sources,
+            'chunks': self.chunks
+        }
+        write('meta.json', lambda f: f.write(json.dumps(meta, ensure_ascii=False).encode('utf-8')))
+
+        if self.chunks:
+            self.vectors = np.load(os.path.join(self.directory, 'vectors.npy'), mmap_mode='r')
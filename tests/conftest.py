@@ -0,0 +1,45 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_dataset(n: int = 500, seed: int = 0) -> pd.DataFrame:
+    """Synthetic delinquency dataset with the columns of the Gellium extract"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Customer_ID': [f"CUST{i:05d}" for i in range(n)],
+        'Age': rng.integers(21, 75, n),
+        'Income': rng.normal(60_000, 20_000, n).round(),
+        'Credit_Score': rng.integers(300, 850, n).astype(float),
+        'Credit_Utilization': rng.uniform(0, 1, n).round(2),
+        'Missed_Payments': rng.integers(0, 7, n),
+        'Delinquent_Account': rng.integers(0, 2, n),
+        'Loan_Balance': rng.normal(20_000, 6_000, n),
+        'Debt_to_Income_Ratio': rng.uniform(0, 1, n),
+        'Employment_Status': rng.choice(['Employed', 'Unemployed', 'Self-employed', 'Retired'], n),
+        'Account_Tenure': rng.integers(0, 20, n),
+        'Credit_Card_Type': rng.choice(['Standard', 'Gold', 'Platinum', 'Student'], n),
+        'Location': rng.choice(['Chicago', 'Houston', 'Phoenix'], n)
+    })
+    for month in range(1, 7):
+        df[f"Month_{month}"] = rng.choice(['On-time', 'Late', 'Missed'], n)
+    df.loc[rng.choice(n, n // 10, replace=False), 'Income'] = np.nan
+    df.loc[rng.choice(n, n // 20, replace=False), 'Employment_Status'] = np.nan
+    return df
+
+
+@pytest.fixture
+def dataset() -> pd.DataFrame:
+    return make_dataset()
+
+
+@pytest.fixture
+def dataset_csv(tmp_path, dataset) -> str:
+    path = tmp_path / 'data.csv'
+    dataset.to_csv(path, index=False)
+    return str(path)
@@ -0,0 +1,40 @@
+import json
+import os
+import subprocess
+import sys
+
+from src.cli import run_pipeline
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_report_shows_missing_values_and_treatment(tmp_path, dataset_csv):
+    result = run_pipeline(dataset_csv, str(tmp_path / 'out'), use_cache=False)
+
+    assert result['status'] == 'ok', result.get('error')
+    with open(result['outputs']['report'], encoding='utf-8') as f:
+        report = f.read()
+    assert "No missing values detected" not in report
+    assert "- Income: 50 records (10.00%)" in report
+    assert "- Employment_Status: 25 records (5.00%)" in report
+    assert "Income: median, Employment_Status: unknown" in report
+
+
+def test_delinquency_rate_without_figure(tmp_path, dataset, dataset_csv):
+    result = run_pipeline(dataset_csv, str(tmp_path / 'out'), use_cache=False)
+
+    expected = dataset['Delinquent_Account'].mean() * 100
+    assert abs(result['delinquency_rate'] - expected) < 1e-3
+
+
+def test_pipeline_does_not_import_ui_libraries(tmp_path, dataset_csv):
+    # Proses terpisah: modul lain di sesi pytest mungkin sudah mengimpor plotly
+    code = (
+        "import json, sys\n"
+        "from src.cli import run_pipeline\n"
+        f"result = run_pipeline({dataset_csv!r}, {str(tmp_path / 'out')!r}, use_cache=False)\n"
+        "print(json.dumps([result['status'], 'plotly' in sys.modules, 'streamlit' in sys.modules]))\n"
+    )
+    output = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, capture_output=True,
+                            text=True, check=True).stdout
+    assert json.loads(output.splitlines()[-1]) == ['ok', False, False]
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from src.data_processor import DataProcessor, compact_frame
+
+
+def test_float64_that_loses_precision_is_not_downcast():
+    df = pd.DataFrame({
+        # Presisi penuh hasil perhitungan
+        'Loan_Balance': [18587.243473297975, 10730.794487858044, 22275.7390554892],
+        # Di atas 2^24 float32 tidak bisa menyimpan sen
+        'Portfolio_Balance': [16_777_217.25, 25_000_000.10, 31_415_926.53],
+        'Credit_Utilization': [0.22, 0.38, np.nan]
+    })
+
+    compact = compact_frame(df)
+
+    assert compact['Loan_Balance'].dtype == 'float64'
+    assert compact['Portfolio_Balance'].dtype == 'float64'
+    assert compact['Credit_Utilization'].dtype == 'float32'
+    assert compact['Credit_Utilization'].round(2).equals(df['Credit_Utilization'].astype('float32').round(2))
+
+
+def test_explicit_tolerance_allows_lossy_float32():
+    df = pd.DataFrame({'Loan_Balance': [18587.243473297975, 10730.794487858044]})
+
+    assert compact_frame(df, float_rtol=1e-6)['Loan_Balance'].dtype == 'float32'
+
+
+def test_compact_load_keeps_values(dataset_csv):
+    processor = DataProcessor()
+    df = processor.load_data(file_path=dataset_csv, use_cache=False, compact=True)
+
+    assert df['Age'].dtype == 'int8'
+    assert isinstance(df['Employment_Status'].dtype, pd.CategoricalDtype)
+    original = pd.read_csv(dataset_csv)
+    assert df['Loan_Balance'].dtype == 'float64'
+    assert df['Loan_Balance'].equals(original['Loan_Balance'])
+    assert (df['Credit_Utilization'].astype('float64').round(2) == original['Credit_Utilization']).all()
+    assert df.memory_usage(deep=True).sum() < original.memory_usage(deep=True).sum()
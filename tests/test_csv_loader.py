@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from src.data_processor import MONTH_CODES, MONTH_COLUMNS, DataProcessor
+
+
+def test_csv_columns_follow_schema(dataset_csv, dataset):
+    df = DataProcessor()._read_csv(dataset_csv, chunksize=64)
+
+    assert df['Customer_ID'].dtype == object
+    assert isinstance(df['Location'].dtype, pd.CategoricalDtype)
+    assert df['Delinquent_Account'].dtype == 'Int8'
+    assert df['Age'].dtype == 'float64'
+    assert all(df[col].dtype == 'int8' for col in MONTH_COLUMNS)
+    np.testing.assert_array_equal(df['Month_1'], dataset['Month_1'].map(MONTH_CODES))
+    assert df['Income'].isna().sum() == 50
+
+
+def test_chunked_read_equals_single_chunk(dataset_csv):
+    processor = DataProcessor()
+    chunked = processor._read_csv(dataset_csv, chunksize=64)
+    whole = processor._read_csv(dataset_csv, chunksize=10_000)
+
+    pd.testing.assert_frame_equal(chunked, whole)
+
+
+def test_missing_month_stays_nullable(tmp_path, dataset):
+    dataset.loc[3, 'Month_2'] = np.nan
+    path = tmp_path / 'data.csv.gz'
+    dataset.to_csv(path, index=False)
+    progress = []
+
+    df = DataProcessor()._read_csv(str(path), chunksize=64, progress_callback=progress.append)
+
+    assert df['Month_2'].dtype == 'Int8'
+    assert df['Month_2'].isna().sum() == 1
+    assert df['Month_1'].dtype == 'int8'
+    assert progress[-1] == 1.0
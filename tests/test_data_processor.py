@@ -0,0 +1,73 @@
+import pytest
+
+from src.data_processor import DataProcessor
+
+
+def test_unversioned_frames_get_distinct_versions(dataset):
+    first, second = DataProcessor(), DataProcessor()
+    first.df = dataset
+    second.df = dataset.iloc[:100].reset_index(drop=True)
+
+    first.apply_imputation('median', 'Income')
+    second.apply_imputation('median', 'Income')
+
+    assert first.dataset_version != second.dataset_version
+
+
+def test_apply_imputation_does_not_mutate_previous_frame(dataset):
+    processor = DataProcessor()
+    processor.df = original = dataset
+    processor.dataset_version = 'v1'
+
+    processor.apply_imputation('median', 'Income')
+    processor.apply_imputation('drop_column', 'Location')
+
+    assert original['Income'].isna().sum() == 50
+    assert 'Location' in original.columns
+    assert processor.df['Income'].notna().all()
+    assert 'Location' not in processor.df.columns
+    assert processor.dataset_version != 'v1'
+
+
+def test_failed_imputation_keeps_version(dataset):
+    processor = DataProcessor()
+    processor.df = dataset
+    processor.dataset_version = 'v1'
+
+    with pytest.raises(ValueError):
+        processor.apply_imputation('regression', 'Employment_Status')
+    assert processor.dataset_version == 'v1'
+    assert processor.df is dataset
+
+
+def test_uncombined_partitions_keep_current_version(tmp_path, dataset):
+    for i, part in enumerate((dataset.iloc[:250], dataset.iloc[250:])):
+        part.to_csv(tmp_path / f"part{i}.csv", index=False)
+    processor = DataProcessor()
+    processor.df = dataset
+    processor.dataset_version = 'v1'
+
+    partitions = processor.load_partitions(str(tmp_path), use_cache=False, max_workers=1, combine=False)
+
+    assert sorted(partitions) == ['part0.csv', 'part1.csv']
+    assert sorted(processor.partition_hashes) == ['part0.csv', 'part1.csv']
+    assert processor.df is dataset
+    assert processor.dataset_version == 'v1'
+
+    combined = processor.load_partitions(str(tmp_path), use_cache=False, max_workers=1)
+    assert len(combined) == len(dataset)
+    assert processor.dataset_version != 'v1'
+
+
+def test_imputation_version_follows_fitted_value(dataset):
+    exact, approximate = DataProcessor(), DataProcessor()
+    for processor in (exact, approximate):
+        processor.df = dataset
+        processor.dataset_version = 'v1'
+    approximate.quantile_error = 0.2
+
+    exact.apply_imputation('median', 'Income')
+    approximate.apply_imputation('median', 'Income')
+
+    assert not exact.df['Income'].equals(approximate.df['Income'])
+    assert exact.dataset_version != approximate.dataset_version
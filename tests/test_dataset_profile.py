@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from src.data_processor import DataProcessor
+from src.dataset_profile import dataset_fingerprint, get_dataset_profile
+
+
+def test_profile_matches_pandas(dataset):
+    profile = get_dataset_profile(dataset)
+    numeric = dataset.select_dtypes(include=[np.number])
+
+    pd.testing.assert_series_equal(profile.null_counts, dataset.isna().sum())
+    pd.testing.assert_series_equal(profile.nunique, dataset.nunique())
+    pd.testing.assert_frame_equal(profile.correlations, numeric.corr(), atol=1e-10)
+    assert profile.target_rate == dataset['Delinquent_Account'].mean() * 100
+    assert list(profile.missing_table()['Column']) == ['Income', 'Employment_Status']
+
+
+def test_identical_data_shares_one_profile(dataset):
+    profile = get_dataset_profile(dataset)
+
+    assert get_dataset_profile(dataset.copy()) is profile
+    changed = dataset.copy()
+    changed.loc[0, 'Age'] += 1
+    assert dataset_fingerprint(changed) != profile.fingerprint
+    assert get_dataset_profile(changed) is not profile
+
+
+def test_processor_profile_follows_data_changes(dataset):
+    processor = DataProcessor()
+    processor.df = dataset
+    processor.dataset_version = 'v1'
+    profile = processor.get_profile()
+
+    assert processor.get_profile() is profile
+    processor.apply_imputation('median', 'Income')
+    assert processor.get_profile() is not profile
+    assert processor.get_profile().null_counts['Income'] == 0
@@ -0,0 +1,59 @@
+import numpy as np
+
+from src.data_processor import DataProcessor
+from src.dataset_store import VersionedDataset
+from src.imputation import ImputationPlan
+
+
+def imputed_store(dataset):
+    processor = DataProcessor()
+    processor.df = dataset
+    processor.dataset_version = 'v0'
+    store = VersionedDataset(dataset, 'v0')
+    processor.apply_plan(ImputationPlan().add('Income', 'median').add('Employment_Status', 'unknown'))
+    store.commit(processor.df, processor.dataset_version, 'impute')
+    return store
+
+
+def test_undo_restores_missing_values_and_redo_reapplies(dataset):
+    store = imputed_store(dataset)
+    assert store.current['Income'].notna().all()
+
+    before = store.undo()
+    assert store.version == 'v0'
+    assert before['Income'].isna().sum() == 50
+    assert before['Employment_Status'].isna().sum() == 25
+
+    after = store.redo()
+    assert after['Income'].notna().all()
+    assert (after['Employment_Status'] == 'Unknown').sum() == 25
+
+
+def test_unchanged_columns_share_buffers(dataset):
+    store = imputed_store(dataset)
+    current, original = store.current, store.versions[0].to_frame()
+
+    for col in ('Age', 'Credit_Score', 'Loan_Balance'):
+        assert np.shares_memory(current[col].to_numpy(), original[col].to_numpy())
+    assert not np.shares_memory(current['Income'].to_numpy(), original['Income'].to_numpy())
+    # Kolom bersama dihitung sekali: jauh di bawah dua salinan penuh
+    assert store.memory_bytes() < 1.5 * dataset.memory_usage(index=False, deep=True).sum()
+
+
+def test_diff_reports_changed_columns(dataset):
+    diff = imputed_store(dataset).diff().set_index('Column')
+
+    assert diff.loc['Income', 'Status'] == 'changed'
+    assert diff.loc['Income', 'Changed Cells'] == 50
+    assert (diff.loc['Income', 'Missing Before'], diff.loc['Income', 'Missing After']) == (50, 0)
+    assert diff.loc['Age', 'Status'] == 'unchanged'
+
+
+def test_commit_after_undo_drops_redo_branch(dataset):
+    store = imputed_store(dataset)
+    store.undo()
+    store.commit(dataset.drop(columns=['Location']), 'v2', 'drop Location')
+
+    assert not store.can_redo
+    assert list(store.history()['Token']) == ['v0', 'v2']
+    assert store.diff().set_index('Column').loc['Location', 'Status'] == 'removed'
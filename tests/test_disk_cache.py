@@ -0,0 +1,56 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.data_processor import DataProcessor
+from src.disk_cache import DatasetCache, EmbeddingCache
+
+
+def test_cached_load_equals_fresh_load(tmp_path, monkeypatch, dataset_csv):
+    monkeypatch.setattr('src.data_processor.DatasetCache', lambda: DatasetCache(str(tmp_path / 'cache')))
+
+    fresh = DataProcessor().load_data(file_path=dataset_csv, use_cache=False)
+    first = DataProcessor().load_data(file_path=dataset_csv)
+    cached = DataProcessor().load_data(file_path=dataset_csv)
+
+    assert len(os.listdir(tmp_path / 'cache')) == 1
+    pd.testing.assert_frame_equal(first, fresh)
+    pd.testing.assert_frame_equal(cached, fresh)
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = DatasetCache(str(tmp_path))
+    key = cache.make_key('abc', 'csv')
+    with open(cache.path_for(key), 'wb') as f:
+        f.write(b'not parquet')
+
+    assert cache.load(key) is None
+    assert not os.path.exists(cache.path_for(key))
+
+
+def test_corrupt_entry_removed_concurrently_is_a_miss(tmp_path, monkeypatch):
+    cache = DatasetCache(str(tmp_path))
+    key = cache.make_key('abc', 'csv')
+    with open(cache.path_for(key), 'wb') as f:
+        f.write(b'not parquet')
+
+    def read_evicted(path):
+        # Session lain membuang entry di antara get_path dan pembacaan
+        os.remove(path)
+        raise OSError("entry vanished")
+
+    monkeypatch.setattr(pd, 'read_parquet', read_evicted)
+    assert cache.load(key) is None
+
+
+def test_embedding_cache_skips_corrupt_vectors(tmp_path):
+    cache = EmbeddingCache(str(tmp_path))
+    cache.put_many('hashing-4', {'good': np.ones(4), 'bad': np.zeros(4)})
+    with open(cache.path_for(cache.make_key('hashing-4', 'bad')), 'wb') as f:
+        f.write(b'garbage')
+
+    found = cache.get_many('hashing-4', ['good', 'bad', 'missing'])
+
+    assert list(found) == ['good']
+    assert found['good'].dtype == np.float32
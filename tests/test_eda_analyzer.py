@@ -0,0 +1,58 @@
+import threading
+
+import numpy as np
+
+from src import eda_analyzer
+from src.eda_analyzer import EDAAnalyzer
+
+
+class BarrierClient:
+    """Answers only once `parties` requests are in flight at the same time"""
+
+    def __init__(self, parties):
+        self.barrier = threading.Barrier(parties, timeout=5)
+
+    def is_available(self):
+        return True
+
+    def chat_stream(self, model, messages, options=None, timeout=None):
+        self.barrier.wait()
+        yield f"jawaban {options['num_predict']}"
+
+
+def test_analyses_are_requested_concurrently(dataset):
+    analyzer = EDAAnalyzer(dataset, client=BarrierClient(3), use_llm_cache=False)
+
+    results = analyzer.run_analyses_concurrently(['summary', 'missing_values', 'risk_factors'], max_concurrency=3)
+
+    assert results == {'summary': 'jawaban 500', 'missing_values': 'jawaban 800', 'risk_factors': 'jawaban 1000'}
+
+
+def test_each_analysis_ends_with_a_done_event(dataset):
+    analyzer = EDAAnalyzer(dataset, client=BarrierClient(2), use_llm_cache=False)
+
+    events = list(analyzer.iter_analyses_concurrently(['summary', 'risk_factors'], max_concurrency=2))
+
+    for name in ('summary', 'risk_factors'):
+        tokens = [token for event, token in events if event == name]
+        assert tokens[-1] is None and tokens.count(None) == 1
+
+
+def test_binned_chart_matches_numpy_histogram(dataset):
+    fig = EDAAnalyzer(dataset, use_llm_cache=False).create_distribution_chart('Income', binned=True)
+    income = dataset['Income'].dropna().to_numpy()
+    counts, edges = np.histogram(income, bins=50)
+
+    box, bars = fig.data
+    np.testing.assert_array_equal(bars.y, counts)
+    np.testing.assert_allclose(bars.x, (edges[:-1] + edges[1:]) / 2)
+    np.testing.assert_allclose([box.q1[0], box.median[0], box.q3[0]], np.percentile(income, [25, 50, 75]))
+    assert box.lowerfence[0] >= income.min() and box.upperfence[0] <= income.max()
+
+
+def test_large_datasets_are_binned_automatically(dataset, monkeypatch):
+    analyzer = EDAAnalyzer(dataset, use_llm_cache=False)
+
+    assert analyzer.create_distribution_chart('Age').data[0].type == 'histogram'
+    monkeypatch.setattr(eda_analyzer, 'BINNED_HISTOGRAM_ROWS', len(dataset) - 1)
+    assert [trace.type for trace in analyzer.create_distribution_chart('Age').data] == ['box', 'bar']
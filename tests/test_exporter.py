@@ -0,0 +1,39 @@
+import gzip
+import io
+
+import pandas as pd
+import pytest
+
+from src import exporter
+from src.exporter import iter_export, write_export
+
+
+@pytest.mark.parametrize('format', ['csv', 'csv.gz', 'parquet'])
+def test_write_export_reads_back_equal(tmp_path, dataset, format):
+    path = str(tmp_path / f"out{exporter.EXPORT_FORMATS[format]}")
+    write_export(dataset, path, format, chunksize=64)
+
+    read = pd.read_parquet(path) if format == 'parquet' else pd.read_csv(path)
+    pd.testing.assert_frame_equal(read, dataset, check_dtype=format == 'parquet')
+
+
+def test_chunked_csv_matches_to_csv(dataset):
+    expected = dataset.to_csv(index=False).encode('utf-8')
+
+    assert b''.join(iter_export(dataset, 'csv', chunksize=64)) == expected
+    assert gzip.decompress(b''.join(iter_export(dataset, 'csv.gz', chunksize=64))) == expected
+
+
+def test_empty_frame_keeps_header(dataset):
+    data = b''.join(iter_export(dataset.head(0), 'csv.gz'))
+
+    assert list(pd.read_csv(io.BytesIO(gzip.decompress(data))).columns) == list(dataset.columns)
+
+
+def test_excel_row_limit(tmp_path, dataset, monkeypatch):
+    monkeypatch.setattr(exporter, 'EXCEL_MAX_ROWS', 100)
+    path = tmp_path / 'out.xlsx'
+
+    with pytest.raises(ValueError, match='CSV or Parquet'):
+        write_export(dataset, str(path), 'excel')
+    assert list(tmp_path.iterdir()) == []
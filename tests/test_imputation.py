@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processor import DataProcessor
+from src.imputation import ImputationPlan
+
+
+def test_mode_on_all_missing_column_falls_back():
+    df = pd.DataFrame({
+        'Status': pd.Series([None, None, None], dtype=object),
+        'Score': [np.nan, np.nan, np.nan]
+    })
+    plan = ImputationPlan().add('Status', 'mode').add('Score', 'mode').fit(df)
+
+    assert plan.is_fitted
+    result = plan.apply(df)
+    assert (result['Status'] == 'Unknown').all()
+    assert result['Score'].isna().all()
+
+
+def test_saved_regression_plan_names_missing_predictors(dataset):
+    plan = ImputationPlan(regression_features=['Age', 'Credit_Score']).add('Income', 'regression').fit(dataset)
+    monthly = ImputationPlan.from_json(plan.to_json())
+    new_file = dataset.drop(columns=['Credit_Score'])
+
+    with pytest.raises(ValueError, match='Credit_Score'):
+        monthly.apply(new_file)
+
+
+def test_failed_plan_keeps_version_and_data(dataset):
+    processor = DataProcessor()
+    processor.df = dataset.drop(columns=['Credit_Score'])
+    processor.dataset_version = 'v1'
+    plan = ImputationPlan(regression_features=['Age', 'Credit_Score']).add('Income', 'regression').fit(dataset)
+
+    with pytest.raises(ValueError):
+        processor.apply_plan(plan)
+    assert processor.dataset_version == 'v1'
+    assert processor.df['Income'].isna().any()
@@ -0,0 +1,51 @@
+from src import disk_cache
+from src.disk_cache import LLMCache
+from src.eda_analyzer import EDAAnalyzer
+
+
+class FakeStreamClient:
+    def __init__(self):
+        self.requests = 0
+
+    def is_available(self):
+        return True
+
+    def chat_stream(self, model, messages, options=None, timeout=None):
+        self.requests += 1
+        yield from ["jawaban ", str(self.requests)]
+
+
+def test_key_depends_on_model_messages_and_options():
+    messages = [{"role": "user", "content": "halo"}]
+    key = LLMCache.make_key('mistral', messages, {"temperature": 0.7, "num_predict": 500})
+
+    assert key == LLMCache.make_key('mistral', messages, {"num_predict": 500, "temperature": 0.7})
+    assert key != LLMCache.make_key('llama3', messages, {"temperature": 0.7, "num_predict": 500})
+    assert key != LLMCache.make_key('mistral', messages, {"temperature": 0.2, "num_predict": 500})
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    cache = LLMCache(str(tmp_path), ttl_seconds=60)
+    now = [1_000_000.0]
+    monkeypatch.setattr(disk_cache.time, 'time', lambda: now[0])
+    cache.put('key', 'jawaban', model='mistral')
+
+    now[0] += 59
+    assert cache.get('key') == 'jawaban'
+    now[0] += 2
+    assert cache.get('key') is None
+    assert cache.get_path('key') is None
+
+
+def test_analysis_is_served_from_cache_until_refreshed(tmp_path, dataset):
+    client = FakeStreamClient()
+    analyzer = EDAAnalyzer(dataset, llm_cache=LLMCache(str(tmp_path)), client=client)
+
+    assert analyzer.get_risk_factors_analysis() == 'jawaban 1'
+    assert analyzer.get_risk_factors_analysis() == 'jawaban 1'
+    assert analyzer.get_cached_analysis('risk_factors') == 'jawaban 1'
+    assert client.requests == 1
+
+    assert analyzer.get_risk_factors_analysis(force_refresh=True) == 'jawaban 2'
+    assert analyzer.get_risk_factors_analysis() == 'jawaban 2'
+    assert client.requests == 2
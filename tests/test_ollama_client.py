@@ -0,0 +1,65 @@
+import threading
+import time
+
+import requests
+
+from src.ollama_client import OllamaClient, get_ollama_client
+
+
+class FakeResponse:
+    status_code = 200
+
+    def json(self):
+        return {'models': [{'name': 'mistral:latest'}]}
+
+
+def counting_client(health_ttl=15.0, delay=0.0, fail=False):
+    client = OllamaClient('http://ollama.test', health_ttl=health_ttl)
+    client.probes = 0
+
+    def get(url, timeout=None):
+        client.probes += 1
+        time.sleep(delay)
+        if fail:
+            raise requests.ConnectionError("refused")
+        return FakeResponse()
+
+    client.session.get = get
+    return client
+
+
+def test_shared_client_per_base_url():
+    client = get_ollama_client('http://pool.test:11434')
+
+    assert get_ollama_client('http://pool.test:11434/') is client
+    assert get_ollama_client('http://other.test:11434') is not client
+
+
+def test_health_probe_is_cached_for_ttl():
+    client = counting_client()
+
+    assert client.is_available()
+    assert client.list_models() == ['mistral:latest']
+    assert client.is_available()
+    assert client.probes == 1
+    assert client.is_available(force=True)
+    assert client.probes == 2
+
+
+def test_expired_probe_is_repeated_and_failure_reported():
+    client = counting_client(health_ttl=0, fail=True)
+
+    assert not client.is_available()
+    assert client.list_models() == []
+    assert client.probes == 2
+
+
+def test_concurrent_callers_share_one_probe():
+    client = counting_client(delay=0.2)
+    threads = [threading.Thread(target=client.is_available) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert client.probes == 1
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_processor import DataProcessor
+
+COLUMNS = ['Income', 'Credit_Score', 'Loan_Balance', 'Debt_to_Income_Ratio']
+
+
+def reference_bounds(series, method):
+    if method == 'iqr':
+        q1, q3 = series.quantile([0.25, 0.75])
+        return q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    if method == 'zscore':
+        return series.mean() - 3 * series.std(), series.mean() + 3 * series.std()
+    median = series.median()
+    mad = (series - median).abs().median()
+    return median - 3.5 * mad / 0.6745, median + 3.5 * mad / 0.6745
+
+
+@pytest.fixture
+def processor(dataset):
+    # Ekor berat agar setiap metode menemukan outlier
+    dataset.loc[:9, 'Loan_Balance'] = 500_000
+    dataset.loc[10:14, 'Income'] = 1_000_000
+    processor = DataProcessor()
+    processor.df = dataset
+    return processor
+
+
+@pytest.mark.parametrize('method', ['iqr', 'zscore', 'mad'])
+def test_vectorized_outliers_match_per_column(processor, method):
+    result = processor.detect_outliers_all(method, columns=COLUMNS)
+
+    for col in COLUMNS:
+        lower, upper = reference_bounds(processor.df[col], method)
+        expected = processor.df.index[(processor.df[col] < lower) | (processor.df[col] > upper)]
+        np.testing.assert_allclose(result['bounds'].loc[col], [lower, upper])
+        pd.testing.assert_index_equal(result['indices'][col], expected)
+        assert result['counts'][col] == len(expected)
+    assert result['counts']['Loan_Balance'] >= 10
+
+
+def test_iqr_matches_single_column_detector(processor):
+    counts = processor.detect_outliers_all('iqr', columns=COLUMNS)['counts']
+
+    assert all(counts[col] == len(processor.detect_outliers(col)) for col in COLUMNS)
+
+
+def test_default_columns_skip_ids_and_binary(processor):
+    result = processor.detect_outliers_all()
+
+    assert 'Delinquent_Account' not in result['columns']
+    assert set(COLUMNS) <= set(result['columns'])
+    assert result['mask'].shape == (len(processor.df), len(result['columns']))
+    assert list(result['summary']['Outliers']) == sorted(result['summary']['Outliers'], reverse=True)
@@ -0,0 +1,58 @@
+from src.disk_cache import EmbeddingCache, LLMCache
+from src.rag_chatbot import RAGChatbot
+from src.vector_index import HashingEmbedder
+
+
+class FakeClient:
+    def __init__(self):
+        self.chats = 0
+
+    def is_available(self):
+        return True
+
+    def chat(self, model, messages, options=None):
+        self.chats += 1
+        return f"jawaban {self.chats}"
+
+
+def make_bot(tmp_path, embedder):
+    bot = RAGChatbot(index_dir=str(tmp_path / 'index'), embedder=embedder)
+    bot.client = FakeClient()
+    bot.embedding_cache = EmbeddingCache(str(tmp_path / 'embeddings'))
+    bot.llm_cache = LLMCache(str(tmp_path / 'llm'))
+    bot._index_chunks('guide', ["Credit_Utilization adalah rasio saldo terhadap limit kartu.",
+                                "Missed_Payments adalah jumlah pembayaran yang terlewat."])
+    return bot
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        super().__init__()
+        self.queries = []
+
+    def embed(self, texts):
+        self.queries.extend(texts)
+        return super().embed(texts)
+
+
+def test_ask_embeds_the_query_once(tmp_path):
+    embedder = CountingEmbedder()
+    bot = make_bot(tmp_path, embedder)
+    embedder.queries.clear()
+
+    answer, passages = bot.ask("Apa arti Credit_Utilization?", n_results=1)
+
+    assert embedder.queries == ["Apa arti Credit_Utilization?"]
+    assert passages[0]['doc_id'] == 'guide'
+    assert answer
+
+
+def test_column_explanation_is_cached_per_retrieved_context(tmp_path):
+    bot = make_bot(tmp_path, HashingEmbedder())
+
+    first = bot.get_column_explanation('Credit_Utilization')
+    again = bot.get_column_explanation('Credit_Utilization')
+    assert first == again == "jawaban 1"
+
+    bot._index_chunks('guide', ["Credit_Utilization adalah saldo dibagi limit, dalam persen."])
+    assert bot.get_column_explanation('Credit_Utilization') == "jawaban 2"
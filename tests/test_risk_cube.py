@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.risk_cube import DIMENSIONS, RiskCube
+
+
+def groupby_risk(df: pd.DataFrame, *names: str) -> pd.DataFrame:
+    """Reference Risk_Rate per dimension (pair) computed with a plain pandas groupby"""
+    keys = {}
+    for name in names:
+        spec = DIMENSIONS[name]
+        values = df[spec['column']]
+        if 'bins' in spec:
+            values = pd.cut(values * spec.get('scale', 1), bins=spec['bins'], labels=spec['labels'])
+        keys[name] = values.rename(name)
+    grouped = df['Delinquent_Account'].groupby([keys[name] for name in names], observed=True)
+    result = grouped.agg(['mean', 'count']).reset_index()
+    result['Risk_Rate'] = result['mean'] * 100
+    return result
+
+
+@pytest.mark.parametrize('name', ['Employment_Status', 'Missed_Payments', 'Credit_Card_Type'])
+def test_table_matches_groupby(dataset, name):
+    table = RiskCube.from_frame(dataset).table(name)
+    expected = groupby_risk(dataset, name)
+
+    pd.testing.assert_frame_equal(table.reset_index(drop=True), expected, check_dtype=False)
+
+
+@pytest.mark.parametrize('name', ['Utilization_Bin', 'Age_Group'])
+def test_binned_table_matches_groupby(dataset, name):
+    table = RiskCube.from_frame(dataset).table(name)
+    expected = groupby_risk(dataset, name).set_index(name)
+
+    # Dimensi ber-bin menampilkan semua label berurutan, juga yang kosong
+    assert list(table[name]) == DIMENSIONS[name]['labels']
+    table = table.set_index(table[name].astype(str)).loc[expected.index.astype(str)]
+    np.testing.assert_allclose(table['Risk_Rate'], expected['Risk_Rate'])
+    np.testing.assert_array_equal(table['count'], expected['count'])
+
+
+def test_cross_table_matches_groupby(dataset):
+    cross = RiskCube.from_frame(dataset).cross_table('Utilization_Bin', 'Missed_Payments')
+    expected = groupby_risk(dataset, 'Utilization_Bin', 'Missed_Payments')
+
+    assert len(cross) == len(expected)
+    np.testing.assert_allclose(cross['Risk_Rate'], expected['Risk_Rate'])
+    np.testing.assert_array_equal(cross['count'], expected['count'])
+    assert list(cross['Missed_Payments']) == list(expected['Missed_Payments'])
+
+
+def test_merge_and_dict_round_trip(dataset):
+    whole = RiskCube.from_frame(dataset)
+    merged = RiskCube.from_frame(dataset.iloc[:150]).merge(RiskCube.from_frame(dataset.iloc[150:]))
+    restored = RiskCube.from_dict(merged.to_dict())
+
+    for name in ('Employment_Status', 'Utilization_Bin', 'Age_Group'):
+        pd.testing.assert_frame_equal(restored.table(name), whole.table(name), check_dtype=False)
+    pd.testing.assert_frame_equal(restored.cross_table('Employment_Status', 'Credit_Card_Type'),
+                                  whole.cross_table('Employment_Status', 'Credit_Card_Type'), check_dtype=False)
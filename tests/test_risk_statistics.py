@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from src.risk_analyzer import RiskAnalyzer
+from src.risk_statistics import RiskStatistics
+
+
+def assert_same_statistics(left: RiskStatistics, right: RiskStatistics):
+    assert (left.n_rows, left.delinquent, left.has_target, left.high_risk_count) == \
+        (right.n_rows, right.delinquent, right.has_target, right.high_risk_count)
+    assert left.moments.keys() == right.moments.keys()
+    for col in left.moments:
+        assert left.moments[col] == pytest.approx(right.moments[col])
+    assert left.high_risk_counts.keys() == right.high_risk_counts.keys()
+    for col in left.high_risk_counts:
+        pd.testing.assert_series_equal(left.high_risk_counts[col].sort_index(),
+                                       right.high_risk_counts[col].sort_index(), check_names=False)
+    assert left.cube.tables.keys() == right.cube.tables.keys()
+    for name in left.cube.tables:
+        pd.testing.assert_frame_equal(left.cube.tables[name], right.cube.tables[name], check_dtype=False)
+    pd.testing.assert_series_equal(left.target_correlations(), right.target_correlations())
+
+
+def test_merge_of_halves_equals_whole(dataset):
+    whole = RiskStatistics.from_frame(dataset)
+    merged = RiskStatistics.from_frame(dataset.iloc[:200]).merge(RiskStatistics.from_frame(dataset.iloc[200:]))
+
+    assert_same_statistics(merged, whole)
+    assert merged.mean_std('Age') == pytest.approx(tuple(
+        dataset.loc[dataset['Delinquent_Account'] == 1, 'Age'].agg(['mean', 'std'])
+    ))
+
+
+def test_json_round_trip(tmp_path, dataset):
+    stats = RiskStatistics.from_frame(dataset)
+    path = tmp_path / 'risk_statistics.json'
+    stats.save(str(path))
+
+    assert_same_statistics(RiskStatistics.load(str(path)), stats)
+
+
+def test_analyzer_update_does_not_mutate_given_statistics(dataset):
+    history = RiskStatistics.from_frame(dataset.iloc[:300])
+    analyzer = RiskAnalyzer(dataset.iloc[:300], stats=history)
+
+    analyzer.update(dataset.iloc[300:])
+
+    assert history.n_rows == 300
+    assert analyzer.stats.n_rows == len(dataset)
+    assert_same_statistics(analyzer.stats, RiskStatistics.from_frame(dataset))
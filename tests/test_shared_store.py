@@ -0,0 +1,57 @@
+from functools import partial
+
+import pandas as pd
+import pytest
+
+from src import data_processor, notifications
+from src.data_processor import DataProcessor
+from src.shared_store import SharedDatasetStore
+
+
+def test_put_rejects_mixed_object_column(tmp_path):
+    store = SharedDatasetStore(root=str(tmp_path))
+    df = pd.DataFrame({'Mixed': ['one', 2, 'three']})
+
+    with pytest.raises(ValueError, match='Mixed'):
+        store.put('key', df)
+    assert not store.has('key')
+
+
+def test_shared_load_falls_back_to_memory_frame(tmp_path, monkeypatch, dataset):
+    monkeypatch.setattr(data_processor, 'SharedDatasetStore', partial(SharedDatasetStore, root=str(tmp_path)))
+    dataset['Location'] = dataset['Location'].astype(object)
+    dataset.loc[10, 'Location'] = 12345
+    path = tmp_path / 'mixed.xlsx'
+    dataset.to_excel(path, index=False)
+
+    with notifications.capture() as messages:
+        df = DataProcessor().load_data(file_path=str(path), use_cache=False, shared=True)
+
+    assert df is not None
+    assert len(df) == len(dataset)
+    assert any('Shared dataset store unavailable' in message for _, message in messages)
+
+
+def test_put_open_round_trip(tmp_path, dataset):
+    store = SharedDatasetStore(root=str(tmp_path))
+    df = dataset.assign(
+        Location=dataset['Location'].astype('category'),
+        Count=pd.array([1, None] * (len(dataset) // 2), dtype='Int64')
+    )
+
+    store.put('key', df, version='v1')
+    opened, version = store.open('key')
+
+    assert version == 'v1'
+    assert isinstance(opened['Location'].dtype, pd.CategoricalDtype)
+    assert opened['Count'].dtype == 'Int64'
+    pd.testing.assert_frame_equal(opened, df, check_dtype=False)
+
+
+def test_open_miss_and_eviction(tmp_path, dataset):
+    store = SharedDatasetStore(root=str(tmp_path), max_bytes=0)
+
+    assert store.open('missing') == (None, None)
+    store.put('key', dataset)
+    # Lebih besar dari max_bytes: langsung dikeluarkan lagi
+    assert not store.has('key')
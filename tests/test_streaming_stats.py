@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.streaming_stats import CoMoments, QuantileSketch, correlation_matrix, series_quantiles, target_correlations
+
+
+@pytest.fixture
+def numeric(dataset) -> pd.DataFrame:
+    df = dataset.select_dtypes(include=[np.number]).copy()
+    # NaN di beberapa kolom berbeda: korelasi dihitung pairwise-complete seperti df.corr()
+    df.loc[df.index[::7], 'Credit_Score'] = np.nan
+    df.loc[df.index[::11], 'Debt_to_Income_Ratio'] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('chunksize', [37, 1000])
+def test_correlation_matrix_matches_pandas(numeric, chunksize):
+    pd.testing.assert_frame_equal(correlation_matrix(numeric, chunksize=chunksize), numeric.corr(),
+                                  check_exact=False, atol=1e-10)
+
+
+def test_merged_chunks_match_pandas(numeric):
+    merged = CoMoments.from_frame(numeric.iloc[:123]).merge(CoMoments.from_frame(numeric.iloc[123:]))
+    restored = CoMoments.from_dict(merged.to_dict())
+
+    pd.testing.assert_frame_equal(restored.correlation(), numeric.corr(), check_exact=False, atol=1e-10)
+
+
+def test_target_correlations_match_pandas(numeric):
+    expected = numeric.corr()['Delinquent_Account']
+
+    pd.testing.assert_series_equal(target_correlations(numeric, 'Delinquent_Account', chunksize=50), expected,
+                                   check_exact=False, atol=1e-10)
+
+
+def rank_error(values: np.ndarray, sketch: QuantileSketch, qs: np.ndarray) -> float:
+    """Largest distance between q and the rank range of the estimated q-quantile"""
+    ordered = np.sort(values)
+    estimates = sketch.quantile(qs)
+    low = np.searchsorted(ordered, estimates, side='left') / len(values)
+    high = np.searchsorted(ordered, estimates, side='right') / len(values)
+    return float(np.max(np.where(qs < low, low - qs, np.where(qs > high, qs - high, 0.0))))
+
+
+DISTRIBUTIONS = {
+    'normal': lambda rng, n: rng.normal(size=n),
+    'lognormal': lambda rng, n: rng.lognormal(size=n),
+    'integers': lambda rng, n: rng.integers(0, 1000, n).astype(float)
+}
+
+
+@pytest.mark.parametrize('distribution', sorted(DISTRIBUTIONS))
+def test_kll_rank_error_within_bound(distribution):
+    rng = np.random.default_rng(1)
+    values = DISTRIBUTIONS[distribution](rng, 100_000)
+    qs = np.linspace(0.01, 0.99, 99)
+
+    sketch = QuantileSketch(0.01, seed=0)
+    for start in range(0, len(values), 10_000):
+        sketch.update(values[start:start + 10_000])
+    merged = QuantileSketch(0.01, seed=1).update(values[:30_000]).merge(
+        QuantileSketch(0.01, seed=2).update(values[30_000:]))
+
+    assert rank_error(values, sketch, qs) <= 0.01
+    assert rank_error(values, merged, qs) <= 0.01
+    assert sum(len(level) for level in sketch.levels) < len(values) / 20
+
+
+def test_kll_exact_moments_and_round_trip():
+    values = pd.Series(np.random.default_rng(3).normal(50, 10, 20_000))
+    values[::13] = np.nan
+
+    sketch = QuantileSketch.from_series(values, error=0.01, chunksize=3_000)
+    restored = QuantileSketch.from_dict(sketch.to_dict())
+
+    assert restored.count == values.count()
+    assert restored.mean() == pytest.approx(values.mean())
+    assert restored.std() == pytest.approx(values.std())
+    assert (restored.min, restored.max) == (values.min(), values.max())
+    assert restored.median() == sketch.median()
+    assert series_quantiles(values, [0.25, 0.75]) == list(values.quantile([0.25, 0.75]))
@@ -0,0 +1,71 @@
+import numpy as np
+
+from src.vector_index import HashingEmbedder, VectorIndex, split_text
+
+
+def make_index(directory, n=400, dim=32, docs=4, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, dim)).astype('float32')
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    chunks = [{'hash': str(i), 'doc_id': f"doc{i % docs}", 'position': i // docs, 'text': f"chunk {i}"}
+              for i in range(n)]
+    index = VectorIndex(str(directory), embedder='hashing')
+    index.add(chunks, vectors)
+    index.sources = {f"doc{d}": {'content_hash': str(d), 'source': f"doc{d}.pdf"} for d in range(docs)}
+    return index
+
+
+def test_save_load_round_trip(tmp_path):
+    index = make_index(tmp_path)
+    index.save()
+    loaded = VectorIndex.load(str(tmp_path))
+
+    assert loaded.embedder == 'hashing'
+    assert loaded.chunks == index.chunks
+    assert loaded.sources == index.sources
+    np.testing.assert_array_equal(loaded.vectors, index.vectors)
+    assert loaded.search(index.vectors[7], k=1)[0][0] == 7
+
+
+def test_remove_and_keep(tmp_path):
+    index = make_index(tmp_path)
+
+    assert index.remove('doc1') == 100
+    assert 'doc1' not in index.sources and 'doc1' not in index.documents()
+    assert len(index.rows('doc1')) == 0
+    assert index.vectors.shape == (300, 32)
+
+    mask = np.array([chunk['position'] < 50 for chunk in index.chunks])
+    assert index.keep(mask) == 150
+    assert index.documents() == {'doc0': 50, 'doc2': 50, 'doc3': 50}
+    # Baris vektor tetap sejajar dengan chunk-nya
+    row = int(index.rows('doc3')[0])
+    assert index.search(index.vectors[row], k=1)[0][0] == row
+
+
+def test_ivf_search_finds_brute_force_top_hit(tmp_path):
+    index = make_index(tmp_path, n=2000)
+    rng = np.random.default_rng(1)
+    queries = index.vectors[rng.choice(len(index), size=20, replace=False)]
+    queries = queries + 0.05 * rng.standard_normal(queries.shape).astype('float32')
+    expected = [index.search(query, k=1)[0][0] for query in queries]
+
+    index.build_ivf(n_lists=16)
+    assert [index.search(query, k=1, nprobe=4)[0][0] for query in queries] == expected
+
+
+def test_split_text_respects_chunk_size_and_overlap():
+    text = ' '.join(f"kata{i}" for i in range(400))
+    chunks = list(split_text(text, chunk_size=200, overlap=50))
+
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.split()[0] in previous.split()[-10:]
+    assert chunks[-1].endswith('kata399')
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    vectors = HashingEmbedder(dim=64).embed(["saldo kartu kredit", "saldo kartu kredit"])
+
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1, rtol=1e-6)
+    np.testing.assert_array_equal(vectors[0], vectors[1])